@@ -1,11 +1,9 @@
 from graph_agent import GraphAgent
-from rag_agent import RAGAgent
 from datetime import datetime
 
 def add_meeting_notes():
-    # Initialize agents
+    # Initialize agent
     graph_agent = GraphAgent()
-    rag_agent = RAGAgent()
     
     try:
         # First, clear existing data
@@ -48,13 +46,10 @@ def add_meeting_notes():
         - Set up meeting notes management system
         """
         
-        # Process the meeting notes using the database directly
-        meeting_id = graph_agent.db.create_meeting_node(
-            "Project Planning and Team Updates",
-            date="2024-12-08"
-        )
+        # People and topics come from the shared gazetteer
+        gazetteer = graph_agent.gazetteer
         
-        # Add discussion points
+        points = []
         lines = project_meeting.strip().split('\n')
         for line in lines:
             line = line.strip()
@@ -66,56 +61,38 @@ def add_meeting_notes():
                 try:
                     time_str, content = line.split(' ', 1)
                     if ':' in time_str:
-                        discussion_id = graph_agent.db.create_discussion_point(
-                            meeting_id,
-                            content=content.strip(),
-                            timestamp=time_str
-                        )
-                        
-                        # Create relationships for mentioned people
-                        for person in ["Dr. Sonia", "Rajat", "Sandesh", "Chandana"]:
-                            if person in content:
-                                graph_agent.db.create_person_node(person)
-                                graph_agent.db.create_person_discussion_relationship(
-                                    person,
-                                    discussion_id
-                                )
-                                
-                        # Create relationships for topics
-                        topics = {
-                            "Neo4j integration": ["neo4j", "graph database"],
-                            "Project Charter": ["project charter", "charter"],
-                            "Integration Framework": ["integration framework", "framework", "phase"],
-                            "System Design": ["system design", "design", "flowchart"],
-                            "MongoDB": ["mongodb"],
-                            "Graph Retrieval Agent": ["graph retrieval", "agent"]
-                        }
-                        
-                        for topic, keywords in topics.items():
-                            if any(keyword.lower() in content.lower() for keyword in keywords):
-                                graph_agent.db.create_topic_node(topic)
-                                graph_agent.db.create_topic_discussion_relationship(
-                                    topic,
-                                    discussion_id
-                                )
+                        content = content.strip()
+                        people, topics = gazetteer.extract(content)
+                        points.append({
+                            "content": content,
+                            "timestamp": time_str,
+                            # Relationships for mentioned people and topics
+                            "people": people,
+                            "topics": topics
+                        })
                 except ValueError:
                     continue
             
             # Handle action items
             elif line.startswith('-'):
-                discussion_id = graph_agent.db.create_discussion_point(
-                    meeting_id,
-                    content=line.strip(),
-                    timestamp="action_item"
-                )
+                points.append({
+                    "content": line.strip(),
+                    "timestamp": "action_item"
+                })
+        
+        # Write the whole meeting in a single transaction
+        meeting_id = graph_agent.db.ingest_meeting(
+            "Project Planning and Team Updates",
+            points,
+            date="2024-12-08"
+        )
         
-        print("Successfully processed meeting notes!")
+        print(f"Successfully processed meeting notes! Meeting id: {meeting_id}")
         
     except Exception as e:
         print(f"Error processing meeting notes: {str(e)}")
     finally:
         graph_agent.close()
-        rag_agent.close()
 
 if __name__ == "__main__":
     add_meeting_notes()
@@ -0,0 +1,88 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+
+class SemanticAnswerCache:
+    """LRU cache of answers keyed by query embedding similarity
+
+    A lookup hits when a stored query's embedding has cosine similarity of
+    at least `threshold` with the new one, the entry is younger than `ttl`
+    seconds and it was computed against the current corpus version.
+    """
+
+    def __init__(self, threshold=0.97, ttl=3600.0, max_entries=512):
+        self.threshold = threshold
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.version = None
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def _normalize(embedding):
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def _sync_version(self, version):
+        # Any corpus write invalidates every stored answer
+        if version != self.version:
+            self.entries.clear()
+            self.version = version
+
+    def _expire(self, now):
+        expired = [key for key, entry in self.entries.items() if now - entry["created"] > self.ttl]
+        for key in expired:
+            del self.entries[key]
+
+    def lookup(self, embedding, version):
+        """Return (result, similarity) for the closest fresh entry, or (None, None)"""
+        with self.lock:
+            self._sync_version(version)
+            self._expire(time.monotonic())
+            if not self.entries:
+                self.misses += 1
+                return None, None
+
+            keys = list(self.entries)
+            matrix = np.stack([self.entries[key]["embedding"] for key in keys])
+            similarities = matrix @ self._normalize(embedding)
+            best = int(np.argmax(similarities))
+            if similarities[best] < self.threshold:
+                self.misses += 1
+                return None, None
+
+            key = keys[best]
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return copy.deepcopy(self.entries[key]["result"]), float(similarities[best])
+
+    def store(self, query, embedding, version, result):
+        with self.lock:
+            self._sync_version(version)
+            self.entries[query] = {
+                "embedding": self._normalize(embedding),
+                "created": time.monotonic(),
+                "result": copy.deepcopy(result)
+            }
+            self.entries.move_to_end(query)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+    def stats(self):
+        with self.lock:
+            return {
+                "entries": len(self.entries),
+                "hits": self.hits,
+                "misses": self.misses
+            }
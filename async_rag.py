@@ -0,0 +1,452 @@
+import asyncio
+import os
+import time
+
+from dotenv import load_dotenv
+from openai import AsyncOpenAI
+
+import corpus_version
+from answer_cache import SemanticAnswerCache
+from chunk_store import get_default_chunk_store
+from context_builder import ContextBuilder
+from database import (
+    DISCUSSION_FULLTEXT_INDEX, KEY_PEOPLE_QUERY, SCHEMA_STATEMENTS, TOPIC_OVERVIEW_QUERY, fulltext_query
+)
+from embedding_cache import get_default_cache
+from embeddings import AsyncEmbedder, RateLimiter, count_tokens
+from hybrid_retriever import AsyncHybridRetriever
+from instrumentation import trace, span, summarize_profile, total_db_hits
+from keyword_extractor import AsyncKeywordExtractor
+from metadata_filters import combine_filters, metadata_filter
+from neo4j_driver import create_async_driver
+from rag_with_vectors import (
+    GRAPH_SEARCH_QUERY, KEYWORD_PROMPT, RAGSystem, aggregate_lookups, build_messages, format_key_people,
+    format_sources, format_topic_overview, parse_keywords, record_usage
+)
+from vector_index import get_async_vector_index
+
+# Load environment variables
+load_dotenv()
+
+# Default number of in-flight calls per upstream service
+DEFAULT_CONCURRENCY = {
+    "embedding": 16,
+    "chat": 16,
+    "vector": 16,
+    "graph": 50,
+}
+
+
+class AsyncRAGSystem:
+    """RAGSystem for asyncio servers
+
+    Same retrieval, fusion, caching and result shape as RAGSystem.query, but
+    every upstream call is awaited: Neo4j through the async driver, OpenAI
+    through the async client and the vector index through its async adapter.
+    Each service has its own semaphore (RAG_ASYNC_<SERVICE>_CONCURRENCY), so
+    hundreds of concurrent queries queue for the service that is saturated
+    instead of needing a thread each.
+    """
+
+    def __init__(self, driver=None, openai_client=None, index=None, embedder=None, chunk_store=None):
+        # Async drivers are bound to one event loop, so this instance owns the one it creates
+        self.neo4j_database = os.getenv('NEO4J_DATABASE')
+        self.owns_driver = driver is None
+        self.driver = driver if driver is not None else create_async_driver()
+
+        self.openai_client = openai_client if openai_client is not None else AsyncOpenAI()
+        self.embedder = embedder if embedder is not None else AsyncEmbedder(
+            self.openai_client, cache=get_default_cache()
+        )
+
+        # Pinecone is queried natively async; local backends run in worker threads
+        self.index = get_async_vector_index("meeting-analysis", index=index)
+        self.chunk_store = chunk_store if chunk_store is not None else get_default_chunk_store()
+        self.date_filters = os.getenv('RAG_DATE_FILTERS', 'true').lower() == 'true'
+        self.aggregate_lookups = os.getenv('RAG_AGGREGATE_LOOKUPS', 'true').lower() == 'true'
+
+        self.context_builder = ContextBuilder(
+            token_budget=int(os.getenv('RAG_CONTEXT_TOKEN_BUDGET', '3000')),
+            duplicate_threshold=float(os.getenv('RAG_CONTEXT_DUPLICATE_THRESHOLD', '0.8'))
+        )
+        self.retrieval_mode = os.getenv('RAG_RETRIEVAL_MODE', 'hybrid')
+        self.hybrid_retriever = AsyncHybridRetriever(
+            self.driver,
+            self.neo4j_database,
+            top_n=int(os.getenv('RAG_HYBRID_TOP_N', '8'))
+        )
+        self.context_window = int(os.getenv('RAG_CONTEXT_WINDOW', '2'))
+        self.keyword_mode = os.getenv('RAG_KEYWORD_MODE', 'local')
+        self.keyword_extractor = AsyncKeywordExtractor(
+            self.driver,
+            self.neo4j_database,
+            refresh_interval=float(os.getenv('KEYWORD_REFRESH_INTERVAL', '30'))
+        )
+        self.stage_timeouts = {
+            'vector': float(os.getenv('RAG_VECTOR_TIMEOUT', '10')),
+            'graph': float(os.getenv('RAG_GRAPH_TIMEOUT', '20'))
+        }
+        self.answer_cache = SemanticAnswerCache(
+            threshold=float(os.getenv('RAG_ANSWER_CACHE_THRESHOLD', '0.97')),
+            ttl=float(os.getenv('RAG_ANSWER_CACHE_TTL', '3600')),
+            max_entries=int(os.getenv('RAG_ANSWER_CACHE_SIZE', '512'))
+        )
+        self.profile_graph = os.getenv('RAG_PROFILE_GRAPH', 'false').lower() == 'true'
+
+        self.chat_limiter = RateLimiter.from_env("OPENAI_CHAT")
+        self.max_concurrency = int(os.getenv('RAG_QUERY_MANY_CONCURRENCY', '8'))
+        self.limits = {
+            service: asyncio.Semaphore(int(os.getenv(f'RAG_ASYNC_{service.upper()}_CONCURRENCY', str(default))))
+            for service, default in DEFAULT_CONCURRENCY.items()
+        }
+        self.schema_ready = False
+
+    async def close(self):
+        await self.index.close()
+        if self.owns_driver:
+            await self.driver.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def ensure_schema(self):
+        if self.schema_ready:
+            return
+        async with self.limits['graph'], self.driver.session(database=self.neo4j_database) as session:
+            for statement in SCHEMA_STATEMENTS:
+                await (await session.run(statement)).consume()
+            await (await session.run("CALL db.awaitIndexes(300)")).consume()
+        self.schema_ready = True
+
+    async def get_embedding(self, text):
+        with span("embedding", tokens=count_tokens(text)):
+            async with self.limits['embedding']:
+                return await self.embedder.embed_one(text)
+
+    async def query_vector_store(self, query_text, top_k=3, filter=None, query_embedding=None,
+                                 file_name=None, date_from=None, date_to=None):
+        filter = combine_filters(filter, metadata_filter(file_name, date_from=date_from, date_to=date_to))
+        if query_embedding is None:
+            query_embedding = await self.get_embedding(query_text)
+        with span("vector_query", top_k=top_k, filter=filter) as attrs:
+            async with self.limits['vector']:
+                matches = await self.index.query(
+                    vector=query_embedding,
+                    top_k=top_k,
+                    filter=filter,
+                    include_metadata=True
+                )
+            attrs["results"] = len(matches)
+
+        # The chunk store is a local SQLite file, fast enough to read inline
+        with span("chunk_fetch", ids=len(matches)):
+            return self.chunk_store.attach(matches)
+
+    async def query_graph_database(self, keywords, limit=20, context_window=None):
+        search = fulltext_query(keywords)
+        if not search:
+            return []
+        await self.ensure_schema()
+        context_window = max(1, int(context_window or self.context_window))
+
+        with span("graph_query", keywords=len(keywords), profiled=self.profile_graph) as attrs:
+            async with self.limits['graph'], self.driver.session(database=self.neo4j_database) as session:
+                result = await session.run(
+                    ("PROFILE " if self.profile_graph else "") + GRAPH_SEARCH_QUERY % context_window,
+                    index=DISCUSSION_FULLTEXT_INDEX, search=search, limit=limit
+                )
+                records = [record async for record in result]
+                attrs["results"] = len(records)
+                if self.profile_graph:
+                    plan = summarize_profile(getattr(await result.consume(), 'profile', None))
+                    attrs.update(profile=plan, db_hits=total_db_hits(plan))
+            return records
+
+    async def search_aggregates(self, lookups):
+        """Async counterpart of RAGSystem.search_aggregates"""
+        summaries = []
+        with span("aggregate_query", lookups=len(lookups)) as attrs:
+            async with self.limits['graph'], self.driver.session(database=self.neo4j_database) as session:
+                for kind, name in lookups:
+                    if kind == "people":
+                        records = await (await session.run(KEY_PEOPLE_QUERY, limit=10, per_person=3)).data()
+                        if records:
+                            summaries.append(format_key_people(records))
+                    else:
+                        record = await (await session.run(TOPIC_OVERVIEW_QUERY, name=name, limit=5)).single()
+                        if record is not None and record['mentions'] is not None:
+                            summaries.append(format_topic_overview(record.data()))
+            attrs["results"] = len(summaries)
+        return summaries
+
+    async def extract_keywords(self, user_query):
+        with span("keyword_extraction", mode=self.keyword_mode) as attrs:
+            if self.keyword_mode == 'local':
+                async with self.limits['graph']:
+                    keywords = await self.keyword_extractor.extract(user_query)
+                # Fall back to the LLM while the graph vocabulary is empty
+                if keywords or not self.keyword_extractor.empty:
+                    attrs["keywords"] = len(keywords)
+                    return keywords
+            keywords = await self.extract_keywords_llm(user_query)
+            attrs["keywords"] = len(keywords)
+            return keywords
+
+    async def acquire_chat(self, messages, max_tokens):
+        await self.chat_limiter.acquire_async(
+            sum(count_tokens(message["content"]) for message in messages) + max_tokens
+        )
+
+    async def extract_keywords_llm(self, user_query):
+        messages = [
+            {"role": "system", "content": KEYWORD_PROMPT},
+            {"role": "user", "content": user_query}
+        ]
+        with span("keyword_llm", model="gpt-4") as attrs:
+            await self.acquire_chat(messages, 100)
+            async with self.limits['chat']:
+                response = await self.openai_client.chat.completions.create(
+                    model="gpt-4",
+                    messages=messages,
+                    temperature=0.3
+                )
+            record_usage(attrs, response)
+        return parse_keywords(response.choices[0].message.content)
+
+    async def search_graph(self, user_query):
+        return await self.query_graph_database(await self.extract_keywords(user_query))
+
+    def build_context(self, vector_results, graph_results, summary=()):
+        return self.context_builder.build(vector_results, graph_results, summary)
+
+    async def generate_response(self, query, context):
+        messages = build_messages(query, context)
+        with span("generation", model="gpt-4") as attrs:
+            await self.acquire_chat(messages, 1000)
+            async with self.limits['chat']:
+                response = await self.openai_client.chat.completions.create(
+                    model="gpt-4",
+                    messages=messages,
+                    temperature=0.7,
+                    max_tokens=1000
+                )
+            record_usage(attrs, response)
+            return response.choices[0].message.content
+
+    async def generate_response_stream(self, query, context):
+        """Yield the response text piece by piece as the model produces it"""
+        messages = build_messages(query, context)
+        with span("generation", model="gpt-4", streamed=True) as attrs:
+            started = time.perf_counter()
+            await self.acquire_chat(messages, 1000)
+            async with self.limits['chat']:
+                stream = await self.openai_client.chat.completions.create(
+                    model="gpt-4",
+                    messages=messages,
+                    temperature=0.7,
+                    max_tokens=1000,
+                    stream=True
+                )
+                pieces = []
+                async for chunk in stream:
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        if not pieces:
+                            attrs["first_token_ms"] = round((time.perf_counter() - started) * 1000, 3)
+                        pieces.append(chunk.choices[0].delta.content)
+                        yield chunk.choices[0].delta.content
+            attrs["prompt_tokens"] = sum(count_tokens(message["content"]) for message in messages)
+            attrs["completion_tokens"] = count_tokens("".join(pieces))
+
+    async def _collect(self, stage, awaitable, deadline, degraded):
+        """Await a retrieval branch until its deadline, degrading to no results"""
+        try:
+            return await asyncio.wait_for(awaitable, timeout=max(0.0, deadline - time.monotonic()))
+        except asyncio.TimeoutError:
+            print(f"{stage} retrieval timed out, continuing without it")
+            degraded[stage] = "timeout"
+        except Exception as e:
+            print(f"{stage} retrieval failed: {str(e)}")
+            degraded[stage] = str(e)
+        return []
+
+    question_filter = RAGSystem.question_filter
+
+    async def _vector_stage(self, user_query, filter, query_embedding, use_cache, version):
+        """Async counterpart of RAGSystem._vector_stage"""
+        if query_embedding is None:
+            query_embedding = await self.get_embedding(user_query)
+        if use_cache:
+            with span("answer_cache") as attrs:
+                cached, similarity = self.answer_cache.lookup(query_embedding, version)
+                attrs["hit"] = cached is not None
+            if cached is not None:
+                return {'query_embedding': query_embedding, 'cached': cached, 'similarity': similarity}
+        matches = await self.query_vector_store(user_query, filter=filter, query_embedding=query_embedding)
+        return {'query_embedding': query_embedding, 'cached': None, 'matches': matches}
+
+    async def retrieve(self, user_query, stage_timeouts=None, use_cache=True, filter=None, query_embedding=None):
+        """Async counterpart of RAGSystem.retrieve"""
+        timeouts = dict(self.stage_timeouts, **(stage_timeouts or {}))
+        start = time.monotonic()
+        degraded = {}
+        if filter is None:
+            filter = self.question_filter(user_query)
+
+        # The graph branch does not need the query embedding, so start it right away
+        graph_task = asyncio.ensure_future(self.search_graph(user_query))
+        lookups = aggregate_lookups(user_query) if self.aggregate_lookups else []
+        summary_task = asyncio.ensure_future(self.search_aggregates(lookups)) if lookups else None
+
+        # Embedding, answer cache lookup and vector search share the vector deadline
+        version = corpus_version.current()
+        vector_stage = await self._collect(
+            'vector',
+            self._vector_stage(user_query, filter, query_embedding, use_cache, version),
+            start + timeouts['vector'],
+            degraded
+        ) or None
+        query_embedding = vector_stage['query_embedding'] if vector_stage else None
+        if vector_stage and vector_stage['cached'] is not None:
+            graph_task.cancel()
+            if summary_task is not None:
+                summary_task.cancel()
+            cached = vector_stage['cached']
+            cached.update(cached=True, cache_similarity=vector_stage['similarity'])
+            return {'cached': cached}
+        vector_results = vector_stage['matches'] if vector_stage else []
+        graph_results = await self._collect('graph', graph_task, start + timeouts['graph'], degraded)
+        summary = []
+        if summary_task is not None:
+            summary = await self._collect('summary', summary_task, start + timeouts['graph'], degraded)
+
+        if self.retrieval_mode == 'hybrid' and (vector_results or graph_results):
+            try:
+                with span("fusion") as attrs:
+                    async with self.limits['graph']:
+                        vector_results, graph_results = await self.hybrid_retriever.fuse(
+                            vector_results, graph_results
+                        )
+                    attrs["results"] = len(vector_results) + len(graph_results)
+            except Exception as e:
+                print(f"hybrid fusion failed, using separate results: {str(e)}")
+                degraded['hybrid'] = str(e)
+
+        with span("context") as attrs:
+            context = self.build_context(vector_results, graph_results, summary)
+            attrs.update(tokens=context['tokens'], dropped=len(context['dropped']))
+
+        return {
+            'cached': None,
+            'query_embedding': query_embedding,
+            'version': version,
+            'vector_results': vector_results,
+            'graph_results': graph_results,
+            'context': context,
+            'degraded': degraded
+        }
+
+    def _remember(self, user_query, retrieval, result, use_cache):
+        if use_cache and not retrieval['degraded']:
+            self.answer_cache.store(user_query, retrieval['query_embedding'], retrieval['version'], result)
+
+    async def query(self, user_query, stage_timeouts=None, use_cache=True, filter=None, query_embedding=None):
+        """Answer a question; returns the same dict as RAGSystem.query"""
+        use_cache = use_cache and filter is None
+        with trace("async_query") as run:
+            try:
+                retrieval = await self.retrieve(user_query, stage_timeouts, use_cache, filter, query_embedding)
+                if retrieval['cached'] is not None:
+                    return dict(retrieval['cached'], timings=run.summary())
+
+                response = await self.generate_response(user_query, retrieval['context'])
+                result = {'response': response, **format_sources(retrieval), 'cached': False}
+                self._remember(user_query, retrieval, result, use_cache)
+                return dict(result, timings=run.summary())
+
+            except Exception as e:
+                return {
+                    'error': str(e),
+                    'response': f"An error occurred while processing your query: {str(e)}",
+                    'timings': run.summary()
+                }
+
+    async def query_many(self, questions, max_concurrency=None, stage_timeouts=None, use_cache=True, filter=None):
+        """Async counterpart of RAGSystem.query_many"""
+        questions = list(questions)
+        if not questions:
+            return []
+
+        with trace("async_query_many"), span("embedding", texts=len(questions)):
+            try:
+                async with self.limits['embedding']:
+                    embeddings = await self.embedder.embed(questions)
+            except Exception as e:
+                print(f"Batch embedding failed, embedding questions one by one: {str(e)}")
+                embeddings = [None] * len(questions)
+
+        slots = asyncio.Semaphore(max_concurrency or self.max_concurrency)
+
+        async def answer(question, embedding):
+            async with slots:
+                return await self.query(question, stage_timeouts, use_cache, filter, embedding)
+
+        # Each answer runs as its own task, so it gets its own trace
+        return await asyncio.gather(*(
+            asyncio.ensure_future(answer(question, embedding))
+            for question, embedding in zip(questions, embeddings)
+        ))
+
+    async def query_stream(self, user_query, stage_timeouts=None, use_cache=True, filter=None):
+        """Async iterator with the same events as RAGSystem.query_stream"""
+        use_cache = use_cache and filter is None
+        with trace("async_query_stream") as run:
+            try:
+                retrieval = await self.retrieve(user_query, stage_timeouts, use_cache, filter)
+                cached = retrieval['cached']
+                if cached is not None:
+                    yield {'type': 'sources', **{k: v for k, v in cached.items() if k != 'response'}}
+                    yield {'type': 'token', 'content': cached['response']}
+                    yield {'type': 'done', 'response': cached['response'], 'timings': run.summary()}
+                    return
+
+                sources = format_sources(retrieval)
+                yield {'type': 'sources', **sources, 'cached': False}
+
+                pieces = []
+                async for piece in self.generate_response_stream(user_query, retrieval['context']):
+                    pieces.append(piece)
+                    yield {'type': 'token', 'content': piece}
+
+                response = ''.join(pieces)
+                self._remember(user_query, retrieval, {'response': response, **sources, 'cached': False}, use_cache)
+                yield {'type': 'done', 'response': response, 'timings': run.summary()}
+
+            except Exception as e:
+                yield {
+                    'type': 'error',
+                    'error': str(e),
+                    'response': f"An error occurred while processing your query: {str(e)}",
+                    'timings': run.summary()
+                }
+
+
+async def main():
+    example_queries = [
+        "What are the main requirements discussed in the meetings?",
+        "What is the timeline for the project?",
+        "Who are the key stakeholders involved?"
+    ]
+    async with AsyncRAGSystem() as rag:
+        results = await rag.query_many(example_queries)
+        for query, result in zip(example_queries, results):
+            print(f"\nQuery: {query}")
+            print("-" * 80)
+            print(result['response'])
+            print(f"({result['timings']['total_ms']:.0f} ms)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
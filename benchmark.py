@@ -0,0 +1,453 @@
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from async_rag import AsyncRAGSystem
+from benchmark_fakes import AsyncFakeGraphDriver, AsyncFakeOpenAI, FakeGraphDriver, FakeOpenAI, LatencyVectorIndex
+from chunk_store import ChunkStore
+from database import Neo4jDatabase
+from embeddings import AsyncEmbedder, Embedder, RateLimiter
+from gazetteer import get_default_gazetteer
+from graph_agent import GraphAgent
+from rag_with_vectors import RAGSystem
+from vector_index import NumpyVectorIndex
+from vectorize_store import VectorStore
+
+LINE_TEMPLATES = [
+    "{person} presented an update on {topic} and asked for feedback on the open items",
+    "{person} and {other} agreed to revisit {topic} before the next milestone",
+    "The team reviewed open questions about {topic} and the related {second}",
+    "{person} will own the {topic} follow-up and share a draft by Friday",
+    "Concerns were raised about {topic} because it depends on {second}",
+    "{person} explained how {topic} affects the delivery timeline",
+    "Action item: {other} to document the decisions on {topic}",
+]
+QUESTION_TEMPLATES = [
+    "What did {person} say about {topic}?",
+    "Who is responsible for {topic}?",
+    "What was decided about {topic} and {second}?",
+    "What are the open action items for {person}?",
+]
+
+# Keys compared by --compare, and whether a larger value is better
+COMPARED_METRICS = {
+    ("ingest", "meetings_per_second"): True,
+    ("ingest", "points_per_second"): True,
+    ("query", "p50_ms"): False,
+    ("query", "p95_ms"): False,
+    ("query", "p99_ms"): False,
+    ("concurrent", "queries_per_second"): True,
+    ("concurrent", "p95_ms"): False,
+    ("threaded", "queries_per_second"): True,
+    ("threaded", "p95_ms"): False,
+    ("memory", "ingest_peak_mb"): False,
+    ("memory", "query_peak_mb"): False,
+}
+
+
+def synthetic_corpus(meetings, lines_per_meeting, seed=0):
+    """Deterministic transcripts built from the gazetteer's people and topics"""
+    rng = random.Random(seed)
+    gazetteer = get_default_gazetteer()
+    people = sorted({name for entries in gazetteer.entries.values() for kind, name in entries if kind == "person"})
+    topics = sorted({name for entries in gazetteer.entries.values() for kind, name in entries if kind == "topic"})
+
+    corpus = []
+    for i in range(meetings):
+        lines = []
+        for j in range(lines_per_meeting):
+            line = rng.choice(LINE_TEMPLATES).format(
+                person=rng.choice(people), other=rng.choice(people),
+                topic=rng.choice(topics), second=rng.choice(topics)
+            )
+            minutes, seconds = divmod(j * 45, 60)
+            lines.append(f"{line} {minutes}:{seconds:02d}")
+        corpus.append({
+            "title": f"Synthetic Meeting {i}",
+            "date": f"2024-{i % 12 + 1:02d}-{i % 28 + 1:02d}",
+            "notes": "\n".join(lines)
+        })
+
+    questions = [
+        rng.choice(QUESTION_TEMPLATES).format(
+            person=rng.choice(people), topic=rng.choice(topics), second=rng.choice(topics)
+        )
+        for _ in range(max(1, meetings))
+    ]
+    return corpus, questions
+
+
+def unlimited():
+    return RateLimiter(requests_per_minute=10 ** 9, tokens_per_minute=10 ** 12)
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    if not ordered:
+        return None
+    rank = fraction * (len(ordered) - 1)
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+class Benchmark:
+    """Drive ingestion and RAG queries against local fakes at several corpus sizes
+
+    Each size gets fresh fakes, so runs are independent and repeatable. The
+    timing pass runs without tracing; memory peaks come from a separate
+    tracemalloc pass so tracing overhead never skews the latencies.
+    """
+
+    def __init__(self, sizes=(20, 100, 500), lines_per_meeting=30, queries=50, dimension=1536,
+                 embedding_latency=0.0, chat_latency=0.0, chat_token_latency=0.0,
+                 vector_latency=0.0, graph_latency=0.0, memory=True, seed=0, concurrency=0,
+                 threads=0, batching=False):
+        self.sizes = sizes
+        self.lines_per_meeting = lines_per_meeting
+        self.queries = queries
+        self.dimension = dimension
+        self.latencies = {
+            "embedding": embedding_latency,
+            "chat": chat_latency,
+            "chat_token": chat_token_latency,
+            "vector": vector_latency,
+            "graph": graph_latency,
+        }
+        self.memory = memory
+        self.seed = seed
+        self.concurrency = concurrency
+        self.threads = threads
+        self.batching = batching
+
+    def _services(self):
+        client = FakeOpenAI(
+            dimension=self.dimension,
+            embedding_latency=self.latencies["embedding"],
+            chat_latency=self.latencies["chat"],
+            chat_token_latency=self.latencies["chat_token"]
+        )
+        index = LatencyVectorIndex(
+            NumpyVectorIndex(dimension=self.dimension),
+            query_latency=self.latencies["vector"],
+            upsert_latency=self.latencies["vector"]
+        )
+        driver = FakeGraphDriver(latency=self.latencies["graph"])
+        # No embedding cache and no quota pacing: measure the pipeline itself
+        embedder = Embedder(client, cache=None, limiter=unlimited())
+        chunks = ChunkStore(":memory:")
+        return client, index, driver, embedder, chunks
+
+    def _ingest(self, corpus, services):
+        client, index, driver, embedder, chunks = services
+        agent = GraphAgent(db=Neo4jDatabase(driver=driver))
+        store = VectorStore(openai_client=client, index=index, embedder=embedder, chunk_store=chunks)
+        store.upsert_limiter = unlimited()
+        for meeting in corpus:
+            agent.process_meeting_notes(meeting["title"], meeting["notes"], meeting["date"], vector_store=store)
+
+    def _query(self, questions, services):
+        client, index, driver, embedder, chunks = services
+        rag = RAGSystem(driver=driver, openai_client=client, index=index, embedder=embedder, chunk_store=chunks)
+        rag.chat_limiter = unlimited()
+        latencies = []
+        errors = 0
+        try:
+            for question in questions:
+                started = time.perf_counter()
+                result = rag.query(question, use_cache=False)
+                latencies.append(time.perf_counter() - started)
+                if "error" in result:
+                    errors += 1
+        finally:
+            rag.close()
+        return latencies, errors
+
+    def _query_threaded(self, questions, services):
+        """Answer the questions from `threads` threads sharing one RAGSystem"""
+        client, index, driver, embedder, chunks = services
+        rag = RAGSystem(driver=driver, openai_client=client, index=index, embedder=embedder,
+                        batching=self.batching, chunk_store=chunks)
+        rag.chat_limiter = unlimited()
+        latencies = []
+        errors = 0
+
+        def one(question):
+            nonlocal errors
+            started = time.perf_counter()
+            result = rag.query(question, use_cache=False)
+            latencies.append(time.perf_counter() - started)
+            if "error" in result:
+                errors += 1
+
+        started = time.perf_counter()
+        try:
+            with ThreadPoolExecutor(max_workers=self.threads) as pool:
+                list(pool.map(one, questions))
+            seconds = time.perf_counter() - started
+            stats = rag.batching_stats()
+        finally:
+            rag.close()
+        return latencies, errors, seconds, stats
+
+    async def _query_concurrent(self, questions, services):
+        """Keep `concurrency` AsyncRAGSystem queries in flight over the same corpus"""
+        _, index, driver, _, chunks = services
+        client = AsyncFakeOpenAI(
+            dimension=self.dimension,
+            embedding_latency=self.latencies["embedding"],
+            chat_latency=self.latencies["chat"],
+            chat_token_latency=self.latencies["chat_token"]
+        )
+        rag = AsyncRAGSystem(
+            driver=AsyncFakeGraphDriver(driver.graph, latency=self.latencies["graph"]),
+            openai_client=client,
+            index=index,
+            embedder=AsyncEmbedder(client, cache=None, limiter=unlimited()),
+            chunk_store=chunks
+        )
+        rag.chat_limiter = unlimited()
+        slots = asyncio.Semaphore(self.concurrency)
+        latencies = []
+        errors = 0
+
+        async def one(question):
+            nonlocal errors
+            async with slots:
+                started = time.perf_counter()
+                result = await rag.query(question, use_cache=False)
+                latencies.append(time.perf_counter() - started)
+                if "error" in result:
+                    errors += 1
+
+        started = time.perf_counter()
+        async with rag:
+            await asyncio.gather(*(one(question) for question in questions))
+        return latencies, errors, time.perf_counter() - started
+
+    def run_size(self, size):
+        corpus, questions = synthetic_corpus(size, self.lines_per_meeting, self.seed)
+        questions = (questions * (self.queries // len(questions) + 1))[:self.queries]
+        points = sum(len(meeting["notes"].split("\n")) for meeting in corpus)
+
+        services = self._services()
+        started = time.perf_counter()
+        self._ingest(corpus, services)
+        ingest_seconds = time.perf_counter() - started
+        latencies, errors = self._query(questions, services)
+        client, index, driver, _, _ = services
+
+        result = {
+            "meetings": size,
+            "points": points,
+            "chunks": len(index),
+            "ingest": {
+                "seconds": round(ingest_seconds, 4),
+                "meetings_per_second": round(size / ingest_seconds, 2),
+                "points_per_second": round(points / ingest_seconds, 2),
+            },
+            "query": {
+                "count": len(latencies),
+                "errors": errors,
+                "mean_ms": round(statistics.mean(latencies) * 1000, 3),
+                "p50_ms": round(percentile(latencies, 0.50) * 1000, 3),
+                "p95_ms": round(percentile(latencies, 0.95) * 1000, 3),
+                "p99_ms": round(percentile(latencies, 0.99) * 1000, 3),
+            },
+            "calls": dict(client.calls, graph_queries=driver.graph.queries),
+        }
+
+        if self.threads:
+            latencies, errors, seconds, stats = self._query_threaded(questions, services)
+            result["threaded"] = {
+                "threads": self.threads,
+                "batching": self.batching,
+                "count": len(latencies),
+                "errors": errors,
+                "seconds": round(seconds, 4),
+                "queries_per_second": round(len(latencies) / seconds, 2),
+                "p50_ms": round(percentile(latencies, 0.50) * 1000, 3),
+                "p95_ms": round(percentile(latencies, 0.95) * 1000, 3),
+                "batches": stats,
+            }
+
+        if self.concurrency:
+            latencies, errors, seconds = asyncio.run(self._query_concurrent(questions, services))
+            result["concurrent"] = {
+                "concurrency": self.concurrency,
+                "count": len(latencies),
+                "errors": errors,
+                "seconds": round(seconds, 4),
+                "queries_per_second": round(len(latencies) / seconds, 2),
+                "p50_ms": round(percentile(latencies, 0.50) * 1000, 3),
+                "p95_ms": round(percentile(latencies, 0.95) * 1000, 3),
+            }
+
+        if self.memory:
+            services = self._services()
+            tracemalloc.start()
+            self._ingest(corpus, services)
+            ingest_peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.reset_peak()
+            self._query(questions[:min(len(questions), 20)], services)
+            query_peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            result["memory"] = {
+                "ingest_peak_mb": round(ingest_peak / 1e6, 3),
+                "query_peak_mb": round(query_peak / 1e6, 3),
+            }
+        return result
+
+    def run(self):
+        results = []
+        # Keep the corpus version file and manifests of the fakes out of the working tree
+        with tempfile.TemporaryDirectory() as scratch:
+            previous = {key: os.environ.get(key) for key in ("CORPUS_VERSION_PATH", "VECTOR_MANIFEST_PATH")}
+            os.environ["CORPUS_VERSION_PATH"] = os.path.join(scratch, "corpus_version.json")
+            os.environ["VECTOR_MANIFEST_PATH"] = os.path.join(scratch, "manifest.json")
+            try:
+                for size in self.sizes:
+                    print(f"Benchmarking {size} meetings...")
+                    result = self.run_size(size)
+                    print(f"  ingest {result['ingest']['points_per_second']} points/s, "
+                          f"query p50 {result['query']['p50_ms']} ms, p95 {result['query']['p95_ms']} ms, "
+                          f"p99 {result['query']['p99_ms']} ms")
+                    if "threaded" in result:
+                        print(f"  {self.threads} threads{' batched' if self.batching else ''}: "
+                              f"{result['threaded']['queries_per_second']} queries/s, "
+                              f"p95 {result['threaded']['p95_ms']} ms")
+                    if "concurrent" in result:
+                        print(f"  async x{self.concurrency}: {result['concurrent']['queries_per_second']} queries/s, "
+                              f"p95 {result['concurrent']['p95_ms']} ms")
+                    results.append(result)
+            finally:
+                for key, value in previous.items():
+                    if value is None:
+                        os.environ.pop(key, None)
+                    else:
+                        os.environ[key] = value
+
+        return {
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "commit": git_commit(),
+            "python": sys.version.split()[0],
+            "config": {
+                "sizes": list(self.sizes),
+                "lines_per_meeting": self.lines_per_meeting,
+                "queries": self.queries,
+                "dimension": self.dimension,
+                "latencies": self.latencies,
+                "seed": self.seed,
+                "concurrency": self.concurrency,
+                "threads": self.threads,
+                "batching": self.batching,
+            },
+            "results": results,
+        }
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(report, baseline, tolerance=0.1):
+    """Print metric changes against a baseline report; return the regressions beyond tolerance"""
+    regressions = []
+    previous = {result["meetings"]: result for result in baseline["results"]}
+    for result in report["results"]:
+        old = previous.get(result["meetings"])
+        if old is None:
+            continue
+        print(f"\n{result['meetings']} meetings (baseline {baseline.get('commit')}):")
+        for (section, metric), higher_is_better in COMPARED_METRICS.items():
+            before = old.get(section, {}).get(metric)
+            after = result.get(section, {}).get(metric)
+            if not before or after is None:
+                continue
+            change = (after - before) / before
+            regressed = -change > tolerance if higher_is_better else change > tolerance
+            print(f"  {section}.{metric}: {before} -> {after} ({change:+.1%})"
+                  f"{'  REGRESSION' if regressed else ''}")
+            if regressed:
+                regressions.append((result["meetings"], f"{section}.{metric}", change))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline ingestion and query benchmark against local fakes")
+    parser.add_argument("--sizes", default="20,100,500", help="Comma-separated corpus sizes in meetings")
+    parser.add_argument("--lines", type=int, default=30, help="Discussion points per meeting")
+    parser.add_argument("--queries", type=int, default=50, help="Queries timed per corpus size")
+    parser.add_argument("--dimension", type=int, default=1536, help="Embedding dimension")
+    parser.add_argument("--embedding-latency", type=float, default=0.0, help="Seconds per embeddings request")
+    parser.add_argument("--chat-latency", type=float, default=0.0, help="Seconds per chat request")
+    parser.add_argument("--chat-token-latency", type=float, default=0.0, help="Seconds per generated word")
+    parser.add_argument("--vector-latency", type=float, default=0.0, help="Seconds per vector index call")
+    parser.add_argument("--graph-latency", type=float, default=0.0, help="Seconds per graph statement")
+    parser.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc memory pass")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--concurrency", type=int, default=0,
+                        help="Also run the queries through AsyncRAGSystem with this many in flight")
+    parser.add_argument("--threads", type=int, default=0,
+                        help="Also run the queries from this many threads sharing one RAGSystem")
+    parser.add_argument("--batching", action="store_true",
+                        help="Enable micro-batching of embeddings and vector searches for --threads")
+    parser.add_argument("--output", default=None, help="Where to write the JSON results")
+    parser.add_argument("--compare", default=None, help="Baseline results file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.1, help="Allowed relative regression")
+    args = parser.parse_args()
+
+    benchmark = Benchmark(
+        sizes=[int(size) for size in args.sizes.split(",") if size.strip()],
+        lines_per_meeting=args.lines,
+        queries=args.queries,
+        dimension=args.dimension,
+        embedding_latency=args.embedding_latency,
+        chat_latency=args.chat_latency,
+        chat_token_latency=args.chat_token_latency,
+        vector_latency=args.vector_latency,
+        graph_latency=args.graph_latency,
+        memory=not args.no_memory,
+        seed=args.seed,
+        concurrency=args.concurrency,
+        threads=args.threads,
+        batching=args.batching
+    )
+    report = benchmark.run()
+
+    output = args.output or os.path.join(
+        ".cache", "benchmarks", f"benchmark-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+    )
+    directory = os.path.dirname(output)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to {output}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.tolerance)
+        if regressions:
+            print(f"\n{len(regressions)} metrics regressed by more than {args.tolerance:.0%}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
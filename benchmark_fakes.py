@@ -0,0 +1,688 @@
+"""Deterministic local stand-ins for OpenAI, the vector index and Neo4j
+
+They implement just the surface this repo uses, with configurable latency,
+so the real RAGSystem, VectorStore and GraphAgent code paths can be driven
+offline by benchmark.py.
+"""
+import asyncio
+import re
+import threading
+import time
+import zlib
+from types import SimpleNamespace
+
+import numpy as np
+
+from embeddings import count_tokens
+from keyword_extractor import STOP_WORDS, tokenize
+from vector_index import VectorIndex
+
+WORD = re.compile(r"\w+")
+
+
+def fake_embedding(text, dimension):
+    """Signed feature hashing of words and word pairs, L2-normalised
+
+    Texts that share vocabulary get similar vectors, so retrieval over fake
+    embeddings still ranks related chunks first.
+    """
+    words = WORD.findall(text.lower())
+    features = words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+    vector = np.zeros(dimension, dtype=np.float32)
+    for feature in features:
+        digest = zlib.crc32(feature.encode("utf-8"))
+        vector[digest % dimension] += 1.0 if digest & 0x80000000 else -1.0
+    norm = np.linalg.norm(vector)
+    if norm:
+        vector /= norm
+    else:
+        vector[0] = 1.0
+    return vector.tolist()
+
+
+class _FakeEmbeddings:
+    def __init__(self, client):
+        self.client = client
+
+    def create(self, input, model=None, **kwargs):
+        texts = [input] if isinstance(input, str) else list(input)
+        self.client._sleep(self.client.embedding_latency)
+        with self.client.lock:
+            self.client.calls["embeddings"] += 1
+            self.client.calls["embedded_texts"] += len(texts)
+        tokens = sum(count_tokens(text) for text in texts)
+        return SimpleNamespace(
+            data=[
+                SimpleNamespace(index=i, embedding=fake_embedding(text, self.client.dimension))
+                for i, text in enumerate(texts)
+            ],
+            usage=SimpleNamespace(prompt_tokens=tokens, total_tokens=tokens)
+        )
+
+
+class _FakeCompletions:
+    def __init__(self, client):
+        self.client = client
+
+    def _answer(self, messages):
+        question = messages[-1]["content"]
+        if "Extract key terms" in messages[0]["content"]:
+            terms = [token for token in tokenize(question) if token not in STOP_WORDS]
+            return ", ".join(dict.fromkeys(terms))
+        # The question closes the prompt; echo it until the answer has answer_words words
+        words = WORD.findall(question)[-12:] or ["answer"]
+        return " ".join((words * (self.client.answer_words // len(words) + 1))[:self.client.answer_words])
+
+    def create(self, model=None, messages=None, stream=False, **kwargs):
+        with self.client.lock:
+            self.client.calls["chat"] += 1
+        answer = self._answer(messages)
+        pieces = answer.split(" ")
+        prompt_tokens = sum(count_tokens(message["content"]) for message in messages)
+        usage = SimpleNamespace(
+            prompt_tokens=prompt_tokens,
+            completion_tokens=len(pieces),
+            total_tokens=prompt_tokens + len(pieces)
+        )
+        self.client._sleep(self.client.chat_latency)
+
+        if stream:
+            def chunks():
+                for i, piece in enumerate(pieces):
+                    self.client._sleep(self.client.chat_token_latency)
+                    content = piece if i == 0 else " " + piece
+                    yield SimpleNamespace(
+                        choices=[SimpleNamespace(delta=SimpleNamespace(content=content))],
+                        usage=None
+                    )
+            return chunks()
+
+        self.client._sleep(self.client.chat_token_latency * len(pieces))
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=answer))],
+            usage=usage
+        )
+
+
+class FakeOpenAI:
+    """OpenAI client stand-in with deterministic embeddings and canned answers
+
+    Latencies are in seconds: `embedding_latency` and `chat_latency` per
+    request, `chat_token_latency` per generated word.
+    """
+
+    def __init__(self, dimension=1536, embedding_latency=0.0, chat_latency=0.0,
+                 chat_token_latency=0.0, answer_words=60):
+        self.dimension = dimension
+        self.embedding_latency = embedding_latency
+        self.chat_latency = chat_latency
+        self.chat_token_latency = chat_token_latency
+        self.answer_words = answer_words
+        self.calls = {"embeddings": 0, "embedded_texts": 0, "chat": 0}
+        self.lock = threading.Lock()
+        self.embeddings = _FakeEmbeddings(self)
+        self.chat = SimpleNamespace(completions=_FakeCompletions(self))
+
+    @staticmethod
+    def _sleep(seconds):
+        if seconds > 0:
+            time.sleep(seconds)
+
+
+class _AsyncFakeEmbeddings:
+    def __init__(self, client):
+        self.client = client
+
+    async def create(self, input, model=None, **kwargs):
+        await _async_sleep(self.client.embedding_latency)
+        return self.client.sync.embeddings.create(input, model=model, **kwargs)
+
+
+class _AsyncFakeCompletions:
+    def __init__(self, client):
+        self.client = client
+
+    async def create(self, model=None, messages=None, stream=False, **kwargs):
+        response = self.client.sync.chat.completions.create(model=model, messages=messages, stream=stream, **kwargs)
+        await _async_sleep(self.client.chat_latency)
+
+        if stream:
+            async def chunks():
+                for chunk in response:
+                    await _async_sleep(self.client.chat_token_latency)
+                    yield chunk
+            return chunks()
+
+        await _async_sleep(self.client.chat_token_latency * response.usage.completion_tokens)
+        return response
+
+
+class AsyncFakeOpenAI:
+    """AsyncOpenAI stand-in; same answers as FakeOpenAI, but latency is awaited"""
+
+    def __init__(self, dimension=1536, embedding_latency=0.0, chat_latency=0.0,
+                 chat_token_latency=0.0, answer_words=60):
+        self.sync = FakeOpenAI(dimension=dimension, answer_words=answer_words)
+        self.embedding_latency = embedding_latency
+        self.chat_latency = chat_latency
+        self.chat_token_latency = chat_token_latency
+        self.calls = self.sync.calls
+        self.embeddings = _AsyncFakeEmbeddings(self)
+        self.chat = SimpleNamespace(completions=_AsyncFakeCompletions(self))
+
+
+async def _async_sleep(seconds):
+    if seconds > 0:
+        await asyncio.sleep(seconds)
+
+
+class LatencyVectorIndex(VectorIndex):
+    """Wrap a local index to add the round-trip latency of a hosted one"""
+
+    def __init__(self, index, query_latency=0.0, upsert_latency=0.0):
+        self.inner = index
+        self.query_latency = query_latency
+        self.upsert_latency = upsert_latency
+
+    def upsert(self, vectors):
+        FakeOpenAI._sleep(self.upsert_latency)
+        return self.inner.upsert(vectors)
+
+    def query(self, vector, top_k=3, filter=None, include_metadata=True):
+        FakeOpenAI._sleep(self.query_latency)
+        return self.inner.query(vector, top_k=top_k, filter=filter, include_metadata=include_metadata)
+
+    def query_batch(self, vectors, top_k=3, filter=None, include_metadata=True):
+        # One round-trip for the whole batch
+        FakeOpenAI._sleep(self.query_latency)
+        return self.inner.query_batch(vectors, top_k=top_k, filter=filter, include_metadata=include_metadata)
+
+    def delete(self, ids):
+        FakeOpenAI._sleep(self.upsert_latency)
+        return self.inner.delete(ids)
+
+    def flush(self):
+        return self.inner.flush()
+
+    def __len__(self):
+        return len(self.inner)
+
+
+class FakeRecord(dict):
+    def data(self):
+        return dict(self)
+
+
+class FakeResult:
+    def __init__(self, records):
+        self.records = [FakeRecord(record) for record in records]
+
+    def __iter__(self):
+        return iter(self.records)
+
+    def single(self):
+        return self.records[0] if self.records else None
+
+    def data(self):
+        return [record.data() for record in self.records]
+
+    def consume(self):
+        return None
+
+
+class FakeGraph:
+    """In-memory meeting graph that answers the Cypher statements this repo issues
+
+    Statements are recognised by their distinctive clauses rather than
+    parsed, so anything unfamiliar raises NotImplementedError instead of
+    silently returning nothing.
+    """
+
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.meetings = {}
+        self.points = {}
+        self.people = set()
+        self.topics = set()
+        self.chunks = {}
+        self.postings = {}
+        # Materialized aggregates: (label, name) and (relationship, a, b) -> stats
+        self.entity_stats = {}
+        self.pair_stats = {}
+        self.covered = {}
+        self.queries = 0
+        self.lock = threading.RLock()
+        self.handlers = [
+            ("CREATE CONSTRAINT", self._noop),
+            ("CREATE FULLTEXT INDEX", self._noop),
+            ("db.awaitIndexes", self._noop),
+            ("CREATE (m:Meeting {id: $meeting_id", self._create_meeting),
+            ("MERGE (:Person", self._merge_people),
+            ("MERGE (:Topic", self._merge_topics),
+            ("UNWIND $rows AS row", self._create_points),
+            ("UNWIND range(0, size($ids) - 2)", self._link_next),
+            ("UNWIND $chunks AS chunk", self._create_chunks),
+            ("MATCH (c:Chunk {meeting_id: meeting_id})", self._delete_chunks),
+            ("MATCH (m:Meeting {id: meeting_id})", self._delete_meetings),
+            ("UNION MATCH (p:Person)", self._entity_names),
+            ("MATCH (d:DiscussionPoint) RETURN d.content AS content", self._contents),
+            ("db.index.fulltext.queryNodes", self._fulltext),
+            ("MATCH (c:Chunk {id: chunk_id})-[:COVERS]", self._chunk_points),
+            ("UNWIND $point_ids AS point_id", self._expand),
+            ("CREATE INDEX", self._noop),
+            ("topics: [(t:Topic)-[:DISCUSSED_IN]->(d) | t.name]", self._contributions),
+            ("coalesce(n.mentions, 0) + entity.mentions", self._add_entities),
+            ("ON CREATE SET r.mentions = 0", self._add_pairs),
+            ("CREATE (t)-[:COVERED_IN", self._cover_meeting),
+            ("SET n.mentions = n.mentions - entity.mentions", self._remove_entities),
+            ("WHERE n.meetings > 0 AND", self._refresh_entities),
+            ("SET r.mentions = r.mentions - pair.mentions", self._remove_pairs),
+            ("WHERE r.first_seen = $date OR", self._refresh_pairs),
+            ("MERGE (l:AggregateLock", self._noop),
+            ("[r:DISCUSSES|CO_MENTIONED|COVERED_IN]", self._clear_pairs),
+            ("WHERE (n:Person OR n:Topic)", self._clear_entities),
+            ("WHERE p.mentions > 0", self._key_people),
+            ("MATCH (t:Topic {name: $name})", self._topic_overview),
+            ("MATCH (p:Person {name: $name})", self._person_overview),
+        ]
+
+    def run(self, query, parameters=None, **kwargs):
+        FakeOpenAI._sleep(self.latency)
+        return self.execute(query, dict(parameters or {}, **kwargs))
+
+    def execute(self, query, params):
+        with self.lock:
+            self.queries += 1
+            for marker, handler in self.handlers:
+                if marker in query:
+                    return FakeResult(handler(query, params) or [])
+        raise NotImplementedError(f"FakeGraph does not support this statement: {query.strip()[:120]}")
+
+    def _noop(self, query, params):
+        return []
+
+    def _create_meeting(self, query, params):
+        self.meetings[params["meeting_id"]] = {
+            "id": params["meeting_id"], "title": params["title"], "date": params.get("date"), "points": []
+        }
+
+    def _merge_people(self, query, params):
+        self.people.update(params["people"])
+
+    def _merge_topics(self, query, params):
+        self.topics.update(params["topics"])
+
+    def _create_points(self, query, params):
+        meeting = self.meetings[params["meeting_id"]]
+        for row in params["rows"]:
+            point = dict(row, meeting_id=meeting["id"], previous=None, following=None)
+            point["people"] = [name for name in row["people"] if name in self.people]
+            point["topics"] = [name for name in row["topics"] if name in self.topics]
+            self.points[row["id"]] = point
+            meeting["points"].append(row["id"])
+            for token in set(tokenize(row["content"] or "")):
+                self.postings.setdefault(token, set()).add(row["id"])
+
+    def _link_next(self, query, params):
+        ids = params["ids"]
+        for a, b in zip(ids, ids[1:]):
+            self.points[a]["following"] = b
+            self.points[b]["previous"] = a
+
+    def _create_chunks(self, query, params):
+        for chunk in params["chunks"]:
+            self.chunks[chunk["id"]] = {
+                "meeting_id": params["meeting_id"],
+                "point_ids": [id for id in chunk["point_ids"] if id in self.points]
+            }
+
+    def _delete_chunks(self, query, params):
+        ids = set(params["ids"])
+        for chunk_id in [id for id, chunk in self.chunks.items() if chunk["meeting_id"] in ids]:
+            del self.chunks[chunk_id]
+
+    def _delete_meetings(self, query, params):
+        for meeting_id in params["ids"]:
+            for key in [key for key in self.covered if key[1] == meeting_id]:
+                del self.covered[key]
+            meeting = self.meetings.pop(meeting_id, None)
+            for point_id in (meeting or {}).get("points", []):
+                point = self.points.pop(point_id)
+                for token in set(tokenize(point["content"] or "")):
+                    self.postings.get(token, set()).discard(point_id)
+
+    def _entity_names(self, query, params):
+        return [{"name": name} for name in sorted(self.topics) + sorted(self.people)]
+
+    def _contents(self, query, params):
+        return [{"content": point["content"]} for point in self.points.values()]
+
+    @staticmethod
+    def _clauses(search):
+        clauses = []
+        for clause in search.split(" OR "):
+            clause = re.sub(r"\\(.)", r"\1", clause.strip()).strip('"')
+            tokens = tokenize(clause)
+            if tokens:
+                clauses.append(tokens)
+        return clauses
+
+    def _fulltext(self, query, params):
+        window = int(re.search(r"NEXT\*1\.\.(\d+)", query).group(1))
+        scores = {}
+        for tokens in self._clauses(params["search"]):
+            phrase = re.compile(r"\b" + r"\W+".join(map(re.escape, tokens)) + r"\b")
+            for point_id in self.postings.get(tokens[0], ()):
+                hits = len(phrase.findall(self.points[point_id]["content"].lower()))
+                if hits:
+                    scores[point_id] = scores.get(point_id, 0.0) + hits * len(tokens)
+        ranked = sorted(scores, key=lambda id: (-scores[id], id))[:params.get("limit", 20)]
+
+        records = []
+        for point_id in ranked:
+            point = self.points[point_id]
+            prior = []
+            previous = point["previous"]
+            while previous and len(prior) < window:
+                prior.insert(0, self.points[previous]["content"])
+                previous = self.points[previous]["previous"]
+            records.append({
+                "id": point_id,
+                "timestamp": point["timestamp"],
+                "content": point["content"],
+                "meeting_title": self.meetings[point["meeting_id"]]["title"],
+                "topics": point["topics"],
+                "people": point["people"],
+                "prior_context": prior,
+                "score": scores[point_id]
+            })
+        return records
+
+    def _contributions(self, query, params):
+        ids = params["ids"] if "m.id IN $ids" in query else list(self.meetings)
+        records = []
+        for meeting_id in ids:
+            meeting = self.meetings.get(meeting_id)
+            if not meeting or not meeting["points"]:
+                continue
+            records.append({
+                "meeting_id": meeting_id,
+                "date": meeting["date"],
+                "points": [
+                    {"people": self.points[id]["people"], "topics": self.points[id]["topics"]}
+                    for id in meeting["points"]
+                ]
+            })
+        return records
+
+    @staticmethod
+    def _widen(stats, date):
+        if date is None:
+            return
+        if stats["first_seen"] is None or date < stats["first_seen"]:
+            stats["first_seen"] = date
+        if stats["last_seen"] is None or date > stats["last_seen"]:
+            stats["last_seen"] = date
+
+    @staticmethod
+    def _new_stats():
+        return {"mentions": 0, "meetings": 0, "first_seen": None, "last_seen": None}
+
+    def _add_entities(self, query, params):
+        label = re.search(r"MATCH \(n:(\w+)", query).group(1)
+        for entity in params["entities"]:
+            stats = self.entity_stats.setdefault((label, entity["name"]), self._new_stats())
+            stats["mentions"] += entity["mentions"]
+            stats["meetings"] += 1
+            self._widen(stats, params["date"])
+
+    def _add_pairs(self, query, params):
+        relationship = re.search(r"\[r:(\w+)\]", query).group(1)
+        for pair in params["pairs"]:
+            stats = self.pair_stats.setdefault((relationship, pair["a"], pair["b"]), self._new_stats())
+            stats["mentions"] += pair["mentions"]
+            stats["meetings"] += 1
+            self._widen(stats, params["date"])
+
+    def _cover_meeting(self, query, params):
+        for entity in params["entities"]:
+            self.covered[(entity["name"], params["meeting_id"])] = entity["mentions"]
+
+    def _remove_entities(self, query, params):
+        label = re.search(r"MATCH \(n:(\w+)", query).group(1)
+        for entity in params["entities"]:
+            stats = self.entity_stats.get((label, entity["name"]))
+            if stats is None:
+                continue
+            stats["mentions"] -= entity["mentions"]
+            stats["meetings"] -= 1
+            if stats["meetings"] <= 0:
+                del self.entity_stats[(label, entity["name"])]
+
+    def _remove_pairs(self, query, params):
+        relationship = re.search(r"\[r:(\w+)\]", query).group(1)
+        for pair in params["pairs"]:
+            key = (relationship, pair["a"], pair["b"])
+            stats = self.pair_stats.get(key)
+            if stats is None:
+                continue
+            stats["mentions"] -= pair["mentions"]
+            stats["meetings"] -= 1
+            if stats["meetings"] <= 0:
+                del self.pair_stats[key]
+
+    def _refresh(self, stats, date, matches):
+        """Recompute first/last seen from the remaining points when `date` was a boundary"""
+        if stats is None or date is None or date not in (stats["first_seen"], stats["last_seen"]):
+            return
+        dates = [
+            self.meetings[point["meeting_id"]]["date"] for point in self.points.values() if matches(point)
+        ]
+        dates = [date for date in dates if date is not None]
+        stats["first_seen"] = min(dates, default=None)
+        stats["last_seen"] = max(dates, default=None)
+
+    def _refresh_entities(self, query, params):
+        label = re.search(r"MATCH \(n:(\w+)", query).group(1)
+        field = "people" if label == "Person" else "topics"
+        for entity in params["entities"]:
+            self._refresh(
+                self.entity_stats.get((label, entity["name"])), params["date"],
+                lambda point: entity["name"] in point[field]
+            )
+
+    def _refresh_pairs(self, query, params):
+        relationship = re.search(r"\[r:(\w+)\]", query).group(1)
+        second = "topics" if relationship == "DISCUSSES" else "people"
+        for pair in params["pairs"]:
+            self._refresh(
+                self.pair_stats.get((relationship, pair["a"], pair["b"])), params["date"],
+                lambda point: pair["a"] in point["people"] and pair["b"] in point[second]
+            )
+
+    def _clear_pairs(self, query, params):
+        self.pair_stats.clear()
+        self.covered.clear()
+
+    def _clear_entities(self, query, params):
+        self.entity_stats.clear()
+
+    def _related(self, relationship, name, limit):
+        """Aggregate pairs touching `name`, most mentions first, as lookup rows"""
+        rows = []
+        for (kind, a, b), stats in self.pair_stats.items():
+            if kind == relationship and name in (a, b):
+                rows.append(dict(stats, name=b if a == name else a))
+        return sorted(rows, key=lambda row: (-row["mentions"], row["name"]))[:limit]
+
+    def _key_people(self, query, params):
+        people = sorted(
+            ((name, stats) for (label, name), stats in self.entity_stats.items() if label == "Person"),
+            key=lambda item: (-item[1]["mentions"], item[0])
+        )[:params["limit"]]
+        return [
+            dict(stats, name=name, topics=[
+                row["name"] for row in self._related("DISCUSSES", name, params["per_person"])
+            ])
+            for name, stats in people
+        ]
+
+    def _topic_overview(self, query, params):
+        name = params["name"]
+        if name not in self.topics:
+            return []
+        meetings = sorted(
+            (self.meetings[meeting_id] for topic, meeting_id in self.covered if topic == name),
+            key=lambda meeting: meeting["date"] or "", reverse=True
+        )[:params["limit"]]
+        stats = self.entity_stats.get(("Topic", name)) or dict.fromkeys(self._new_stats())
+        return [dict(
+            stats, name=name,
+            people=self._related("DISCUSSES", name, params["limit"]),
+            recent_meetings=[
+                {"id": meeting["id"], "title": meeting["title"], "date": meeting["date"],
+                 "mentions": self.covered[(name, meeting["id"])]}
+                for meeting in meetings
+            ]
+        )]
+
+    def _person_overview(self, query, params):
+        name = params["name"]
+        if name not in self.people:
+            return []
+        stats = self.entity_stats.get(("Person", name)) or dict.fromkeys(self._new_stats())
+        return [dict(
+            stats, name=name,
+            topics=self._related("DISCUSSES", name, params["limit"]),
+            co_mentioned=self._related("CO_MENTIONED", name, params["limit"])
+        )]
+
+    def _chunk_points(self, query, params):
+        return [
+            {"chunk_id": chunk_id, "point_ids": self.chunks[chunk_id]["point_ids"]}
+            for chunk_id in params["chunk_ids"] if self.chunks.get(chunk_id, {}).get("point_ids")
+        ]
+
+    def _expand(self, query, params):
+        records = []
+        for point_id in params["point_ids"]:
+            point = self.points.get(point_id)
+            if point is None:
+                continue
+            neighbours = {
+                side: [self.points[point[side]]["content"]] if point[side] else []
+                for side in ("previous", "following")
+            }
+            records.append({
+                "point_id": point_id,
+                "timestamp": point["timestamp"],
+                "content": point["content"],
+                "meeting_title": self.meetings[point["meeting_id"]]["title"],
+                "topics": point["topics"],
+                "people": point["people"],
+                "prior_context": neighbours["previous"],
+                "following_context": neighbours["following"]
+            })
+        return records
+
+
+class _FakeTransaction:
+    def __init__(self, graph):
+        self.graph = graph
+
+    def run(self, query, parameters=None, **kwargs):
+        return self.graph.run(query, parameters, **kwargs)
+
+
+class FakeSession:
+    def __init__(self, graph):
+        self.graph = graph
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def close(self):
+        pass
+
+    def run(self, query, parameters=None, **kwargs):
+        return self.graph.run(query, parameters, **kwargs)
+
+    def execute_write(self, work, *args, **kwargs):
+        # Writes are serialised, standing in for a transaction
+        with self.graph.lock:
+            return work(_FakeTransaction(self.graph), *args, **kwargs)
+
+    execute_read = execute_write
+
+
+class FakeGraphDriver:
+    """Neo4j driver stand-in backed by a FakeGraph"""
+
+    def __init__(self, graph=None, latency=0.0):
+        self.graph = graph or FakeGraph(latency=latency)
+
+    def session(self, database=None, **kwargs):
+        return FakeSession(self.graph)
+
+    def verify_connectivity(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class AsyncFakeResult(FakeResult):
+    def __aiter__(self):
+        return self._records()
+
+    async def _records(self):
+        for record in self.records:
+            yield record
+
+    async def single(self):
+        return FakeResult.single(self)
+
+    async def data(self):
+        return FakeResult.data(self)
+
+    async def consume(self):
+        return None
+
+
+class AsyncFakeSession:
+    def __init__(self, graph, latency):
+        self.graph = graph
+        self.latency = latency
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def close(self):
+        pass
+
+    async def run(self, query, parameters=None, **kwargs):
+        await _async_sleep(self.latency)
+        return AsyncFakeResult(self.graph.execute(query, dict(parameters or {}, **kwargs)).records)
+
+
+class AsyncFakeGraphDriver:
+    """neo4j AsyncDriver stand-in; pass the FakeGraph of a sync driver to share its data"""
+
+    def __init__(self, graph=None, latency=0.0):
+        self.graph = graph or FakeGraph()
+        self.latency = latency
+
+    def session(self, database=None, **kwargs):
+        return AsyncFakeSession(self.graph, self.latency)
+
+    async def verify_connectivity(self):
+        pass
+
+    async def close(self):
+        pass
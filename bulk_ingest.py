@@ -0,0 +1,302 @@
+import argparse
+import glob
+import hashlib
+import json
+import os
+import queue
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+from graph_agent import GraphAgent
+from instrumentation import trace
+from metadata_filters import DATE_IN_TEXT
+
+_parser = None
+
+
+def _get_parser():
+    # One parse-only agent per worker process
+    global _parser
+    if _parser is None:
+        _parser = GraphAgent(connect=False)
+    return _parser
+
+
+def parse_file(path, with_chunks=True):
+    """Parse one transcript file into a meeting dict (runs in a worker process)
+
+    Ids are derived from the absolute path and content hash, so re-ingesting
+    the same file always produces the same meeting, point and chunk ids and
+    same-named files in different directories never collide.
+    """
+    try:
+        with open(path, 'rb') as f:
+            raw = f.read()
+        digest = hashlib.sha256(raw).hexdigest()
+        notes = raw.decode('utf-8')
+
+        lines = notes.split('\n')
+        title_index = next((i for i, line in enumerate(lines) if line.strip()), None)
+        file_name = os.path.basename(path)
+        if title_index is None:
+            title, body = os.path.splitext(file_name)[0], ""
+        else:
+            title, body = lines[title_index].strip(), '\n'.join(lines[title_index + 1:])
+
+        match = DATE_IN_TEXT.search(file_name)
+        date = "-".join(match.groups()) if match else None
+
+        parser = _get_parser()
+        meeting_id = str(uuid.uuid5(uuid.NAMESPACE_URL, f"{os.path.abspath(path)}:{digest}"))
+        points = parser.parse_meeting_notes(body)
+        for seq, point in enumerate(points):
+            point["id"] = str(uuid.uuid5(uuid.UUID(meeting_id), str(seq)))
+        chunks = parser.chunk_points(meeting_id, title, points, date=date) if with_chunks else []
+
+        return {
+            "path": path,
+            "file_hash": digest,
+            "bytes": len(raw),
+            "meeting": {
+                "meeting_id": meeting_id,
+                "title": title,
+                "date": date,
+                "points": points,
+                "chunks": chunks
+            }
+        }
+    except Exception as e:
+        return {"path": path, "error": str(e)}
+
+
+def expand_paths(patterns, pattern="*.txt"):
+    """Resolve directories (searched recursively for `pattern`), globs and files"""
+    paths = []
+    for entry in patterns:
+        if os.path.isdir(entry):
+            paths.extend(glob.glob(os.path.join(entry, "**", pattern), recursive=True))
+        else:
+            paths.extend(glob.glob(entry, recursive=True))
+    return sorted({os.path.abspath(path) for path in paths if os.path.isfile(path)})
+
+
+class BulkIngester:
+    """Parse transcripts in a process pool and write them to Neo4j and the vector index in batches
+
+    Parsed meetings flow from the pool through a bounded queue to a single
+    writer thread, which commits up to `batch_size` meetings per graph
+    transaction, upserts their chunks and then checkpoints every file in the
+    batch. Files whose content hash is already checkpointed are skipped, so
+    an interrupted run picks up where it stopped.
+    """
+
+    def __init__(self, db, vector_store=None, workers=None, batch_size=16, queue_size=64,
+                 checkpoint_path=None):
+        self.db = db
+        self.vector_store = vector_store
+        self.workers = workers or os.cpu_count() or 1
+        self.batch_size = batch_size
+        self.queue_size = queue_size
+        self.checkpoint_path = checkpoint_path or os.getenv(
+            "BULK_INGEST_CHECKPOINT_PATH",
+            os.path.join(".cache", "bulk_ingest_checkpoint.json")
+        )
+        self.checkpoint = self.load_checkpoint()
+        self.stats = {"files": 0, "skipped": 0, "failed": 0, "points": 0, "chunks": 0, "bytes": 0}
+        self.failures = []
+
+    def load_checkpoint(self):
+        if not os.path.exists(self.checkpoint_path):
+            return {}
+        with open(self.checkpoint_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def save_checkpoint(self):
+        directory = os.path.dirname(self.checkpoint_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = self.checkpoint_path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.checkpoint, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.checkpoint_path)
+
+    def pending_paths(self, paths):
+        """Paths whose current content has not been ingested yet"""
+        pending = []
+        for path in paths:
+            entry = self.checkpoint.get(path)
+            if entry:
+                with open(path, 'rb') as f:
+                    if hashlib.sha256(f.read()).hexdigest() == entry["file_hash"]:
+                        self.stats["skipped"] += 1
+                        continue
+            pending.append(path)
+        return pending
+
+    def write_batch(self, parsed):
+        """Commit one batch of parsed files to the graph and vector index, then checkpoint it"""
+        with trace("bulk_ingest"):
+            self._write_batch(parsed)
+
+    def _write_batch(self, parsed):
+        # A path listed twice in one batch would repeat its meeting id and
+        # trip the uniqueness constraint, so keep only its last parse
+        parsed = list({item["meeting"]["meeting_id"]: item for item in parsed}.values())
+
+        # Earlier versions of edited files, and meetings from a batch whose
+        # checkpoint was lost, are replaced rather than duplicated
+        replace_ids = set()
+        stale_chunks = []
+        for item in parsed:
+            replace_ids.add(item["meeting"]["meeting_id"])
+            previous = self.checkpoint.get(item["path"])
+            if previous:
+                replace_ids.add(previous["meeting_id"])
+                if previous["meeting_id"] != item["meeting"]["meeting_id"]:
+                    stale_chunks.extend(
+                        f"{previous['meeting_id']}_{i}" for i in range(previous["chunks"])
+                    )
+
+        self.db.ingest_meetings([item["meeting"] for item in parsed], replace_ids=replace_ids)
+
+        if self.vector_store:
+            self.vector_store.upsert_records(
+                chunk for item in parsed for chunk in item["meeting"]["chunks"]
+            )
+            self.vector_store.delete_ids(stale_chunks)
+            self.vector_store.index.flush()
+
+        for item in parsed:
+            meeting = item["meeting"]
+            self.checkpoint[item["path"]] = {
+                "file_hash": item["file_hash"],
+                "meeting_id": meeting["meeting_id"],
+                "chunks": len(meeting["chunks"])
+            }
+            self.stats["files"] += 1
+            self.stats["points"] += len(meeting["points"])
+            self.stats["chunks"] += len(meeting["chunks"])
+            self.stats["bytes"] += item["bytes"]
+        self.save_checkpoint()
+
+    def _writer(self, results, total, started, errors):
+        batch = []
+        try:
+            while True:
+                item = results.get()
+                if item is not None:
+                    if "error" in item:
+                        self.stats["failed"] += 1
+                        self.failures.append(item)
+                        print(f"Failed to parse {item['path']}: {item['error']}")
+                    else:
+                        batch.append(item)
+                # Write when the batch is full, the queue has run dry or input has ended
+                if batch and (item is None or len(batch) >= self.batch_size or results.empty()):
+                    self.write_batch(batch)
+                    batch = []
+                    self.report(total, started)
+                if item is None:
+                    return
+        except Exception as e:
+            errors.append(e)
+            # Keep draining so the producer never blocks on a full queue
+            while results.get() is not None:
+                pass
+
+    def run(self, paths):
+        """Ingest every new or changed file among `paths` and return the throughput report"""
+        started = time.monotonic()
+        paths = self.pending_paths(paths)
+        print(f"Ingesting {len(paths)} files with {self.workers} workers "
+              f"({self.stats['skipped']} already ingested)")
+
+        results = queue.Queue(maxsize=self.queue_size)
+        errors = []
+        writer = threading.Thread(
+            target=self._writer, args=(results, len(paths), started, errors), daemon=True
+        )
+        writer.start()
+
+        with_chunks = self.vector_store is not None
+        try:
+            with ProcessPoolExecutor(max_workers=self.workers) as pool:
+                # At most queue_size files are in flight, so parsed meetings never pile up in memory
+                in_flight = set()
+                for path in paths:
+                    if errors:
+                        break
+                    if len(in_flight) >= self.queue_size:
+                        done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            results.put(future.result())
+                    in_flight.add(pool.submit(parse_file, path, with_chunks))
+                for future in in_flight:
+                    results.put(future.result())
+        finally:
+            results.put(None)
+            writer.join()
+
+        if errors:
+            raise errors[0]
+        return self.report(len(paths), started, final=True)
+
+    def report(self, total, started, final=False):
+        elapsed = max(time.monotonic() - started, 1e-9)
+        report = dict(
+            self.stats,
+            seconds=round(elapsed, 2),
+            files_per_second=round(self.stats["files"] / elapsed, 2),
+            points_per_second=round(self.stats["points"] / elapsed, 2),
+            megabytes_per_second=round(self.stats["bytes"] / elapsed / 1e6, 3)
+        )
+        prefix = "Done" if final else "Progress"
+        print(f"{prefix}: {self.stats['files']}/{total} files, {self.stats['points']} points, "
+              f"{self.stats['chunks']} chunks in {report['seconds']}s "
+              f"({report['files_per_second']} files/s, {report['points_per_second']} points/s)")
+        return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk ingest meeting transcripts into Neo4j and the vector index")
+    parser.add_argument("paths", nargs="+", help="Transcript files, directories or glob patterns")
+    parser.add_argument("--pattern", default="*.txt", help="File pattern used inside directories")
+    parser.add_argument("--workers", type=int, default=None, help="Parser processes (default: all cores)")
+    parser.add_argument("--batch-size", type=int, default=16, help="Meetings per graph transaction")
+    parser.add_argument("--queue-size", type=int, default=64, help="Parsed meetings buffered ahead of the writer")
+    parser.add_argument("--checkpoint", default=None, help="Checkpoint file path")
+    parser.add_argument("--no-vectors", action="store_true", help="Only write the graph")
+    parser.add_argument("--restart", action="store_true", help="Ignore the existing checkpoint")
+    args = parser.parse_args()
+
+    graph_agent = GraphAgent()
+    vector_store = None
+    try:
+        if not args.no_vectors:
+            from vectorize_store import VectorStore
+            vector_store = VectorStore()
+
+        ingester = BulkIngester(
+            graph_agent.db,
+            vector_store=vector_store,
+            workers=args.workers,
+            batch_size=args.batch_size,
+            queue_size=args.queue_size,
+            checkpoint_path=args.checkpoint
+        )
+        if args.restart:
+            ingester.checkpoint = {}
+
+        report = ingester.run(expand_paths(args.paths, args.pattern))
+        print(json.dumps(report, indent=2))
+    except Exception as e:
+        print(f"Error during bulk ingestion: {str(e)}")
+        raise
+    finally:
+        graph_agent.close()
+
+
+if __name__ == "__main__":
+    main()
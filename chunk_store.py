@@ -0,0 +1,94 @@
+import os
+import sqlite3
+import threading
+
+from vector_index import Match
+
+_default_store = None
+_default_store_lock = threading.Lock()
+
+
+class ChunkStore:
+    """Local SQLite store of chunk texts keyed by vector id
+
+    Vector metadata only carries filterable fields; the text of the top-k
+    matches is read from here once their ids are known.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS chunks ("
+            "id TEXT PRIMARY KEY, "
+            "text TEXT NOT NULL)"
+        )
+        self.conn.commit()
+
+    @classmethod
+    def from_env(cls):
+        return cls(os.getenv("CHUNK_STORE_PATH", os.path.join(".cache", "chunks.sqlite")))
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+    def put_many(self, chunks):
+        """Store (id, text) pairs, replacing earlier texts of the same ids"""
+        with self.lock:
+            self.conn.executemany("INSERT OR REPLACE INTO chunks (id, text) VALUES (?, ?)", chunks)
+            self.conn.commit()
+
+    def get_many(self, ids):
+        """Texts of the given ids as a dict; unknown ids are left out"""
+        ids = list(ids)
+        found = {}
+        with self.lock:
+            # Stay well below SQLite's bound parameter limit
+            for start in range(0, len(ids), 500):
+                chunk = ids[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                found.update(self.conn.execute(
+                    f"SELECT id, text FROM chunks WHERE id IN ({placeholders})",
+                    chunk
+                ))
+        return found
+
+    def attach(self, matches):
+        """Copies of vector matches with their chunk text in metadata['content']"""
+        texts = self.get_many(match.id for match in matches) if matches else {}
+        attached = []
+        for match in matches:
+            metadata = dict(match.metadata or {})
+            if match.id in texts:
+                metadata["content"] = texts[match.id]
+            # Vectors written before the chunk store carry their text in metadata
+            metadata.setdefault("content", "")
+            attached.append(Match(match.id, match.score, metadata))
+        return attached
+
+    def delete_many(self, ids):
+        with self.lock:
+            self.conn.executemany("DELETE FROM chunks WHERE id = ?", [(id,) for id in ids])
+            self.conn.commit()
+
+    def __len__(self):
+        with self.lock:
+            return self.conn.execute("SELECT COUNT(*) FROM chunks").fetchone()[0]
+
+
+def get_default_chunk_store():
+    """Process-wide chunk store configured from the environment"""
+    global _default_store
+    with _default_store_lock:
+        if _default_store is None:
+            _default_store = ChunkStore.from_env()
+        return _default_store
@@ -0,0 +1,166 @@
+import re
+
+from embeddings import count_tokens, EMBEDDING_MODEL
+
+RULE_PATTERN = re.compile(r'^\s*([-=])\1{2,}\s*$')
+QUESTION_PATTERN = re.compile(r'^\s*Q:\s*')
+SENTENCE_END = re.compile(r'(?<=[.!?])\s+(?=[A-Z0-9"\'(])')
+
+
+def classify_lines(lines):
+    """Label each line as 'header', 'question', 'text' or 'blank' with one line of lookahead
+
+    A header is a line underlined by a rule of dashes or equals signs, as in
+    the numbered sections of the meeting analysis files. Rules themselves
+    are dropped.
+    """
+    pending = None
+    for line in lines:
+        line = line.rstrip('\n')
+        if RULE_PATTERN.match(line):
+            if pending is not None and pending.strip():
+                yield 'header', pending.strip()
+            pending = None
+            continue
+        if pending is not None:
+            yield _classify(pending)
+        pending = line
+    if pending is not None:
+        yield _classify(pending)
+
+
+def _classify(line):
+    if not line.strip():
+        return 'blank', ''
+    if QUESTION_PATTERN.match(line):
+        return 'question', line.strip()
+    return 'text', line.strip()
+
+
+def split_sentences(text):
+    return [sentence for sentence in SENTENCE_END.split(text) if sentence.strip()]
+
+
+class StreamingChunker:
+    """Token-bounded chunks that follow section, Q/A and sentence boundaries
+
+    Lines are consumed lazily, so memory use depends on the chunk size
+    rather than the file size. Every section header and every question
+    starts a new chunk, chunks are filled sentence by sentence up to
+    `max_tokens`, and a chunk that overflows carries up to its last
+    `overlap_tokens` worth of sentences into the next one, less whatever
+    would push that chunk past `max_tokens`. Chunks inside a
+    section are prefixed with the section header.
+    """
+
+    def __init__(self, max_tokens=300, overlap_tokens=50, model=EMBEDDING_MODEL):
+        if overlap_tokens >= max_tokens:
+            raise ValueError("overlap_tokens must be smaller than max_tokens")
+        self.max_tokens = max_tokens
+        self.overlap_tokens = overlap_tokens
+        self.model = model
+
+    def _units(self, lines):
+        """Yield (kind, text) units: section headers, hard breaks and sentences"""
+        paragraph = []
+        paragraph_tokens = 0
+        for kind, text in classify_lines(lines):
+            if kind == 'text':
+                paragraph.append(text)
+                paragraph_tokens += count_tokens(text, self.model)
+                # A long run of lines without a break is emitted as it goes, keeping
+                # only the possibly unfinished last sentence buffered
+                if paragraph_tokens > self.max_tokens:
+                    sentences = split_sentences(' '.join(paragraph))
+                    tail = sentences.pop() if len(sentences) > 1 else None
+                    for sentence in sentences:
+                        yield 'sentence', sentence
+                    paragraph = [tail] if tail else []
+                    paragraph_tokens = count_tokens(tail, self.model) if tail else 0
+                continue
+            if paragraph:
+                for sentence in split_sentences(' '.join(paragraph)):
+                    yield 'sentence', sentence
+                paragraph = []
+                paragraph_tokens = 0
+            if kind == 'header':
+                yield 'header', text
+            elif kind == 'question':
+                yield 'break', None
+                paragraph.append(text)
+                paragraph_tokens = count_tokens(text, self.model)
+        if paragraph:
+            for sentence in split_sentences(' '.join(paragraph)):
+                yield 'sentence', sentence
+
+    def _split_long(self, sentence, header_tokens=0):
+        """Cut a sentence that alone exceeds the budget at word boundaries
+
+        Pieces leave room for the section header and the carried overlap.
+        """
+        budget = max(1, self.max_tokens - header_tokens - self.overlap_tokens)
+        piece = []
+        for word in sentence.split():
+            if piece and count_tokens(' '.join(piece + [word]), self.model) > budget:
+                yield ' '.join(piece)
+                piece = []
+            piece.append(word)
+        if piece:
+            yield ' '.join(piece)
+
+    def chunks(self, lines):
+        header = None
+        current = []  # (sentence, tokens)
+        current_tokens = 0
+        header_tokens = 0
+        fresh = 0  # sentences added since the chunk was started or carried over
+
+        def render():
+            body = ' '.join(sentence for sentence, _ in current)
+            return f"{header}\n{body}" if header else body
+
+        for kind, text in self._units(lines):
+            if kind in ('header', 'break'):
+                if fresh:
+                    yield render()
+                current, current_tokens, fresh = [], 0, 0
+                if kind == 'header':
+                    header = text
+                    header_tokens = count_tokens(header, self.model)
+                continue
+
+            tokens = count_tokens(text, self.model)
+            pieces = [(text, tokens)]
+            if header_tokens + tokens > self.max_tokens:
+                pieces = [(piece, count_tokens(piece, self.model)) for piece in self._split_long(text, header_tokens)]
+
+            for piece, piece_tokens in pieces:
+                if fresh and header_tokens + current_tokens + piece_tokens > self.max_tokens:
+                    yield render()
+                    # Carry the tail of this chunk over as overlap
+                    carried = []
+                    carried_tokens = 0
+                    for sentence, sentence_tokens in reversed(current):
+                        if carried_tokens + sentence_tokens > self.overlap_tokens:
+                            break
+                        carried.insert(0, (sentence, sentence_tokens))
+                        carried_tokens += sentence_tokens
+                    current, current_tokens, fresh = carried, carried_tokens, 0
+                # Drop carried overlap from the front until the piece fits
+                while current and header_tokens + current_tokens + piece_tokens > self.max_tokens:
+                    _, dropped_tokens = current.pop(0)
+                    current_tokens -= dropped_tokens
+                current.append((piece, piece_tokens))
+                current_tokens += piece_tokens
+                fresh += 1
+
+        if fresh:
+            yield render()
+
+    def chunk_file(self, file_path):
+        """Yield chunks of a text file, reading it line by line"""
+        with open(file_path, 'r', encoding='utf-8') as f:
+            yield from self.chunks(f)
+
+    def chunk_text(self, text):
+        return list(self.chunks(text.splitlines()))
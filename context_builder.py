@@ -0,0 +1,147 @@
+import re
+
+from embeddings import count_tokens
+
+WORD_PATTERN = re.compile(r"\w+")
+
+
+def shingles(text, size=3):
+    """Word n-gram shingles used for near-duplicate detection"""
+    words = WORD_PATTERN.findall(text.lower())
+    if len(words) < size:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+
+def overlap(a, b):
+    """Containment of the smaller shingle set in the larger one"""
+    if not a or not b:
+        return 0.0
+    return len(a & b) / min(len(a), len(b))
+
+
+class Passage:
+    __slots__ = ("source", "text", "score", "record", "parent", "shingles", "tokens")
+
+    def __init__(self, source, text, score, record=None, parent=None):
+        self.source = source
+        self.text = text
+        self.score = score
+        self.record = record
+        self.parent = parent
+        self.shingles = shingles(text)
+        self.tokens = 0
+
+
+class ContextBuilder:
+    """Assemble prompt context from vector and graph results within a token budget
+
+    Passages from both sources are ranked by their retrieval scores
+    (normalised per source so cosine and full-text scores are comparable),
+    near-duplicates of higher-ranked passages are removed, and passages are
+    added until the budget is spent. Everything left out is recorded with
+    the reason.
+    """
+
+    def __init__(self, token_budget=3000, duplicate_threshold=0.8, prior_context_weight=0.5, model="gpt-4"):
+        self.token_budget = token_budget
+        self.duplicate_threshold = duplicate_threshold
+        self.prior_context_weight = prior_context_weight
+        self.model = model
+
+    @staticmethod
+    def _normalized(scores):
+        top = max(scores, default=0) or 1.0
+        return [score / top for score in scores]
+
+    def _passages(self, vector_results, graph_results):
+        passages = []
+        vector_scores = self._normalized([match.score or 0.0 for match in vector_results])
+        for match, score in zip(vector_results, vector_scores):
+            passages.append(Passage("vector", match.metadata['content'], score, record=match))
+
+        graph_scores = self._normalized([record.get('score') or 1.0 for record in graph_results])
+        for record, score in zip(graph_results, graph_scores):
+            parent = Passage("graph", record['content'], score, record=record)
+            passages.append(parent)
+            for source in ("prior_context", "following_context"):
+                for text in record.get(source) or []:
+                    passages.append(Passage(
+                        source, text, score * self.prior_context_weight, parent=parent
+                    ))
+        return passages
+
+    def _format_graph(self, record, prior_context, following_context=()):
+        text = f"Meeting: {record['meeting_title']}\nContent: {record['content']}\n"
+        if record['topics']:
+            text += f"Topics: {', '.join(record['topics'])}\n"
+        if record['people']:
+            text += f"People involved: {', '.join(record['people'])}\n"
+        for earlier in prior_context:
+            text += f"Earlier in the meeting: {earlier}\n"
+        for later in following_context:
+            text += f"Later in the meeting: {later}\n"
+        return text
+
+    def build(self, vector_results, graph_results, summary=()):
+        """Return the kept passages per source plus token usage and what was dropped
+
+        `summary` blocks (aggregate overviews) are placed first and count
+        against the same token budget as the passages.
+        """
+        passages = sorted(
+            self._passages(vector_results, graph_results),
+            key=lambda passage: -passage.score
+        )
+
+        kept = []
+        dropped = []
+        tokens = 0
+        summaries = []
+        for text in summary:
+            block = Passage("summary", text, 1.0)
+            block.tokens = count_tokens(text, self.model) + 1
+            if tokens + block.tokens > self.token_budget:
+                dropped.append((block, "budget"))
+                continue
+            summaries.append(text)
+            tokens += block.tokens
+
+        for passage in passages:
+            if passage.parent is not None and passage.parent not in kept:
+                dropped.append((passage, "parent dropped"))
+                continue
+            if any(overlap(passage.shingles, other.shingles) >= self.duplicate_threshold for other in kept):
+                dropped.append((passage, "duplicate"))
+                continue
+
+            if passage.source == "graph":
+                passage.tokens = count_tokens(self._format_graph(passage.record, []), self.model)
+            else:
+                passage.tokens = count_tokens(passage.text, self.model) + 4
+            if tokens + passage.tokens > self.token_budget:
+                dropped.append((passage, "budget"))
+                continue
+
+            kept.append(passage)
+            tokens += passage.tokens
+
+        graph = []
+        for passage in kept:
+            if passage.source == "graph":
+                prior = [p.text for p in kept if p.parent is passage and p.source == "prior_context"]
+                following = [p.text for p in kept if p.parent is passage and p.source == "following_context"]
+                graph.append(self._format_graph(passage.record, prior, following))
+
+        return {
+            "vector": [passage.text for passage in kept if passage.source == "vector"],
+            "graph": graph,
+            "summary": summaries,
+            "tokens": tokens,
+            "budget": self.token_budget,
+            "dropped": [
+                {"source": passage.source, "reason": reason, "score": round(passage.score, 4),
+                 "preview": passage.text[:80]}
+                for passage, reason in dropped
+            ]
+        }
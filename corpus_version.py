@@ -0,0 +1,81 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # no cross-process locking on Windows
+    fcntl = None
+
+_lock = threading.Lock()
+_cached = {"mtime": None, "version": None}
+
+
+def version_path():
+    return os.getenv("CORPUS_VERSION_PATH", os.path.join(".cache", "corpus_version.json"))
+
+
+def _read(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def current():
+    """Return the corpus version as a tuple of (source, counter) pairs
+
+    The version file is only re-read when its modification time changes,
+    so this is cheap enough to call on every query.
+    """
+    path = version_path()
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return ()
+    with _lock:
+        if _cached["mtime"] != mtime:
+            counters = _read(path).get("counters", {})
+            _cached["version"] = tuple(sorted(counters.items()))
+            _cached["mtime"] = mtime
+        return _cached["version"]
+
+
+@contextmanager
+def _file_lock(path):
+    """Hold an exclusive lock on a sidecar file so other processes' bumps wait"""
+    if fcntl is None:
+        yield
+        return
+    with open(f"{path}.lock", 'a') as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def bump(source):
+    """Record that `source` ("graph" or "vector") changed the corpus
+
+    The read-modify-write holds a lock across processes, so concurrent
+    bumps of different sources never overwrite each other's counters.
+    """
+    path = version_path()
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with _lock, _file_lock(path):
+        state = _read(path)
+        counters = state.get("counters", {})
+        counters[source] = counters.get(source, 0) + 1
+        state = {"counters": counters, "updated_at": time.time()}
+
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+        os.replace(tmp_path, path)
+        return counters[source]
@@ -1,36 +1,187 @@
-from neo4j import GraphDatabase
 import os
+import re
+import threading
+import uuid
+from collections import Counter
+from itertools import combinations
 from dotenv import load_dotenv
+import corpus_version
+from instrumentation import span
+from neo4j_driver import get_driver, pool_stats
+
+# Full-text index backing keyword search over discussion points
+DISCUSSION_FULLTEXT_INDEX = "discussion_content"
+
+SCHEMA_STATEMENTS = [
+    "CREATE CONSTRAINT meeting_id IF NOT EXISTS FOR (m:Meeting) REQUIRE m.id IS UNIQUE",
+    "CREATE CONSTRAINT discussion_point_id IF NOT EXISTS FOR (d:DiscussionPoint) REQUIRE d.id IS UNIQUE",
+    "CREATE CONSTRAINT person_name IF NOT EXISTS FOR (p:Person) REQUIRE p.name IS UNIQUE",
+    "CREATE CONSTRAINT topic_name IF NOT EXISTS FOR (t:Topic) REQUIRE t.name IS UNIQUE",
+    "CREATE CONSTRAINT chunk_id IF NOT EXISTS FOR (c:Chunk) REQUIRE c.id IS UNIQUE",
+    "CREATE CONSTRAINT aggregate_lock_id IF NOT EXISTS FOR (l:AggregateLock) REQUIRE l.id IS UNIQUE",
+    f"CREATE FULLTEXT INDEX {DISCUSSION_FULLTEXT_INDEX} IF NOT EXISTS "
+    "FOR (d:DiscussionPoint) ON EACH [d.content]",
+    # Range indexes serve "most mentioned" lookups in index order
+    "CREATE INDEX person_mentions IF NOT EXISTS FOR (p:Person) ON (p.mentions)",
+    "CREATE INDEX topic_mentions IF NOT EXISTS FOR (t:Topic) ON (t.mentions)",
+]
+
+# Materialized co-occurrence aggregates, maintained by ingest_meetings.
+# People and topics carry mentions (discussion points), meetings, first_seen
+# and last_seen; pairs are weighted relationships with the same properties,
+# and (:Topic)-[:COVERED_IN {mentions}]->(:Meeting) links topics to meetings.
+# Each entry names the relationship, its end labels and the raw path used to
+# recompute first/last-seen dates after a meeting is replaced.
+PAIR_AGGREGATES = {
+    "person_topics": ("DISCUSSES", "Person", "Topic",
+                      "(a)-[:MENTIONED_IN]->(d:DiscussionPoint)<-[:DISCUSSED_IN]-(b)"),
+    "co_mentions": ("CO_MENTIONED", "Person", "Person",
+                    "(a)-[:MENTIONED_IN]->(d:DiscussionPoint)<-[:MENTIONED_IN]-(b)"),
+}
+
+ENTITY_AGGREGATES = {
+    "people": ("Person", "(n)-[:MENTIONED_IN]->(:DiscussionPoint)<-[:HAS_POINT]-(m:Meeting)"),
+    "topics": ("Topic", "(n)-[:COVERED_IN]->(m:Meeting)"),
+}
+
+KEY_PEOPLE_QUERY = """
+    MATCH (p:Person)
+    WHERE p.mentions > 0
+    WITH p ORDER BY p.mentions DESC, p.name LIMIT $limit
+    CALL {
+        WITH p
+        MATCH (p)-[r:DISCUSSES]->(t:Topic)
+        WITH t, r ORDER BY r.mentions DESC, t.name LIMIT $per_person
+        RETURN collect(t.name) AS topics
+    }
+    RETURN p.name AS name, p.mentions AS mentions, p.meetings AS meetings,
+           p.first_seen AS first_seen, p.last_seen AS last_seen, topics
+"""
+
+TOPIC_OVERVIEW_QUERY = """
+    MATCH (t:Topic {name: $name})
+    CALL {
+        WITH t
+        MATCH (p:Person)-[r:DISCUSSES]->(t)
+        WITH p, r ORDER BY r.mentions DESC, p.name LIMIT $limit
+        RETURN collect({name: p.name, mentions: r.mentions, meetings: r.meetings,
+                        first_seen: r.first_seen, last_seen: r.last_seen}) AS people
+    }
+    CALL {
+        WITH t
+        MATCH (t)-[c:COVERED_IN]->(m:Meeting)
+        WITH m, c ORDER BY m.date DESC LIMIT $limit
+        RETURN collect({id: m.id, title: m.title, date: m.date, mentions: c.mentions}) AS recent_meetings
+    }
+    RETURN t.name AS name, t.mentions AS mentions, t.meetings AS meetings,
+           t.first_seen AS first_seen, t.last_seen AS last_seen, people, recent_meetings
+"""
+
+PERSON_OVERVIEW_QUERY = """
+    MATCH (p:Person {name: $name})
+    CALL {
+        WITH p
+        MATCH (p)-[r:DISCUSSES]->(t:Topic)
+        WITH t, r ORDER BY r.mentions DESC, t.name LIMIT $limit
+        RETURN collect({name: t.name, mentions: r.mentions, meetings: r.meetings,
+                        first_seen: r.first_seen, last_seen: r.last_seen}) AS topics
+    }
+    CALL {
+        WITH p
+        MATCH (p)-[r:CO_MENTIONED]-(other:Person)
+        WITH other, r ORDER BY r.mentions DESC, other.name LIMIT $limit
+        RETURN collect({name: other.name, mentions: r.mentions, meetings: r.meetings,
+                        first_seen: r.first_seen, last_seen: r.last_seen}) AS co_mentioned
+    }
+    RETURN p.name AS name, p.mentions AS mentions, p.meetings AS meetings,
+           p.first_seen AS first_seen, p.last_seen AS last_seen, topics, co_mentioned
+"""
+
+_schema_ready = set()
+_schema_lock = threading.Lock()
+
+_LUCENE_SPECIAL = re.compile(r'([+\-!(){}\[\]^"~*?:\\/]|&&|\|\|)')
+
+
+def ensure_schema(driver, database):
+    """Create the uniqueness constraints and full-text index once per process"""
+    key = (id(driver), database)
+    with _schema_lock:
+        if key in _schema_ready:
+            return
+        with driver.session(database=database) as session:
+            for statement in SCHEMA_STATEMENTS:
+                session.run(statement).consume()
+            session.run("CALL db.awaitIndexes(300)").consume()
+        _schema_ready.add(key)
+
+
+def timestamp_to_seconds(timestamp):
+    """Convert an "M:SS" or "H:MM:SS" transcript timestamp to seconds, or None"""
+    if not timestamp or not re.fullmatch(r'\d{1,2}(:\d{2}){1,2}', timestamp.strip()):
+        return None
+    seconds = 0
+    for part in timestamp.strip().split(':'):
+        seconds = seconds * 60 + int(part)
+    return seconds
+
+
+def meeting_aggregates(rows):
+    """One meeting's contribution to the co-occurrence aggregates
+
+    ``rows`` are discussion points with sorted, de-duplicated ``people`` and
+    ``topics``. Counts are discussion points; a meeting counts once per entity
+    or pair.
+    """
+    people = Counter()
+    topics = Counter()
+    person_topics = Counter()
+    co_mentions = Counter()
+    for row in rows:
+        people.update(row["people"])
+        topics.update(row["topics"])
+        person_topics.update((person, topic) for person in row["people"] for topic in row["topics"])
+        co_mentions.update(combinations(row["people"], 2))
+    return {
+        "people": [{"name": name, "mentions": count} for name, count in sorted(people.items())],
+        "topics": [{"name": name, "mentions": count} for name, count in sorted(topics.items())],
+        "person_topics": [{"a": a, "b": b, "mentions": count} for (a, b), count in sorted(person_topics.items())],
+        "co_mentions": [{"a": a, "b": b, "mentions": count} for (a, b), count in sorted(co_mentions.items())],
+    }
+
+
+def fulltext_query(keywords):
+    """Build a Lucene query that matches any keyword, quoting multi-word phrases"""
+    clauses = []
+    for keyword in keywords:
+        keyword = _LUCENE_SPECIAL.sub(r'\\\1', keyword.strip())
+        if not keyword:
+            continue
+        clauses.append(f'"{keyword}"' if ' ' in keyword else keyword)
+    return " OR ".join(clauses)
+
 
 class Neo4jDatabase:
-    def __init__(self):
+    def __init__(self, verify_connectivity=None, driver=None):
         load_dotenv()
-        uri = os.getenv("NEO4J_URI")
-        user = os.getenv("NEO4J_USER")
-        password = os.getenv("NEO4J_PASSWORD")
         self.database = os.getenv("NEO4J_DATABASE", "neo4j")
         
-        print(f"Attempting to connect to: {uri}")
-        self.driver = GraphDatabase.driver(uri, auth=(user, password))
-        
-        # Verify connectivity
+        # Shared, pooled driver; connections are only opened when first needed
         try:
-            self.driver.verify_connectivity()
-            print("Successfully verified connectivity!")
-            
-            # Run a test query
-            with self.driver.session(database=self.database) as session:
-                result = session.run("RETURN 1 as num")
-                result.single()
-                print("Successfully ran test query!")
-                
+            self.driver = driver if driver is not None else get_driver(verify_connectivity=verify_connectivity)
         except Exception as e:
             print(f"Error connecting to Neo4j: {str(e)}")
             raise
 
     def close(self):
-        if self.driver:
-            self.driver.close()
+        # The driver is shared process-wide and closed at interpreter exit
+        self.driver = None
+
+    def ensure_schema(self):
+        ensure_schema(self.driver, self.database)
+
+    def pool_stats(self):
+        return pool_stats()
 
     def create_meeting_node(self, title, date=None):
         with self.driver.session(database=self.database) as session:
@@ -46,12 +197,14 @@ class Neo4jDatabase:
         with self.driver.session(database=self.database) as session:
             result = session.run(
                 "MATCH (m:Meeting {id: $meeting_id}) "
-                "CREATE (d:DiscussionPoint {id: randomUUID(), content: $content, timestamp: $timestamp, speaker: $speaker})"
+                "CREATE (d:DiscussionPoint {id: randomUUID(), content: $content, timestamp: $timestamp, "
+                "offset_seconds: $offset_seconds, speaker: $speaker})"
                 "CREATE (m)-[:HAS_POINT]->(d) "
                 "RETURN d.id as id",
                 meeting_id=meeting_id,
                 content=content,
                 timestamp=timestamp,
+                offset_seconds=timestamp_to_seconds(timestamp),
                 speaker=speaker
             )
             return result.single()["id"]
@@ -92,12 +245,354 @@ class Neo4jDatabase:
                 discussion_id=discussion_id
             )
 
+    def ingest_meeting(self, title, points, date=None, meeting_id=None, chunks=None):
+        """Write a parsed meeting in one transaction using batched UNWIND statements.
+
+        ``points`` is a list of dicts with ``content`` and optional ``id``,
+        ``timestamp``, ``speaker``, ``people`` and ``topics`` keys, in transcript
+        order. Points get a ``seq`` ordinal and are chained with NEXT
+        relationships. ``chunks`` optionally lists vector chunks as dicts with
+        ``id`` and ``point_ids``; each becomes a Chunk node that COVERS them.
+        """
+        meeting = {"title": title, "points": points, "date": date, "meeting_id": meeting_id, "chunks": chunks}
+        return self.ingest_meetings([meeting])[0]
+
+    def ingest_meetings(self, meetings, replace_ids=()):
+        """Write several parsed meetings in a single transaction.
+
+        Each meeting is a dict with the arguments of ``ingest_meeting``.
+        Meetings listed in ``replace_ids`` are deleted first, along with their
+        points and chunks, which lets bulk loads re-ingest edited files and
+        retry batches whose commit was not recorded. The co-occurrence
+        aggregates are updated in the same transaction. Returns the meeting ids.
+        """
+        batch = []
+        for meeting in meetings:
+            batch.append((
+                meeting.get("meeting_id") or str(uuid.uuid4()),
+                meeting["title"],
+                meeting.get("date"),
+                self._point_rows(meeting["points"]),
+                meeting.get("chunks") or []
+            ))
+
+        self.ensure_schema()
+        with span("graph_write", meetings=len(batch), points=sum(len(rows) for _, _, _, rows, _ in batch)), \
+                self.driver.session(database=self.database) as session:
+            session.execute_write(self._ingest_meetings_tx, batch, list(replace_ids))
+        corpus_version.bump("graph")
+        return [meeting_id for meeting_id, *_ in batch]
+
+    @staticmethod
+    def _point_rows(points):
+        rows = []
+        for seq, point in enumerate(points):
+            rows.append({
+                "id": point.get("id") or str(uuid.uuid4()),
+                "seq": seq,
+                "content": point["content"],
+                "timestamp": point.get("timestamp"),
+                "offset_seconds": timestamp_to_seconds(point.get("timestamp")),
+                "speaker": point.get("speaker"),
+                "people": sorted(set(point.get("people") or [])),
+                "topics": sorted(set(point.get("topics") or [])),
+            })
+        return rows
+
+    @staticmethod
+    def _lock_aggregates_tx(tx):
+        """Take the write lock that serializes aggregate updates until the transaction ends"""
+        tx.run("MERGE (l:AggregateLock {id: 'aggregates'}) SET l.updated_at = timestamp()")
+
+    @classmethod
+    def _ingest_meetings_tx(cls, tx, batch, replace_ids):
+        # A rebuild must not interleave with this batch's aggregate updates
+        cls._lock_aggregates_tx(tx)
+        removed = []
+        if replace_ids:
+            # Read what the replaced meetings added to the aggregates before deleting them
+            removed = cls._meeting_contributions(tx, replace_ids)
+            tx.run(
+                "UNWIND $ids AS meeting_id "
+                "MATCH (c:Chunk {meeting_id: meeting_id}) "
+                "DETACH DELETE c",
+                ids=replace_ids
+            )
+            tx.run(
+                "UNWIND $ids AS meeting_id "
+                "MATCH (m:Meeting {id: meeting_id}) "
+                "OPTIONAL MATCH (m)-[:HAS_POINT]->(d:DiscussionPoint) "
+                "DETACH DELETE d, m",
+                ids=replace_ids
+            )
+        for meeting in removed:
+            cls._remove_aggregates_tx(tx, meeting["date"], meeting_aggregates(meeting["rows"]))
+        for meeting_id, title, date, rows, chunks in batch:
+            cls._ingest_meeting_tx(tx, meeting_id, title, date, rows, chunks)
+            cls._add_aggregates_tx(tx, meeting_id, date, meeting_aggregates(rows))
+
+    @staticmethod
+    def _meeting_contributions(tx, meeting_ids=None):
+        """Meetings with the people and topics of each of their points, read from the raw edges"""
+        result = tx.run(
+            "MATCH (m:Meeting) "
+            + ("WHERE m.id IN $ids " if meeting_ids is not None else "")
+            + "MATCH (m)-[:HAS_POINT]->(d:DiscussionPoint) "
+            "RETURN m.id AS meeting_id, m.date AS date, "
+            "collect({people: [(p:Person)-[:MENTIONED_IN]->(d) | p.name], "
+            "topics: [(t:Topic)-[:DISCUSSED_IN]->(d) | t.name]}) AS points",
+            ids=meeting_ids
+        )
+        meetings = []
+        for record in result:
+            rows = [
+                {"people": sorted(set(point["people"])), "topics": sorted(set(point["topics"]))}
+                for point in record["points"]
+            ]
+            meetings.append({"meeting_id": record["meeting_id"], "date": record["date"], "rows": rows})
+        return meetings
+
+    @staticmethod
+    def _add_aggregates_tx(tx, meeting_id, date, aggregates):
+        """Fold one new meeting into the aggregates; dates only ever widen"""
+        for key, (label, _) in ENTITY_AGGREGATES.items():
+            tx.run(
+                "UNWIND $entities AS entity "
+                f"MATCH (n:{label} {{name: entity.name}}) "
+                "SET n.mentions = coalesce(n.mentions, 0) + entity.mentions, "
+                "n.meetings = coalesce(n.meetings, 0) + 1, "
+                "n.first_seen = CASE WHEN n.first_seen IS NULL OR $date < n.first_seen "
+                "THEN $date ELSE n.first_seen END, "
+                "n.last_seen = CASE WHEN n.last_seen IS NULL OR $date > n.last_seen "
+                "THEN $date ELSE n.last_seen END",
+                entities=aggregates[key],
+                date=date
+            )
+        for key, (relationship, start, end, _) in PAIR_AGGREGATES.items():
+            tx.run(
+                "UNWIND $pairs AS pair "
+                f"MATCH (a:{start} {{name: pair.a}}), (b:{end} {{name: pair.b}}) "
+                f"MERGE (a)-[r:{relationship}]->(b) "
+                "ON CREATE SET r.mentions = 0, r.meetings = 0 "
+                "SET r.mentions = r.mentions + pair.mentions, "
+                "r.meetings = r.meetings + 1, "
+                "r.first_seen = CASE WHEN r.first_seen IS NULL OR $date < r.first_seen "
+                "THEN $date ELSE r.first_seen END, "
+                "r.last_seen = CASE WHEN r.last_seen IS NULL OR $date > r.last_seen "
+                "THEN $date ELSE r.last_seen END",
+                pairs=aggregates[key],
+                date=date
+            )
+        tx.run(
+            "MATCH (m:Meeting {id: $meeting_id}) "
+            "UNWIND $entities AS entity "
+            "MATCH (t:Topic {name: entity.name}) "
+            "CREATE (t)-[:COVERED_IN {mentions: entity.mentions}]->(m)",
+            meeting_id=meeting_id,
+            entities=aggregates["topics"]
+        )
+
+    @staticmethod
+    def _remove_aggregates_tx(tx, date, aggregates):
+        """Subtract a deleted meeting from the aggregates
+
+        Runs after the meeting's points are gone. Counts are subtracted and
+        emptied aggregates removed; first/last-seen dates that came from the
+        deleted meeting are recomputed from the remaining raw edges of just
+        those entities and pairs. Its COVERED_IN links went with the meeting.
+        """
+        for key, (label, path) in ENTITY_AGGREGATES.items():
+            tx.run(
+                "UNWIND $entities AS entity "
+                f"MATCH (n:{label} {{name: entity.name}}) "
+                "SET n.mentions = n.mentions - entity.mentions, n.meetings = n.meetings - 1 "
+                "WITH n WHERE n.meetings <= 0 "
+                "REMOVE n.mentions, n.meetings, n.first_seen, n.last_seen",
+                entities=aggregates[key]
+            )
+            tx.run(
+                "UNWIND $entities AS entity "
+                f"MATCH (n:{label} {{name: entity.name}}) "
+                "WHERE n.meetings > 0 AND (n.first_seen = $date OR n.last_seen = $date) "
+                "CALL { WITH n "
+                f"  MATCH {path} "
+                "  RETURN min(m.date) AS first_seen, max(m.date) AS last_seen } "
+                "SET n.first_seen = first_seen, n.last_seen = last_seen",
+                entities=aggregates[key],
+                date=date
+            )
+        for key, (relationship, start, end, path) in PAIR_AGGREGATES.items():
+            tx.run(
+                "UNWIND $pairs AS pair "
+                f"MATCH (:{start} {{name: pair.a}})-[r:{relationship}]->(:{end} {{name: pair.b}}) "
+                "SET r.mentions = r.mentions - pair.mentions, r.meetings = r.meetings - 1 "
+                "WITH r WHERE r.meetings <= 0 "
+                "DELETE r",
+                pairs=aggregates[key]
+            )
+            tx.run(
+                "UNWIND $pairs AS pair "
+                f"MATCH (a:{start} {{name: pair.a}})-[r:{relationship}]->(b:{end} {{name: pair.b}}) "
+                "WHERE r.first_seen = $date OR r.last_seen = $date "
+                "CALL { WITH a, b "
+                f"  MATCH {path}, (m:Meeting)-[:HAS_POINT]->(d) "
+                "  RETURN min(m.date) AS first_seen, max(m.date) AS last_seen } "
+                "SET r.first_seen = first_seen, r.last_seen = last_seen",
+                pairs=aggregates[key],
+                date=date
+            )
+
+    @staticmethod
+    def _ingest_meeting_tx(tx, meeting_id, title, date, rows, chunks):
+        people = sorted({name for row in rows for name in row["people"]})
+        topics = sorted({name for row in rows for name in row["topics"]})
+
+        tx.run(
+            "CREATE (m:Meeting {id: $meeting_id, title: $title, date: $date})",
+            meeting_id=meeting_id,
+            title=title,
+            date=date
+        )
+        tx.run(
+            "UNWIND $people AS name MERGE (:Person {name: name})",
+            people=people
+        )
+        tx.run(
+            "UNWIND $topics AS name MERGE (:Topic {name: name})",
+            topics=topics
+        )
+        tx.run(
+            "MATCH (m:Meeting {id: $meeting_id}) "
+            "UNWIND $rows AS row "
+            "CREATE (d:DiscussionPoint {id: row.id, seq: row.seq, content: row.content, "
+            "timestamp: row.timestamp, offset_seconds: row.offset_seconds, speaker: row.speaker}) "
+            "CREATE (m)-[:HAS_POINT]->(d) "
+            "WITH d, row "
+            "CALL { WITH d, row "
+            "  UNWIND row.people AS name "
+            "  MATCH (p:Person {name: name}) "
+            "  CREATE (p)-[:MENTIONED_IN]->(d) } "
+            "CALL { WITH d, row "
+            "  UNWIND row.topics AS name "
+            "  MATCH (t:Topic {name: name}) "
+            "  CREATE (t)-[:DISCUSSED_IN]->(d) }",
+            meeting_id=meeting_id,
+            rows=rows
+        )
+        tx.run(
+            "UNWIND range(0, size($ids) - 2) AS i "
+            "MATCH (a:DiscussionPoint {id: $ids[i]}), (b:DiscussionPoint {id: $ids[i + 1]}) "
+            "CREATE (a)-[:NEXT]->(b)",
+            ids=[row["id"] for row in rows]
+        )
+        tx.run(
+            "UNWIND $chunks AS chunk "
+            "CREATE (c:Chunk {id: chunk.id, meeting_id: $meeting_id}) "
+            "WITH c, chunk "
+            "UNWIND chunk.point_ids AS point_id "
+            "MATCH (d:DiscussionPoint {id: point_id}) "
+            "CREATE (c)-[:COVERS]->(d)",
+            meeting_id=meeting_id,
+            chunks=[{"id": chunk["id"], "point_ids": chunk["point_ids"]} for chunk in chunks]
+        )
+
+    def link_point_sequence(self):
+        """Backfill seq, offset_seconds and NEXT links for meetings ingested without them"""
+        self.ensure_schema()
+        with self.driver.session(database=self.database) as session:
+            meetings = session.run(
+                "MATCH (m:Meeting)-[:HAS_POINT]->(d:DiscussionPoint) "
+                "WHERE d.seq IS NULL "
+                "RETURN m.id AS meeting_id, collect({id: d.id, timestamp: d.timestamp}) AS points"
+            ).data()
+            for meeting in meetings:
+                # Timed points in time order, untimed ones (e.g. action items) after them
+                points = sorted(
+                    meeting["points"],
+                    key=lambda point: (
+                        timestamp_to_seconds(point["timestamp"]) is None,
+                        timestamp_to_seconds(point["timestamp"]) or 0
+                    )
+                )
+                rows = [
+                    {"id": point["id"], "seq": seq, "offset_seconds": timestamp_to_seconds(point["timestamp"])}
+                    for seq, point in enumerate(points)
+                ]
+                session.execute_write(self._link_point_sequence_tx, rows)
+            return len(meetings)
+
+    @staticmethod
+    def _link_point_sequence_tx(tx, rows):
+        tx.run(
+            "UNWIND $rows AS row "
+            "MATCH (d:DiscussionPoint {id: row.id}) "
+            "SET d.seq = row.seq, d.offset_seconds = row.offset_seconds",
+            rows=rows
+        )
+        tx.run(
+            "UNWIND range(0, size($ids) - 2) AS i "
+            "MATCH (a:DiscussionPoint {id: $ids[i]}), (b:DiscussionPoint {id: $ids[i + 1]}) "
+            "MERGE (a)-[:NEXT]->(b)",
+            ids=[row["id"] for row in rows]
+        )
+
+    def rebuild_aggregates(self):
+        """Recompute the co-occurrence aggregates from the raw MENTIONED_IN and DISCUSSED_IN edges
+
+        Needed once for graphs ingested before the aggregates existed, or
+        written through the single-edge create_* methods, which do not
+        maintain them. The clear and the re-add run in one transaction that
+        holds the same lock as ingest_meetings, so readers never see partial
+        totals and no meeting is counted twice. Returns the number of
+        meetings folded in.
+        """
+        self.ensure_schema()
+        with self.driver.session(database=self.database) as session:
+            count = session.execute_write(self._rebuild_aggregates_tx)
+        corpus_version.bump("graph")
+        return count
+
+    @classmethod
+    def _rebuild_aggregates_tx(cls, tx):
+        cls._lock_aggregates_tx(tx)
+        cls._clear_aggregates_tx(tx)
+        meetings = cls._meeting_contributions(tx)
+        for meeting in meetings:
+            cls._add_aggregates_tx(tx, meeting["meeting_id"], meeting["date"], meeting_aggregates(meeting["rows"]))
+        return len(meetings)
+
+    @staticmethod
+    def _clear_aggregates_tx(tx):
+        tx.run("MATCH ()-[r:DISCUSSES|CO_MENTIONED|COVERED_IN]->() DELETE r")
+        tx.run(
+            "MATCH (n) WHERE (n:Person OR n:Topic) AND n.meetings IS NOT NULL "
+            "REMOVE n.mentions, n.meetings, n.first_seen, n.last_seen"
+        )
+
+    def query_key_people(self, limit=10, topics_per_person=3):
+        """Most mentioned people with their meeting counts, date range and main topics"""
+        with self.driver.session(database=self.database) as session:
+            result = session.run(KEY_PEOPLE_QUERY, limit=limit, per_person=topics_per_person)
+            return [dict(record) for record in result]
+
+    def query_topic_overview(self, topic_name, limit=5):
+        """A topic's totals, the people who discuss it most and its latest meetings, or None"""
+        with self.driver.session(database=self.database) as session:
+            record = session.run(TOPIC_OVERVIEW_QUERY, name=topic_name, limit=limit).single()
+            return dict(record) if record else None
+
+    def query_person_overview(self, person_name, limit=5):
+        """A person's totals, main topics and most frequent co-mentions, or None"""
+        with self.driver.session(database=self.database) as session:
+            record = session.run(PERSON_OVERVIEW_QUERY, name=person_name, limit=limit).single()
+            return dict(record) if record else None
+
     def query_meeting_timeline(self, meeting_id):
         with self.driver.session(database=self.database) as session:
             result = session.run(
                 "MATCH (m:Meeting {id: $meeting_id})-[:HAS_POINT]->(d:DiscussionPoint) "
                 "RETURN d.timestamp as timestamp, d.content as content, d.speaker as speaker "
-                "ORDER BY d.timestamp",
+                "ORDER BY d.seq, d.offset_seconds",
                 meeting_id=meeting_id
             )
             return [dict(record) for record in result]
@@ -107,7 +602,7 @@ class Neo4jDatabase:
             result = session.run(
                 "MATCH (p:Person {name: $name})-[r]->(d:DiscussionPoint)<-[:HAS_POINT]-(m:Meeting) "
                 "RETURN type(r) as relationship, m.title as title, d.timestamp as timestamp, d.content as content "
-                "ORDER BY m.date DESC, d.timestamp",
+                "ORDER BY m.date DESC, d.seq, d.offset_seconds",
                 name=person_name
             )
             return [dict(record) for record in result]
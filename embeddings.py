@@ -0,0 +1,292 @@
+import asyncio
+import functools
+import os
+import threading
+import time
+
+from openai import RateLimitError
+
+from instrumentation import span
+
+try:
+    import tiktoken
+except ImportError:  # fall back to a character-based estimate
+    tiktoken = None
+
+EMBEDDING_MODEL = "text-embedding-ada-002"
+
+# Per-request limits of the embeddings endpoint
+MAX_BATCH_SIZE = 2048
+MAX_BATCH_TOKENS = 300000
+
+
+@functools.lru_cache(maxsize=None)
+def _get_encoding(model):
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding("cl100k_base")
+
+
+def count_tokens(text, model=EMBEDDING_MODEL):
+    """Count the tokens in text, estimating when tiktoken is not installed"""
+    if tiktoken is not None:
+        return len(_get_encoding(model).encode(text))
+    # Roughly four characters per token for English text
+    return len(text) // 4 + 1
+
+
+def batch_by_tokens(texts, max_batch_tokens=50000, max_batch_size=512, model=EMBEDDING_MODEL):
+    """Group texts into batches that fit both the token budget and the input count limit
+
+    Yields (texts, token_count) pairs in input order.
+    """
+    max_batch_size = min(max_batch_size, MAX_BATCH_SIZE)
+    max_batch_tokens = min(max_batch_tokens, MAX_BATCH_TOKENS)
+
+    batch = []
+    batch_tokens = 0
+    for text in texts:
+        tokens = count_tokens(text, model)
+        if batch and (batch_tokens + tokens > max_batch_tokens or len(batch) >= max_batch_size):
+            yield batch, batch_tokens
+            batch = []
+            batch_tokens = 0
+        batch.append(text)
+        batch_tokens += tokens
+
+    if batch:
+        yield batch, batch_tokens
+
+
+class TokenBucket:
+    """Thread-safe token bucket refilled continuously at `rate` tokens per second"""
+
+    def __init__(self, rate, capacity=None):
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self, amount):
+        """Take `amount` tokens and return how long the caller must wait for them"""
+        with self.lock:
+            self._refill(time.monotonic())
+            # Requests larger than the bucket are allowed through once it is full
+            amount = min(amount, self.capacity)
+            self.tokens -= amount
+            if self.tokens >= 0:
+                return 0.0
+            return -self.tokens / self.rate
+
+
+class RateLimiter:
+    """Adaptive request and token rate limiter for an OpenAI-style API
+
+    Starts at the configured quota, halves its rate on every 429 (honouring
+    retry-after) and climbs back towards the quota on successful calls.
+    """
+
+    def __init__(self, requests_per_minute=3000, tokens_per_minute=1000000,
+                 min_fraction=0.05, recovery=1.05):
+        self.max_requests_per_second = requests_per_minute / 60.0
+        self.max_tokens_per_second = tokens_per_minute / 60.0
+        self.min_fraction = min_fraction
+        self.recovery = recovery
+        self.fraction = 1.0
+        self.requests = TokenBucket(self.max_requests_per_second)
+        self.tokens = TokenBucket(self.max_tokens_per_second)
+        self.paused_until = 0.0
+        self.lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls, prefix="OPENAI_EMBEDDING"):
+        return cls(
+            requests_per_minute=int(os.getenv(f"{prefix}_RPM", "3000")),
+            tokens_per_minute=int(os.getenv(f"{prefix}_TPM", "1000000"))
+        )
+
+    def _set_fraction(self, fraction):
+        self.fraction = max(self.min_fraction, min(1.0, fraction))
+        self.requests.rate = self.max_requests_per_second * self.fraction
+        self.tokens.rate = self.max_tokens_per_second * self.fraction
+
+    def reserve(self, tokens=0):
+        """Reserve one request carrying `tokens` tokens; return the seconds to wait before sending it"""
+        with self.lock:
+            pause = self.paused_until - time.monotonic()
+
+        wait = self.requests.reserve(1)
+        if tokens:
+            wait = max(wait, self.tokens.reserve(tokens))
+        return max(pause, wait, 0.0)
+
+    def acquire(self, tokens=0):
+        """Block until one request carrying `tokens` tokens may be sent"""
+        wait = self.reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self, tokens=0):
+        """Like acquire, but yields to the event loop while waiting"""
+        wait = self.reserve(tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def on_success(self):
+        with self.lock:
+            if self.fraction < 1.0:
+                self._set_fraction(self.fraction * self.recovery)
+
+    def on_rate_limited(self, retry_after=None):
+        """Back off after a 429, pausing all callers for `retry_after` seconds if given"""
+        with self.lock:
+            self._set_fraction(self.fraction / 2)
+            if retry_after is None:
+                retry_after = 1.0 / self.requests.rate
+            self.paused_until = max(self.paused_until, time.monotonic() + retry_after)
+
+
+def retry_after_seconds(error):
+    """Read the retry delay from a rate limit error's response headers"""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    try:
+        if headers.get("retry-after-ms"):
+            return float(headers["retry-after-ms"]) / 1000.0
+        if headers.get("retry-after"):
+            return float(headers["retry-after"])
+    except ValueError:
+        pass
+    return None
+
+
+class Embedder:
+    """Batched embedding client shared by the vector store and the RAG system"""
+
+    def __init__(self, openai_client, model=EMBEDDING_MODEL, limiter=None, cache=None,
+                 max_batch_tokens=50000, max_batch_size=512, max_retries=8):
+        self.openai_client = openai_client
+        self.model = model
+        self.limiter = limiter or RateLimiter.from_env()
+        self.cache = cache
+        self.max_batch_tokens = max_batch_tokens
+        self.max_batch_size = max_batch_size
+        self.max_retries = max_retries
+
+    def _embed_batch(self, texts, tokens):
+        with span("embedding_api", model=self.model, texts=len(texts), prompt_tokens=tokens) as attrs:
+            for attempt in range(self.max_retries + 1):
+                self.limiter.acquire(tokens)
+                try:
+                    response = self.openai_client.embeddings.create(
+                        input=texts,
+                        model=self.model
+                    )
+                except RateLimitError as e:
+                    if attempt == self.max_retries:
+                        raise
+                    retry_after = retry_after_seconds(e)
+                    print(f"Rate limited by embeddings API (retry-after: {retry_after}), backing off")
+                    self.limiter.on_rate_limited(retry_after)
+                    attrs["retries"] = attempt + 1
+                    continue
+
+                self.limiter.on_success()
+                data = sorted(response.data, key=lambda item: item.index)
+                return [item.embedding for item in data]
+
+    def _embed_uncached(self, texts):
+        embeddings = []
+        for batch, tokens in batch_by_tokens(
+            texts, self.max_batch_tokens, self.max_batch_size, self.model
+        ):
+            embeddings.extend(self._embed_batch(batch, tokens))
+        return embeddings
+
+    def embed(self, texts):
+        """Embed a sequence of texts in token-budgeted multi-input requests
+
+        Texts already in the cache are served from it; only the distinct
+        misses are sent to the API.
+        """
+        texts = list(texts)
+        if self.cache is None:
+            return self._embed_uncached(texts)
+
+        embeddings = self.cache.get_many(self.model, texts)
+        missing = list(dict.fromkeys(
+            text for text, embedding in zip(texts, embeddings) if embedding is None
+        ))
+        if missing:
+            fresh = dict(zip(missing, self._embed_uncached(missing)))
+            self.cache.put_many(self.model, missing, [fresh[text] for text in missing])
+            embeddings = [
+                embedding if embedding is not None else fresh[text]
+                for text, embedding in zip(texts, embeddings)
+            ]
+        return embeddings
+
+    def embed_one(self, text):
+        return self.embed([text])[0]
+
+
+class AsyncEmbedder(Embedder):
+    """Embedder for the async OpenAI client, sharing batching, rate limiting and the cache"""
+
+    async def _embed_batch(self, texts, tokens):
+        with span("embedding_api", model=self.model, texts=len(texts), prompt_tokens=tokens) as attrs:
+            for attempt in range(self.max_retries + 1):
+                await self.limiter.acquire_async(tokens)
+                try:
+                    response = await self.openai_client.embeddings.create(
+                        input=texts,
+                        model=self.model
+                    )
+                except RateLimitError as e:
+                    if attempt == self.max_retries:
+                        raise
+                    retry_after = retry_after_seconds(e)
+                    print(f"Rate limited by embeddings API (retry-after: {retry_after}), backing off")
+                    self.limiter.on_rate_limited(retry_after)
+                    attrs["retries"] = attempt + 1
+                    continue
+
+                self.limiter.on_success()
+                data = sorted(response.data, key=lambda item: item.index)
+                return [item.embedding for item in data]
+
+    async def _embed_uncached(self, texts):
+        embeddings = []
+        for batch, tokens in batch_by_tokens(
+            texts, self.max_batch_tokens, self.max_batch_size, self.model
+        ):
+            embeddings.extend(await self._embed_batch(batch, tokens))
+        return embeddings
+
+    async def embed(self, texts):
+        texts = list(texts)
+        if self.cache is None:
+            return await self._embed_uncached(texts)
+
+        # The cache is a local SQLite file, fast enough to query inline
+        embeddings = self.cache.get_many(self.model, texts)
+        missing = list(dict.fromkeys(
+            text for text, embedding in zip(texts, embeddings) if embedding is None
+        ))
+        if missing:
+            fresh = dict(zip(missing, await self._embed_uncached(missing)))
+            self.cache.put_many(self.model, missing, [fresh[text] for text in missing])
+            embeddings = [
+                embedding if embedding is not None else fresh[text]
+                for text, embedding in zip(texts, embeddings)
+            ]
+        return embeddings
+
+    async def embed_one(self, text):
+        return (await self.embed([text]))[0]
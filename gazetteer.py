@@ -0,0 +1,102 @@
+import json
+import os
+import re
+import threading
+from collections import namedtuple
+
+DEFAULT_GAZETTEER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "gazetteer.json")
+WHITESPACE = re.compile(r"\s+")
+
+Mention = namedtuple("Mention", ["start", "end", "kind", "name", "text"])
+
+_default_gazetteer = None
+_default_gazetteer_lock = threading.Lock()
+
+
+def normalize(term):
+    return WHITESPACE.sub(" ", term.strip().lower())
+
+
+def _trie_pattern(node):
+    """Regex for a character trie; children come before the end marker so the longest term wins"""
+    alternatives = []
+    for char in sorted(key for key in node if key):
+        atom = r"\s+" if char == " " else re.escape(char)
+        rest = _trie_pattern(node[char])
+        alternatives.append(atom + (rest or ""))
+    if not alternatives:
+        return None
+    pattern = alternatives[0] if len(alternatives) == 1 else "(?:" + "|".join(alternatives) + ")"
+    if "" in node:
+        pattern = "(?:" + pattern + ")?"
+    return pattern
+
+
+class Gazetteer:
+    """People and topic dictionaries compiled into a single matcher
+
+    Every canonical name and alias is inserted into a character trie that is
+    compiled into one regular expression, so each line is scanned once and
+    the cost per character depends on the longest term rather than on how
+    many terms there are. Matching is case-insensitive, tolerant of extra
+    whitespace, respects word edges and prefers the longest term.
+    """
+
+    def __init__(self, people=None, topics=None):
+        self.entries = {}
+        for kind, names in (("person", people or {}), ("topic", topics or {})):
+            for name, aliases in names.items():
+                for term in [name] + list(aliases or []):
+                    key = normalize(term)
+                    if key:
+                        self.entries.setdefault(key, [])
+                        if (kind, name) not in self.entries[key]:
+                            self.entries[key].append((kind, name))
+
+        trie = {}
+        for key in self.entries:
+            node = trie
+            for char in key:
+                node = node.setdefault(char, {})
+            node[""] = True
+        body = _trie_pattern(trie)
+        self.pattern = re.compile(r"(?<!\w)" + body + r"(?!\w)", re.IGNORECASE) if body else None
+
+    @classmethod
+    def from_file(cls, path):
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(people=data.get("people"), topics=data.get("topics"))
+
+    @classmethod
+    def from_env(cls):
+        return cls.from_file(os.getenv("GAZETTEER_PATH", DEFAULT_GAZETTEER_PATH))
+
+    def find(self, text):
+        """Return every Mention in the text with its span and canonical name"""
+        if self.pattern is None:
+            return []
+        mentions = []
+        for match in self.pattern.finditer(text):
+            for kind, name in self.entries.get(normalize(match.group(0)), []):
+                mentions.append(Mention(match.start(), match.end(), kind, name, match.group(0)))
+        return mentions
+
+    def extract(self, text):
+        """Return (people, topics) canonical names mentioned in the text"""
+        people = []
+        topics = []
+        for mention in self.find(text):
+            names = people if mention.kind == "person" else topics
+            if mention.name not in names:
+                names.append(mention.name)
+        return people, topics
+
+
+def get_default_gazetteer():
+    """Process-wide gazetteer loaded from GAZETTEER_PATH or the bundled gazetteer.json"""
+    global _default_gazetteer
+    with _default_gazetteer_lock:
+        if _default_gazetteer is None:
+            _default_gazetteer = Gazetteer.from_env()
+        return _default_gazetteer
@@ -1,10 +1,17 @@
 from database import Neo4jDatabase
+from embeddings import count_tokens
+from gazetteer import get_default_gazetteer
+from instrumentation import trace, span
+from metadata_filters import date_number
 import re
+import uuid
 from datetime import datetime
 
 class GraphAgent:
-    def __init__(self):
-        self.db = Neo4jDatabase()
+    def __init__(self, connect=True, db=None):
+        # connect=False gives a parse-only agent, e.g. for ingestion worker processes
+        self.db = db if db is not None else (Neo4jDatabase() if connect else None)
+        self.gazetteer = get_default_gazetteer()
         
     def close(self):
         if self.db:
@@ -18,60 +25,107 @@ class GraphAgent:
         return None
 
     def extract_people(self, text):
-        """Extract people names from text"""
-        # Simple name extraction - looks for capitalized words
-        # This could be enhanced with NER models
-        names = re.findall(r'\b[A-Z][a-z]+\b', text)
-        return list(set(names))  # Remove duplicates
+        """Extract people named in the gazetteer, by canonical name"""
+        return self.gazetteer.extract(text)[0]
 
     def extract_topics(self, text):
-        """Extract potential topics from text"""
-        # Simple topic extraction - looks for key technical terms
-        # This could be enhanced with more sophisticated NLP
-        topics = []
-        technical_terms = ['Neo4j', 'API', 'database', 'interface', 'testing', 'development',
-                         'integration', 'design', 'implementation', 'project']
+        """Extract gazetteer topics mentioned in the text, by canonical name"""
+        return self.gazetteer.extract(text)[1]
+
+    def parse_meeting_notes(self, notes):
+        """Parse meeting notes into discussion points with their people and topics"""
+        points = []
+        for line in notes.split('\n'):
+            line = line.strip()
+            if not line:
+                continue
+            
+            # Extract timestamp
+            timestamp = self.extract_timestamp(line)
+            if timestamp:
+                # Remove timestamp from content
+                content = line[:line.rfind(timestamp)].strip()
+            else:
+                content = line
+            
+            # One gazetteer pass finds both people and topics
+            people, topics = self.gazetteer.extract(content)
+            points.append({
+                "content": content,
+                "timestamp": timestamp,
+                "people": people,
+                "topics": topics
+            })
         
-        for term in technical_terms:
-            if re.search(rf'\b{term}\b', text, re.IGNORECASE):
-                topics.append(term.lower())
+        return points
+
+    def chunk_points(self, meeting_id, title, points, max_tokens=256, date=None):
+        """Group consecutive discussion points into vector chunks that record the points they cover"""
+        groups = []
+        current = []
+        current_tokens = 0
+        for point in points:
+            tokens = count_tokens(point["content"])
+            if current and current_tokens + tokens > max_tokens:
+                groups.append(current)
+                current = []
+                current_tokens = 0
+            current.append(point)
+            current_tokens += tokens
+        if current:
+            groups.append(current)
         
-        return list(set(topics))
+        chunks = []
+        try:
+            meeting_date = date_number(date)
+        except ValueError:
+            meeting_date = None
+        for i, group in enumerate(groups):
+            text = "\n".join(point["content"] for point in group)
+            point_ids = [point["id"] for point in group]
+            metadata = {
+                "meeting_id": meeting_id,
+                "meeting_title": title,
+                "chunk_index": i,
+                "total_chunks": len(groups),
+                "point_ids": point_ids
+            }
+            # Pinecone rejects null metadata values
+            if meeting_date is not None:
+                metadata["meeting_date"] = meeting_date
+            chunks.append({
+                "id": f"{meeting_id}_{i}",
+                "text": text,
+                "point_ids": point_ids,
+                "metadata": metadata
+            })
+        return chunks
+
+    def process_meeting_notes(self, title, notes, date=None, vector_store=None):
+        """Process meeting notes and create graph structure
 
-    def process_meeting_notes(self, title, notes):
-        """Process meeting notes and create graph structure"""
+        When a vector store is given, the meeting is also embedded as chunks of
+        consecutive points, linked to those points through Chunk nodes.
+        """
         try:
-            # Create meeting node
-            meeting_id = self.db.create_meeting_node(title)
-            
-            # Process each line
-            for line in notes.split('\n'):
-                line = line.strip()
-                if not line:
-                    continue
-                
-                # Extract timestamp
-                timestamp = self.extract_timestamp(line)
-                if timestamp:
-                    # Remove timestamp from content
-                    content = line[:line.rfind(timestamp)].strip()
-                else:
-                    content = line
+            with trace("ingest"):
+                with span("parse") as attrs:
+                    points = self.parse_meeting_notes(notes)
+                    attrs["points"] = len(points)
+                meeting_id = str(uuid.uuid4())
+                for point in points:
+                    point["id"] = str(uuid.uuid4())
                 
-                # Create discussion point
-                point_id = self.db.create_discussion_point(meeting_id, content, timestamp)
+                with span("chunk") as attrs:
+                    chunks = self.chunk_points(meeting_id, title, points, date=date) if vector_store else []
+                    attrs["chunks"] = len(chunks)
                 
-                # Extract and create people nodes and relationships
-                people = self.extract_people(content)
-                for person in people:
-                    self.db.create_person_node(person)
-                    self.db.create_person_discussion_relationship(person, point_id)
+                # Write the meeting, its points, people, topics and chunk links in one transaction
+                self.db.ingest_meeting(title, points, date, meeting_id=meeting_id, chunks=chunks)
                 
-                # Extract and create topic nodes and relationships
-                topics = self.extract_topics(content)
-                for topic in topics:
-                    self.db.create_topic_node(topic)
-                    self.db.create_topic_discussion_relationship(topic, point_id)
+                if vector_store:
+                    vector_store.upsert_records(chunks)
+                    vector_store.index.flush()
             
             return meeting_id
             
@@ -86,3 +140,15 @@ class GraphAgent:
     def query_person_activities(self, person_name):
         """Query activities related to a person"""
         return self.db.query_person_activities(person_name)
+
+    def query_person_overview(self, person_name):
+        """Summarize a person's topics and co-mentions from the aggregates"""
+        return self.db.query_person_overview(person_name)
+
+    def query_topic_overview(self, topic_name):
+        """Summarize who discusses a topic and where, from the aggregates"""
+        return self.db.query_topic_overview(topic_name)
+
+    def query_key_people(self, limit=10):
+        """Most mentioned people across all meetings"""
+        return self.db.query_key_people(limit)
@@ -0,0 +1,138 @@
+from vector_index import Match
+
+CHUNK_POINTS_QUERY = (
+    "UNWIND $chunk_ids AS chunk_id "
+    "MATCH (c:Chunk {id: chunk_id})-[:COVERS]->(d:DiscussionPoint) "
+    "RETURN chunk_id, collect(d.id) AS point_ids"
+)
+
+EXPAND_QUERY = """
+    UNWIND $point_ids AS point_id
+    MATCH (meeting:Meeting)-[:HAS_POINT]->(discussion:DiscussionPoint {id: point_id})
+    OPTIONAL MATCH (topic:Topic)-[:DISCUSSED_IN]->(discussion)
+    OPTIONAL MATCH (person:Person)-[:MENTIONED_IN]->(discussion)
+    OPTIONAL MATCH (previous:DiscussionPoint)-[:NEXT]->(discussion)
+    OPTIONAL MATCH (discussion)-[:NEXT]->(following:DiscussionPoint)
+    RETURN point_id,
+           discussion.timestamp AS timestamp,
+           discussion.content AS content,
+           meeting.title AS meeting_title,
+           collect(DISTINCT topic.name) AS topics,
+           collect(DISTINCT person.name) AS people,
+           collect(DISTINCT previous.content) AS prior_context,
+           collect(DISTINCT following.content) AS following_context
+"""
+
+
+class HybridRetriever:
+    """Fuse vector chunks and graph discussion points into one ranking
+
+    Vector chunks are mapped to the discussion points they cover (from the
+    chunk's ``point_ids`` metadata or its Chunk node in the graph), both
+    result lists are merged with reciprocal rank fusion, and the top points
+    are expanded one hop to their meeting, people, topics and neighbouring
+    points. Chunks that cover no known points are ranked as themselves.
+    """
+
+    def __init__(self, driver, database=None, rrf_k=60, top_n=8):
+        self.driver = driver
+        self.database = database
+        self.rrf_k = rrf_k
+        self.top_n = top_n
+
+    def _chunk_points(self, session, chunk_ids):
+        if not chunk_ids:
+            return {}
+        result = session.run(CHUNK_POINTS_QUERY, chunk_ids=chunk_ids)
+        return {record["chunk_id"]: record["point_ids"] for record in result}
+
+    def _expand(self, session, point_ids):
+        if not point_ids:
+            return {}
+        result = session.run(EXPAND_QUERY, point_ids=point_ids)
+        return {record["point_id"]: record.data() for record in result}
+
+    @staticmethod
+    def _unlinked(vector_results):
+        """Ids of chunks whose metadata does not name the points they cover"""
+        return [
+            match.id for match in vector_results
+            if not (match.metadata or {}).get("point_ids")
+        ]
+
+    def _rank(self, vector_results, graph_results, chunk_points):
+        """Reciprocal rank fusion; returns (ranked keys, scores, sources, chunk matches)"""
+        scores = {}
+        sources = {}
+        chunks = {}
+
+        def add(key, rank, source):
+            scores[key] = scores.get(key, 0.0) + 1.0 / (self.rrf_k + rank + 1)
+            sources.setdefault(key, set()).add(source)
+
+        for rank, record in enumerate(graph_results):
+            add(("point", record["id"]), rank, "graph")
+
+        for rank, match in enumerate(vector_results):
+            point_ids = (match.metadata or {}).get("point_ids") or chunk_points.get(match.id)
+            if point_ids:
+                for point_id in point_ids:
+                    add(("point", point_id), rank, "vector")
+            else:
+                chunks[match.id] = match
+                add(("chunk", match.id), rank, "vector")
+
+        ranked = sorted(scores, key=lambda key: -scores[key])[:self.top_n]
+        return ranked, scores, sources, chunks
+
+    @staticmethod
+    def _assemble(ranked, scores, sources, chunks, expanded):
+        fused_vector = []
+        fused_graph = []
+        for kind, id in ranked:
+            score = scores[(kind, id)]
+            if kind == "chunk":
+                match = chunks[id]
+                fused_vector.append(Match(match.id, score, match.metadata))
+            elif id in expanded:
+                record = expanded[id]
+                record.update(
+                    id=id,
+                    score=score,
+                    sources=sorted(sources[(kind, id)])
+                )
+                fused_graph.append(record)
+        return fused_vector, fused_graph
+
+    def fuse(self, vector_results, graph_results):
+        """Return (vector_results, graph_results) re-ranked and expanded by fusion
+
+        The returned graph results carry the fused score and which sources
+        found each point; the vector results keep only chunks that could not
+        be linked to graph points.
+        """
+        with self.driver.session(database=self.database) as session:
+            chunk_points = self._chunk_points(session, self._unlinked(vector_results))
+            ranked, scores, sources, chunks = self._rank(vector_results, graph_results, chunk_points)
+            expanded = self._expand(session, [key[1] for key in ranked if key[0] == "point"])
+        return self._assemble(ranked, scores, sources, chunks, expanded)
+
+
+class AsyncHybridRetriever(HybridRetriever):
+    """HybridRetriever for neo4j's async driver"""
+
+    async def fuse(self, vector_results, graph_results):
+        async with self.driver.session(database=self.database) as session:
+            chunk_points = {}
+            unlinked = self._unlinked(vector_results)
+            if unlinked:
+                result = await session.run(CHUNK_POINTS_QUERY, chunk_ids=unlinked)
+                chunk_points = {record["chunk_id"]: record["point_ids"] async for record in result}
+            ranked, scores, sources, chunks = self._rank(vector_results, graph_results, chunk_points)
+
+            expanded = {}
+            point_ids = [key[1] for key in ranked if key[0] == "point"]
+            if point_ids:
+                result = await session.run(EXPAND_QUERY, point_ids=point_ids)
+                expanded = {record["point_id"]: record.data() async for record in result}
+        return self._assemble(ranked, scores, sources, chunks, expanded)
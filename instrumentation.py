@@ -0,0 +1,289 @@
+import contextvars
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# USD per 1K tokens as (prompt, completion); override with MODEL_PRICES_PATH
+MODEL_PRICES = {
+    "gpt-4": (0.03, 0.06),
+    "text-embedding-ada-002": (0.0001, 0.0),
+}
+
+# Upper bounds in seconds of the Prometheus latency histogram buckets
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+_current = contextvars.ContextVar("trace", default=None)
+_configured = False
+_configure_lock = threading.Lock()
+_exporters = []
+_prices = None
+
+
+class Trace:
+    """Timing spans for one pipeline run (a query or an ingestion)
+
+    Spans may be recorded from several threads; each carries its offset from
+    the start of the trace, its duration and free-form attributes such as
+    token counts and result sizes.
+    """
+
+    def __init__(self, pipeline):
+        self.pipeline = pipeline
+        self.started = time.perf_counter()
+        self.ended = None
+        self.spans = []
+        self.lock = threading.Lock()
+
+    def add(self, stage, started, ended, attrs):
+        with self.lock:
+            self.spans.append({
+                "stage": stage,
+                "start_ms": round((started - self.started) * 1000, 3),
+                "ms": round((ended - started) * 1000, 3),
+                **attrs
+            })
+
+    def cost_usd(self):
+        total = 0.0
+        for span in self.spans:
+            prices = model_prices().get(span.get("model"))
+            if prices:
+                total += span.get("prompt_tokens", 0) / 1000 * prices[0]
+                total += span.get("completion_tokens", 0) / 1000 * prices[1]
+        return round(total, 6)
+
+    def summary(self):
+        ended = self.ended or time.perf_counter()
+        with self.lock:
+            spans = sorted(self.spans, key=lambda span: span["start_ms"])
+        return {
+            "pipeline": self.pipeline,
+            "total_ms": round((ended - self.started) * 1000, 3),
+            "spans": spans,
+            "prompt_tokens": sum(span.get("prompt_tokens", 0) for span in spans),
+            "completion_tokens": sum(span.get("completion_tokens", 0) for span in spans),
+            "cost_usd": self.cost_usd()
+        }
+
+
+def model_prices():
+    """Price table, with overrides from the JSON file at MODEL_PRICES_PATH merged in once"""
+    global _prices
+    if _prices is None:
+        prices = dict(MODEL_PRICES)
+        path = os.getenv("MODEL_PRICES_PATH")
+        if path:
+            with open(path, 'r', encoding='utf-8') as f:
+                prices.update({model: tuple(values) for model, values in json.load(f).items()})
+        _prices = prices
+    return _prices
+
+
+def current_trace():
+    return _current.get()
+
+
+@contextmanager
+def trace(pipeline):
+    """Collect spans for a pipeline run and export them when it ends
+
+    Inside an already active trace this simply continues that trace, so
+    nested entry points (a bulk batch calling ingestion) produce one record.
+    """
+    active = _current.get()
+    if active is not None:
+        yield active
+        return
+    run = Trace(pipeline)
+    token = _current.set(run)
+    try:
+        yield run
+    finally:
+        try:
+            _current.reset(token)
+        except ValueError:
+            # A generator-held trace finalised from another context
+            _current.set(None)
+        run.ended = time.perf_counter()
+        export(run)
+
+
+@contextmanager
+def span(stage, **attrs):
+    """Time a stage of the active trace; yields a dict for attributes known only at the end"""
+    run = _current.get()
+    if run is None:
+        yield attrs
+        return
+    started = time.perf_counter()
+    try:
+        yield attrs
+    except Exception as e:
+        attrs["error"] = str(e)
+        raise
+    finally:
+        run.add(stage, started, time.perf_counter(), attrs)
+
+
+def propagate(function):
+    """Bind a callable to the current trace so spans recorded on other threads land in it"""
+    context = contextvars.copy_context()
+    return lambda *args, **kwargs: context.run(function, *args, **kwargs)
+
+
+def summarize_profile(profile):
+    """Reduce a Neo4j PROFILE plan to operators with rows and db hits"""
+    if not profile:
+        return None
+    return {
+        "operator": profile.get("operatorType"),
+        "rows": profile.get("rows"),
+        "db_hits": profile.get("dbHits"),
+        "children": [summarize_profile(child) for child in profile.get("children", [])]
+    }
+
+
+def total_db_hits(profile):
+    if not profile:
+        return 0
+    return (profile.get("db_hits") or 0) + sum(total_db_hits(child) for child in profile["children"])
+
+
+class JsonLinesExporter:
+    """Append one JSON line per finished trace"""
+
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def export(self, summary):
+        line = json.dumps(dict(summary, timestamp=time.time()), default=str)
+        with self.lock:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(line + "\n")
+
+
+class MetricsRegistry:
+    """Aggregate span latencies and token counts in Prometheus text format"""
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.latency = {}
+        self.tokens = {}
+        self.runs = {}
+        self.cost = {}
+        self.lock = threading.Lock()
+
+    def export(self, summary):
+        pipeline = summary["pipeline"]
+        with self.lock:
+            self.runs[pipeline] = self.runs.get(pipeline, 0) + 1
+            self.cost[pipeline] = self.cost.get(pipeline, 0.0) + summary["cost_usd"]
+            stages = [("total", summary["total_ms"], {})] + [
+                (span["stage"], span["ms"], span) for span in summary["spans"]
+            ]
+            for stage, ms, attrs in stages:
+                seconds = ms / 1000
+                entry = self.latency.setdefault(
+                    (pipeline, stage), {"buckets": [0] * len(self.buckets), "sum": 0.0, "count": 0}
+                )
+                entry["sum"] += seconds
+                entry["count"] += 1
+                for i, bound in enumerate(self.buckets):
+                    if seconds <= bound:
+                        entry["buckets"][i] += 1
+                for kind in ("prompt_tokens", "completion_tokens"):
+                    if attrs.get(kind):
+                        key = (pipeline, stage, kind.split("_")[0])
+                        self.tokens[key] = self.tokens.get(key, 0) + attrs[kind]
+
+    def render(self):
+        lines = [
+            "# HELP rag_stage_seconds Latency of pipeline stages",
+            "# TYPE rag_stage_seconds histogram",
+        ]
+        with self.lock:
+            for (pipeline, stage), entry in sorted(self.latency.items()):
+                labels = f'pipeline="{pipeline}",stage="{stage}"'
+                for bound, count in zip(self.buckets, entry["buckets"]):
+                    lines.append(f'rag_stage_seconds_bucket{{{labels},le="{bound}"}} {count}')
+                lines.append(f'rag_stage_seconds_bucket{{{labels},le="+Inf"}} {entry["count"]}')
+                lines.append(f"rag_stage_seconds_sum{{{labels}}} {entry['sum']:.6f}")
+                lines.append(f"rag_stage_seconds_count{{{labels}}} {entry['count']}")
+
+            lines += ["# HELP rag_tokens_total Tokens sent to and received from models",
+                      "# TYPE rag_tokens_total counter"]
+            for (pipeline, stage, kind), count in sorted(self.tokens.items()):
+                lines.append(f'rag_tokens_total{{pipeline="{pipeline}",stage="{stage}",kind="{kind}"}} {count}')
+
+            lines += ["# HELP rag_runs_total Finished pipeline runs",
+                      "# TYPE rag_runs_total counter"]
+            for pipeline, count in sorted(self.runs.items()):
+                lines.append(f'rag_runs_total{{pipeline="{pipeline}"}} {count}')
+
+            lines += ["# HELP rag_cost_usd_total Estimated model spend",
+                      "# TYPE rag_cost_usd_total counter"]
+            for pipeline, cost in sorted(self.cost.items()):
+                lines.append(f'rag_cost_usd_total{{pipeline="{pipeline}"}} {cost:.6f}')
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+
+def start_metrics_server(port, host="127.0.0.1"):
+    """Serve the registry at /metrics from a daemon thread"""
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = registry.render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def configure():
+    """Set up exporters from RAG_TRACE_LOG and RAG_METRICS_PORT / RAG_METRICS_HOST once per process"""
+    global _configured
+    with _configure_lock:
+        if _configured:
+            return
+        _configured = True
+        _exporters.append(registry)
+        if os.getenv("RAG_TRACE_LOG"):
+            _exporters.append(JsonLinesExporter(os.getenv("RAG_TRACE_LOG")))
+        if os.getenv("RAG_METRICS_PORT"):
+            try:
+                start_metrics_server(
+                    int(os.getenv("RAG_METRICS_PORT")), os.getenv("RAG_METRICS_HOST", "127.0.0.1")
+                )
+            except OSError as e:
+                print(f"Could not start metrics server: {str(e)}")
+
+
+def export(run):
+    configure()
+    summary = run.summary()
+    for exporter in _exporters:
+        try:
+            exporter.export(summary)
+        except Exception as e:
+            print(f"Error exporting trace: {str(e)}")
@@ -0,0 +1,190 @@
+import asyncio
+import math
+import re
+import threading
+import time
+from collections import Counter
+
+import corpus_version
+
+STOP_WORDS = frozenset("""
+a about above after again against all also am an and any are as at be because been
+before being below between both but by can could did do does doing down during each
+few for from further had has have having he her here hers herself him himself his how
+i if in into is it its itself just me more most my myself no nor not now of off on once
+only or other our ours ourselves out over own same she should so some such than that
+the their theirs them themselves then there these they this those through to too under
+until up very was we were what when where which while who whom why will with would you
+your yours yourself yourselves
+discussed discuss discussion mentioned meeting meetings tell explain describe give list
+show key main please anything everything something thing things regarding
+""".split())
+
+ENTITY_QUERY = (
+    "MATCH (t:Topic) RETURN t.name AS name "
+    "UNION MATCH (p:Person) RETURN p.name AS name"
+)
+CONTENT_QUERY = "MATCH (d:DiscussionPoint) RETURN d.content AS content"
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:[.'-][a-z0-9]+)*")
+
+
+def tokenize(text):
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def content_terms(tokens, max_n=2):
+    """Unigrams and n-grams that neither start nor end with a stop word"""
+    terms = []
+    for n in range(1, max_n + 1):
+        for i in range(len(tokens) - n + 1):
+            gram = tokens[i:i + n]
+            if gram[0] in STOP_WORDS or gram[-1] in STOP_WORDS:
+                continue
+            terms.append(" ".join(gram))
+    return terms
+
+
+class Vocabulary:
+    """Snapshot of the graph's entity names and term document frequencies
+
+    Built in full and never modified afterwards, so a refresh can replace
+    it while queries keep ranking against the previous one.
+    """
+
+    def __init__(self, names=(), contents=()):
+        # Normalised token sequence -> name as it appears in content
+        self.entities = {}
+        for name in names:
+            if name:
+                normalized = " ".join(tokenize(name))
+                if normalized:
+                    self.entities[normalized] = name.lower()
+        self.longest_entity = max((len(entity.split()) for entity in self.entities), default=0)
+
+        self.document_frequency = Counter()
+        self.documents = 0
+        for content in contents:
+            self.documents += 1
+            self.document_frequency.update(set(content_terms(tokenize(content or ""), 2)))
+
+    @property
+    def empty(self):
+        return not self.entities and not self.document_frequency
+
+    def idf(self, term):
+        return math.log((1 + self.documents) / (1 + self.document_frequency.get(term, 0))) + 1
+
+
+def graph_version():
+    """The graph's counter in the shared corpus version, bumped by every graph write"""
+    return dict(corpus_version.current()).get("graph", 0)
+
+
+class KeywordExtractor:
+    """Extract graph search keywords from a query without calling an LLM
+
+    The vocabulary is built from the graph itself: Topic and Person names
+    plus document frequencies of terms in DiscussionPoint content. Query
+    n-grams are matched against it and ranked by TF-IDF, with entity names
+    boosted. The vocabulary is rebuilt when the graph's corpus version
+    moves on, at most once per `refresh_interval` seconds; queries keep
+    using the previous vocabulary while the new one is built.
+    """
+
+    def __init__(self, driver, database=None, refresh_interval=30.0, max_n=3, entity_boost=2.0):
+        self.driver = driver
+        self.database = database
+        self.refresh_interval = refresh_interval
+        self.max_n = max_n
+        self.entity_boost = entity_boost
+
+        self.vocabulary = Vocabulary()
+        self.version = None
+        self.loaded_at = 0.0
+        self.lock = threading.Lock()
+
+    def _due(self, version, force):
+        """Whether the vocabulary should be rebuilt for this graph version"""
+        if force or self.version is None:
+            return True
+        return version != self.version and time.monotonic() - self.loaded_at >= self.refresh_interval
+
+    def _load_vocabulary(self, session):
+        return Vocabulary(
+            [record["name"] for record in session.run(ENTITY_QUERY)],
+            [record["content"] for record in session.run(CONTENT_QUERY)]
+        )
+
+    def refresh(self, force=False):
+        """Rebuild the vocabulary if the graph changed since the last load"""
+        version = graph_version()
+        if not self._due(version, force):
+            return
+        # Only the first load makes callers wait; later rebuilds are done by one
+        # caller while the others carry on with the current vocabulary
+        if not self.lock.acquire(blocking=self.version is None):
+            return
+        try:
+            if not force and not self._due(version, False):
+                return
+            with self.driver.session(database=self.database) as session:
+                vocabulary = self._load_vocabulary(session)
+            self.vocabulary, self.version, self.loaded_at = vocabulary, version, time.monotonic()
+        finally:
+            self.lock.release()
+
+    @property
+    def empty(self):
+        return self.vocabulary.empty
+
+    def idf(self, term):
+        return self.vocabulary.idf(term)
+
+    def extract(self, query, max_keywords=8):
+        """Return up to max_keywords lowercase keywords ranked by relevance"""
+        self.refresh()
+        return self._rank(query, max_keywords)
+
+    def _rank(self, query, max_keywords):
+        vocabulary = self.vocabulary
+        tokens = tokenize(query)
+        max_n = max(self.max_n, vocabulary.longest_entity)
+        scores = {}
+        for term, count in Counter(content_terms(tokens, max_n)).items():
+            if term in vocabulary.entities:
+                scores[term] = count * vocabulary.idf(term) * self.entity_boost
+            elif term in vocabulary.document_frequency:
+                scores[term] = count * vocabulary.idf(term)
+
+        # Rank by score, preferring longer phrases on ties
+        ranked = sorted(scores, key=lambda term: (-scores[term], -len(term)))
+        return [vocabulary.entities.get(term, term) for term in ranked[:max_keywords]]
+
+
+class AsyncKeywordExtractor(KeywordExtractor):
+    """KeywordExtractor for neo4j's async driver"""
+
+    def __init__(self, driver, database=None, refresh_interval=30.0, max_n=3, entity_boost=2.0):
+        super().__init__(driver, database, refresh_interval, max_n, entity_boost)
+        self.lock = asyncio.Lock()
+
+    async def refresh(self, force=False):
+        version = graph_version()
+        if not self._due(version, force):
+            return
+        if self.lock.locked() and self.version is not None:
+            return
+        async with self.lock:
+            if not force and not self._due(version, False):
+                return
+            async with self.driver.session(database=self.database) as session:
+                names = [record["name"] async for record in await session.run(ENTITY_QUERY)]
+                contents = [record["content"] async for record in await session.run(CONTENT_QUERY)]
+            # Counting terms over the corpus is CPU work; keep it off the event loop
+            vocabulary = await asyncio.to_thread(Vocabulary, names, contents)
+            self.vocabulary, self.version, self.loaded_at = vocabulary, version, time.monotonic()
+
+    async def extract(self, query, max_keywords=8):
+        await self.refresh()
+        return self._rank(query, max_keywords)
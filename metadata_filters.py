@@ -0,0 +1,94 @@
+import re
+from datetime import date, datetime, timedelta
+
+DATE_IN_TEXT = re.compile(r'(\d{4})-?(\d{2})-?(\d{2})')
+
+RELATIVE_PERIOD = re.compile(
+    r"\b(?:(today|yesterday)|(this|last|past|previous)\s+(week|month|year)"
+    r"|(?:last|past|previous)\s+(\d+)\s+(days?|weeks?|months?))\b",
+    re.IGNORECASE
+)
+
+
+def date_number(value):
+    """A date as the YYYYMMDD integer stored in vector metadata, so ranges work in Pinecone filters"""
+    if value is None:
+        return None
+    if isinstance(value, int):
+        return value
+    if isinstance(value, datetime):
+        value = value.date()
+    if isinstance(value, date):
+        return value.year * 10000 + value.month * 100 + value.day
+    match = DATE_IN_TEXT.search(str(value))
+    if not match:
+        raise ValueError(f"Not a date: {value!r}")
+    year, month, day = (int(part) for part in match.groups())
+    return year * 10000 + month * 100 + day
+
+
+def _month_start(day, months_back=0):
+    month = day.month - 1 - months_back
+    return date(day.year + month // 12, month % 12 + 1, 1)
+
+
+def date_range_in_text(text, today=None):
+    """(date_from, date_to) for the first relative period named in a question, or None
+
+    Understands today, yesterday, this/last week, month and year, and
+    "last N days/weeks/months".
+    """
+    match = RELATIVE_PERIOD.search(text or "")
+    if not match:
+        return None
+    today = today or date.today()
+    single, which, unit, count, count_unit = match.groups()
+
+    if single:
+        day = today if single.lower() == "today" else today - timedelta(days=1)
+        return day, day
+    if count:
+        count = int(count)
+        unit = count_unit.lower().rstrip("s")
+        if unit == "day":
+            return today - timedelta(days=count), today
+        if unit == "week":
+            return today - timedelta(weeks=count), today
+        return _month_start(today, count), today
+
+    unit = unit.lower()
+    current = which.lower() == "this"
+    if unit == "week":
+        start = today - timedelta(days=today.weekday())
+        return (start, today) if current else (start - timedelta(days=7), start - timedelta(days=1))
+    if unit == "month":
+        start = _month_start(today)
+        return (start, today) if current else (_month_start(today, 1), start - timedelta(days=1))
+    start = date(today.year, 1, 1)
+    return (start, today) if current else (date(today.year - 1, 1, 1), date(today.year - 1, 12, 31))
+
+
+def metadata_filter(file_name=None, meeting_id=None, date_from=None, date_to=None):
+    """Pinecone-style filter on the fields stored with every vector; None when nothing is set"""
+    clauses = {}
+    if file_name is not None:
+        clauses["file_name"] = {"$in": list(file_name)} if isinstance(file_name, (list, tuple, set)) else file_name
+    if meeting_id is not None:
+        clauses["meeting_id"] = meeting_id
+    dates = {}
+    if date_from is not None:
+        dates["$gte"] = date_number(date_from)
+    if date_to is not None:
+        dates["$lte"] = date_number(date_to)
+    if dates:
+        clauses["meeting_date"] = dates
+    return clauses or None
+
+
+def combine_filters(*filters):
+    filters = [f for f in filters if f]
+    if not filters:
+        return None
+    if len(filters) == 1:
+        return filters[0]
+    return {"$and": filters}
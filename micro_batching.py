@@ -0,0 +1,116 @@
+import json
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+_STOP = object()
+
+
+class MicroBatcher:
+    """Coalesce calls arriving from many threads into batched calls
+
+    A background thread takes the first waiting item, keeps collecting until
+    `max_batch_size` items are queued or `max_wait` seconds have passed, and
+    hands the whole batch to `handler`, which returns one result per item.
+    Every caller blocks only for its own result; an exception raised by the
+    handler is re-raised in each caller of that batch.
+    """
+
+    def __init__(self, handler, max_batch_size=32, max_wait=0.005, name="micro-batcher"):
+        self.handler = handler
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait)
+        self.queue = queue.Queue()
+        self.stats = {"batches": 0, "items": 0, "largest": 0}
+        self.thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self.thread.start()
+
+    def submit(self, item):
+        """Queue an item and wait for its result"""
+        future = Future()
+        self.queue.put((item, future))
+        return future.result()
+
+    def close(self):
+        self.queue.put(_STOP)
+        self.thread.join()
+
+    def _collect(self):
+        first = self.queue.get()
+        if first is _STOP:
+            return None
+        batch = [first]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                item = self.queue.get(timeout=remaining) if remaining > 0 else self.queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is _STOP:
+                # Finish this batch, then stop
+                self.queue.put(_STOP)
+                break
+            batch.append(item)
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            if batch is None:
+                return
+            self.stats["batches"] += 1
+            self.stats["items"] += len(batch)
+            self.stats["largest"] = max(self.stats["largest"], len(batch))
+
+            futures = [future for _, future in batch]
+            try:
+                results = self.handler([item for item, _ in batch])
+            except Exception as e:
+                for future in futures:
+                    future.set_exception(e)
+                continue
+            for future, result in zip(futures, results):
+                future.set_result(result)
+
+
+def embedding_handler(embedder):
+    """Batch handler embedding the distinct texts of a batch in one request"""
+
+    def embed(texts):
+        unique = list(dict.fromkeys(texts))
+        embeddings = dict(zip(unique, embedder.embed(unique)))
+        return [embeddings[text] for text in texts]
+
+    return embed
+
+
+def vector_query_handler(index):
+    """Batch handler running (vector, top_k, filter) lookups as multi-query index calls
+
+    Lookups with the same filter share one `query_batch` call at the largest
+    requested top_k, and each result is trimmed back to its own top_k.
+    """
+
+    def query(lookups):
+        groups = {}
+        for position, (vector, top_k, filter) in enumerate(lookups):
+            key = json.dumps(filter, sort_keys=True, default=str)
+            groups.setdefault(key, []).append(position)
+
+        results = [None] * len(lookups)
+        for positions in groups.values():
+            filter = lookups[positions[0]][2]
+            top_k = max(lookups[position][1] for position in positions)
+            matches = index.query_batch(
+                [lookups[position][0] for position in positions],
+                top_k=top_k,
+                filter=filter,
+                include_metadata=True
+            )
+            for position, found in zip(positions, matches):
+                results[position] = found[:lookups[position][1]]
+        return results
+
+    return query
@@ -0,0 +1,98 @@
+import atexit
+import os
+import threading
+
+from neo4j import AsyncGraphDatabase, GraphDatabase
+from dotenv import load_dotenv
+
+_drivers = {}
+_lock = threading.Lock()
+
+
+def pool_config_from_env():
+    """Connection pool settings, overridable through the environment"""
+    return {
+        "max_connection_pool_size": int(os.getenv("NEO4J_MAX_POOL_SIZE", "100")),
+        "max_connection_lifetime": float(os.getenv("NEO4J_MAX_CONNECTION_LIFETIME", "3600")),
+        "connection_acquisition_timeout": float(os.getenv("NEO4J_CONNECTION_ACQUISITION_TIMEOUT", "60")),
+    }
+
+
+def get_driver(uri=None, user=None, password=None, verify_connectivity=None, **pool_config):
+    """Return the process-wide driver for a URI and user, creating it on first use
+
+    Drivers connect lazily: no connection is opened until the first query,
+    unless verify_connectivity (or NEO4J_VERIFY_CONNECTIVITY=true) asks for
+    an upfront check.
+    """
+    load_dotenv()
+    uri = uri or os.getenv("NEO4J_URI")
+    user = user or os.getenv("NEO4J_USER")
+    password = password or os.getenv("NEO4J_PASSWORD")
+    if verify_connectivity is None:
+        verify_connectivity = os.getenv("NEO4J_VERIFY_CONNECTIVITY", "false").lower() == "true"
+
+    key = (uri, user)
+    with _lock:
+        driver = _drivers.get(key)
+        if driver is None:
+            config = dict(pool_config_from_env(), **pool_config)
+            driver = GraphDatabase.driver(uri, auth=(user, password), **config)
+            _drivers[key] = driver
+
+    if verify_connectivity:
+        driver.verify_connectivity()
+    return driver
+
+
+def create_async_driver(uri=None, user=None, password=None, **pool_config):
+    """Create an async driver with the same settings as get_driver
+
+    Async drivers belong to the event loop that uses them, so they are not
+    shared through the registry; the caller closes them.
+    """
+    load_dotenv()
+    uri = uri or os.getenv("NEO4J_URI")
+    user = user or os.getenv("NEO4J_USER")
+    password = password or os.getenv("NEO4J_PASSWORD")
+    config = dict(pool_config_from_env(), **pool_config)
+    return AsyncGraphDatabase.driver(uri, auth=(user, password), **config)
+
+
+def pool_stats():
+    """Connection usage of every registered driver's pool"""
+    stats = {}
+    with _lock:
+        drivers = dict(_drivers)
+    for (uri, user), driver in drivers.items():
+        entry = {"user": user}
+        # The driver exposes no public pool metrics, so read them defensively
+        pool = getattr(driver, "_pool", None)
+        try:
+            entry["max_size"] = pool.pool_config.max_connection_pool_size
+            with pool.lock:
+                connections = {
+                    str(address): list(conns) for address, conns in pool.connections.items()
+                }
+            entry["addresses"] = {
+                address: {
+                    "open": len(conns),
+                    "in_use": sum(1 for conn in conns if conn.in_use),
+                }
+                for address, conns in connections.items()
+            }
+        except AttributeError:
+            entry["addresses"] = {}
+        stats[uri] = entry
+    return stats
+
+
+def close_all():
+    with _lock:
+        drivers = list(_drivers.values())
+        _drivers.clear()
+    for driver in drivers:
+        driver.close()
+
+
+atexit.register(close_all)
@@ -0,0 +1,536 @@
+import argparse
+import json
+import os
+import shutil
+import statistics
+import tempfile
+import time
+from datetime import datetime
+
+import numpy as np
+
+from vector_index import DIMENSION, Match, NumpyVectorIndex, VectorIndex, matches_filter
+
+# Rows scored per step, so scanning the codes never materialises a full score matrix
+BLOCK_ROWS = 1024
+
+# Pending rows plus tombstones that always fit in the exact side index before a merge
+MIN_MERGE_ROWS = 1000
+
+
+class Float16Codec:
+    """Half precision copy of each vector: 2 bytes per dimension"""
+
+    name = "float16"
+
+    def __init__(self, dimension):
+        self.dimension = dimension
+        self.shape = (dimension,)
+        self.dtype = np.float16
+
+    def train(self, sample):
+        pass
+
+    def encode(self, vectors):
+        return vectors.astype(np.float16)
+
+    def prepare(self, queries):
+        return queries
+
+    def score(self, prepared, codes):
+        return prepared @ codes.astype(np.float32).T
+
+    def state(self):
+        return {}
+
+    def load(self, state):
+        pass
+
+
+class Int8Codec:
+    """Per-dimension scalar quantization to one byte
+
+    Each dimension is mapped linearly from its [min, max] over the training
+    sample onto 0..255, so a dot product with a code is one uint8 matrix
+    product plus a per-query constant.
+    """
+
+    name = "int8"
+
+    def __init__(self, dimension):
+        self.dimension = dimension
+        self.shape = (dimension,)
+        self.dtype = np.uint8
+        self.offset = np.zeros(dimension, dtype=np.float32)
+        self.scale = np.ones(dimension, dtype=np.float32)
+
+    def train(self, sample):
+        low = sample.min(axis=0)
+        high = sample.max(axis=0)
+        self.offset = low.astype(np.float32)
+        self.scale = np.maximum((high - low) / 255.0, 1e-12).astype(np.float32)
+
+    def encode(self, vectors):
+        codes = np.rint((vectors - self.offset) / self.scale)
+        return np.clip(codes, 0, 255).astype(np.uint8)
+
+    def prepare(self, queries):
+        return queries * self.scale, queries @ self.offset
+
+    def score(self, prepared, codes):
+        scaled, constant = prepared
+        return scaled @ codes.astype(np.float32).T + constant[:, None]
+
+    def state(self):
+        return {"offset": self.offset, "scale": self.scale}
+
+    def load(self, state):
+        self.offset = state["offset"]
+        self.scale = state["scale"]
+
+
+class PQCodec:
+    """Product quantization: one byte per subvector, scored with lookup tables
+
+    The vector is cut into `subvectors` equal slices and each slice is
+    replaced by the nearest of 256 centroids learned with k-means on that
+    slice. A query precomputes its dot product with every centroid, so a
+    code scores as the sum of `subvectors` table lookups.
+    """
+
+    name = "pq"
+
+    def __init__(self, dimension, subvectors=96, centroids=256, iterations=12, seed=0):
+        if dimension % subvectors:
+            raise ValueError(f"Dimension {dimension} is not divisible into {subvectors} subvectors")
+        self.dimension = dimension
+        self.subvectors = subvectors
+        self.width = dimension // subvectors
+        self.centroids = centroids
+        self.iterations = iterations
+        self.seed = seed
+        self.shape = (subvectors,)
+        self.dtype = np.uint8
+        self.codebooks = np.zeros((subvectors, centroids, self.width), dtype=np.float32)
+
+    def _slices(self, vectors):
+        return vectors.reshape(len(vectors), self.subvectors, self.width)
+
+    @staticmethod
+    def _nearest(points, centers):
+        distances = (centers ** 2).sum(axis=1)[None, :] - 2 * points @ centers.T
+        return distances.argmin(axis=1)
+
+    def train(self, sample):
+        rng = np.random.default_rng(self.seed)
+        slices = self._slices(sample)
+        k = min(self.centroids, len(sample))
+        for s in range(self.subvectors):
+            points = slices[:, s, :]
+            centers = points[rng.choice(len(points), k, replace=False)].copy()
+            for _ in range(self.iterations):
+                assignment = self._nearest(points, centers)
+                counts = np.bincount(assignment, minlength=k)
+                sums = np.zeros_like(centers)
+                np.add.at(sums, assignment, points)
+                empty = counts == 0
+                centers[~empty] = sums[~empty] / counts[~empty, None]
+                # Re-seed empty clusters from random points
+                centers[empty] = points[rng.choice(len(points), int(empty.sum()))]
+            self.codebooks[s, :k] = centers
+            self.codebooks[s, k:] = centers[0]
+
+    def encode(self, vectors):
+        slices = self._slices(vectors)
+        codes = np.empty((len(vectors), self.subvectors), dtype=np.uint8)
+        for s in range(self.subvectors):
+            codes[:, s] = self._nearest(slices[:, s, :], self.codebooks[s])
+        return codes
+
+    def prepare(self, queries):
+        # (queries, subvectors * centroids) table of slice-centroid dot products
+        tables = np.einsum("qsw,scw->qsc", self._slices(queries), self.codebooks)
+        return tables.reshape(len(queries), -1)
+
+    def score(self, prepared, codes):
+        lookup = codes.astype(np.intp) + np.arange(self.subvectors) * self.centroids
+        return np.stack([table[lookup].sum(axis=1) for table in prepared])
+
+    def state(self):
+        return {"codebooks": self.codebooks}
+
+    def load(self, state):
+        self.codebooks = state["codebooks"]
+
+
+CODECS = {
+    "float16": Float16Codec,
+    "int8": Int8Codec,
+    "pq": PQCodec,
+}
+
+
+def make_codec(name, dimension, **options):
+    if name not in CODECS:
+        raise ValueError(f"Unknown quantization: {name} (expected one of {', '.join(CODECS)})")
+    return CODECS[name](dimension, **options)
+
+
+class QuantizedVectorIndex(VectorIndex):
+    """Cosine search over quantized codes with an exact re-rank
+
+    Uses the NumPy backend's directory layout (normalised float32 rows in
+    vectors.npy, ids and metadata in ids.json) and adds codes.npy plus the
+    trained codec in quantizer.npz, so an existing NumPy index is converted
+    on first open. Both arrays are opened with mmap: startup does not read
+    them, worker processes share their pages, and the full precision rows
+    are only touched for the `rerank` x top_k candidates of each query.
+
+    Upserts go to a small exact NumPy index in pending/ and deletes are
+    tombstoned in deleted.json; once they outgrow `merge_fraction` of the
+    segment, flush() rewrites the segment and re-encodes it.
+    """
+
+    def __init__(self, path, dimension=DIMENSION, force_recreate=False, quantization="int8",
+                 rerank=10, train_size=20000, merge_fraction=0.1, **codec_options):
+        if not path:
+            raise ValueError("The quantized vector index needs a directory path")
+        self.path = path
+        self.dimension = dimension
+        self.quantization = quantization
+        self.codec_options = codec_options
+        self.rerank = max(1, rerank)
+        self.train_size = train_size
+        self.merge_fraction = merge_fraction
+
+        if force_recreate and os.path.isdir(path):
+            for name in ("ids.json", "vectors.npy", "codes.npy", "quantizer.npz", "deleted.json"):
+                if os.path.exists(os.path.join(path, name)):
+                    os.remove(os.path.join(path, name))
+            shutil.rmtree(os.path.join(path, "pending"), ignore_errors=True)
+        self._open()
+
+    def _file(self, name):
+        return os.path.join(self.path, name)
+
+    def _open(self):
+        self.codec = make_codec(self.quantization, self.dimension, **self.codec_options)
+        self.pending = NumpyVectorIndex(self._file("pending"), dimension=self.dimension)
+        self.deleted = set()
+        if not os.path.exists(self._file("ids.json")):
+            self.ids, self.metadata, self.positions = [], [], {}
+            self.vectors = np.zeros((0, self.dimension), dtype=np.float32)
+            self.codes = np.zeros((0,) + self.codec.shape, dtype=self.codec.dtype)
+            return
+
+        with open(self._file("ids.json"), 'r', encoding='utf-8') as f:
+            state = json.load(f)
+        self.ids = state["ids"]
+        self.metadata = state["metadata"]
+        self.positions = {id: row for row, id in enumerate(self.ids)}
+        self.vectors = np.load(self._file("vectors.npy"), mmap_mode="r")[:len(self.ids)]
+        if not self._load_codes():
+            self._encode_segment()
+
+        # Pending rows supersede their segment copies
+        deleted = list(self.pending.ids)
+        if os.path.exists(self._file("deleted.json")):
+            with open(self._file("deleted.json"), 'r', encoding='utf-8') as f:
+                deleted += json.load(f)
+        self.deleted = {self.positions[id] for id in deleted if id in self.positions}
+
+    def _load_codes(self):
+        if not (os.path.exists(self._file("quantizer.npz")) and os.path.exists(self._file("codes.npy"))):
+            return False
+        with np.load(self._file("quantizer.npz")) as saved:
+            state = {key: saved[key] for key in saved.files}
+        if str(state.pop("codec")) != self.quantization:
+            return False
+        codes = np.load(self._file("codes.npy"), mmap_mode="r")
+        if codes.shape != (len(self.ids),) + self.codec.shape:
+            return False
+        self.codec.load(state)
+        self.codes = codes
+        return True
+
+    def _encode_segment(self):
+        """Train the codec on a sample of the stored rows and write codes.npy block by block"""
+        count = len(self.ids)
+        if count:
+            rng = np.random.default_rng(0)
+            sample_rows = np.sort(rng.choice(count, min(count, self.train_size), replace=False))
+            self.codec.train(np.asarray(self.vectors[sample_rows], dtype=np.float32))
+
+        tmp_path = self._file("codes.tmp.npy")
+        codes = np.lib.format.open_memmap(
+            tmp_path, mode="w+", dtype=self.codec.dtype, shape=(count,) + self.codec.shape
+        )
+        for start in range(0, count, BLOCK_ROWS):
+            codes[start:start + BLOCK_ROWS] = self.codec.encode(
+                np.asarray(self.vectors[start:start + BLOCK_ROWS], dtype=np.float32)
+            )
+        codes.flush()
+        del codes
+        os.replace(tmp_path, self._file("codes.npy"))
+        np.savez(self._file("quantizer.npz"), codec=self.quantization, **self.codec.state())
+        self.codes = np.load(self._file("codes.npy"), mmap_mode="r")
+
+    def __len__(self):
+        return len(self.ids) - len(self.deleted) + len(self.pending)
+
+    def upsert(self, vectors):
+        for vector in vectors:
+            row = self.positions.get(vector["id"])
+            if row is not None:
+                self.deleted.add(row)
+        self.pending.upsert(vectors)
+
+    def delete(self, ids):
+        for id in ids:
+            row = self.positions.get(id)
+            if row is not None:
+                self.deleted.add(row)
+        self.pending.delete(ids)
+
+    def flush(self):
+        """Persist pending changes, merging them into the segment once they grow large"""
+        if len(self.pending) + len(self.deleted) > max(MIN_MERGE_ROWS, self.merge_fraction * len(self.ids)):
+            self.merge()
+            return
+        os.makedirs(self.path, exist_ok=True)
+        self.pending.flush()
+        with open(self._file("deleted.json"), 'w', encoding='utf-8') as f:
+            json.dump(sorted(self.ids[row] for row in self.deleted), f)
+
+    def merge(self):
+        """Rewrite the segment with pending upserts merged in and deletes dropped, then re-encode"""
+        if not len(self.pending) and not self.deleted:
+            return
+        os.makedirs(self.path, exist_ok=True)
+        live = np.asarray([row for row in range(len(self.ids)) if row not in self.deleted], dtype=np.int64)
+        count = live.size + self.pending.count
+
+        tmp_path = self._file("vectors.tmp.npy")
+        vectors = np.lib.format.open_memmap(
+            tmp_path, mode="w+", dtype=np.float32, shape=(count, self.dimension)
+        )
+        for start in range(0, live.size, BLOCK_ROWS):
+            rows = live[start:start + BLOCK_ROWS]
+            vectors[start:start + rows.size] = self.vectors[rows]
+        vectors[live.size:] = self.pending.vectors[:self.pending.count]
+        vectors.flush()
+        del vectors
+
+        ids = [self.ids[row] for row in live] + list(self.pending.ids)
+        metadata = [self.metadata[row] for row in live] + list(self.pending.metadata)
+        os.replace(tmp_path, self._file("vectors.npy"))
+        with open(self._file("ids.json"), 'w', encoding='utf-8') as f:
+            json.dump({"ids": ids, "metadata": metadata}, f)
+
+        self.ids, self.metadata = ids, metadata
+        self.positions = {id: row for row, id in enumerate(ids)}
+        self.vectors = np.load(self._file("vectors.npy"), mmap_mode="r")
+        self._encode_segment()
+
+        shutil.rmtree(self._file("pending"), ignore_errors=True)
+        if os.path.exists(self._file("deleted.json")):
+            os.remove(self._file("deleted.json"))
+        self.pending = NumpyVectorIndex(self._file("pending"), dimension=self.dimension)
+        self.deleted = set()
+
+    def _candidate_rows(self, filter):
+        """Segment rows eligible for a query, or None when every row is"""
+        if not filter and not self.deleted:
+            return None
+        mask = np.ones(len(self.ids), dtype=bool)
+        mask[list(self.deleted)] = False
+        if filter:
+            mask &= np.fromiter(
+                (matches_filter(metadata, filter) for metadata in self.metadata),
+                dtype=bool,
+                count=len(self.ids)
+            )
+        return np.flatnonzero(mask)
+
+    def _search_segment(self, queries, depth, rows):
+        """Approximate top `depth` rows per query from the codes"""
+        prepared = self.codec.prepare(queries)
+        total = len(self.ids) if rows is None else rows.size
+        found = [[] for _ in queries]
+        for start in range(0, total, BLOCK_ROWS):
+            block = np.arange(start, min(start + BLOCK_ROWS, total)) if rows is None \
+                else rows[start:start + BLOCK_ROWS]
+            codes = self.codes[start:start + block.size] if rows is None else self.codes[block]
+            scores = self.codec.score(prepared, np.asarray(codes))
+            for query, query_scores in enumerate(scores):
+                keep = min(depth, block.size)
+                best = np.argpartition(-query_scores, keep - 1)[:keep]
+                found[query].append((block[best], query_scores[best]))
+
+        candidates = []
+        for parts in found:
+            block_rows = np.concatenate([part[0] for part in parts])
+            block_scores = np.concatenate([part[1] for part in parts])
+            keep = min(depth, block_rows.size)
+            candidates.append(block_rows[np.argpartition(-block_scores, keep - 1)[:keep]])
+        return candidates
+
+    def query(self, vector, top_k=3, filter=None, include_metadata=True):
+        return self.query_batch([vector], top_k, filter, include_metadata)[0]
+
+    def query_batch(self, vectors, top_k=3, filter=None, include_metadata=True):
+        if top_k <= 0 or not len(vectors):
+            return [[] for _ in vectors]
+        queries = NumpyVectorIndex._normalize(np.asarray(vectors, dtype=np.float32))
+        fresh = self.pending.query_batch(queries, top_k, filter, include_metadata)
+
+        rows = self._candidate_rows(filter)
+        if (len(self.ids) if rows is None else rows.size) == 0:
+            return fresh
+
+        results = []
+        candidates = self._search_segment(queries, top_k * self.rerank, rows)
+        for query, candidate_rows, pending_matches in zip(queries, candidates, fresh):
+            # Exact re-rank reads only the candidates' full precision rows
+            candidate_rows = np.sort(candidate_rows)
+            exact = np.asarray(self.vectors[candidate_rows], dtype=np.float32) @ query
+            order = np.argsort(-exact)[:top_k]
+            matches = [
+                self._match(row, score, include_metadata)
+                for row, score in zip(candidate_rows[order], exact[order])
+            ]
+            merged = sorted(matches + pending_matches, key=lambda match: -match.score)
+            results.append(merged[:top_k])
+        return results
+
+    def _match(self, row, score, include_metadata):
+        return Match(self.ids[row], float(score), self.metadata[row] if include_metadata else None)
+
+    def code_bytes(self):
+        """Bytes per vector in codes.npy, the part every query scans"""
+        return int(np.prod(self.codec.shape)) * np.dtype(self.codec.dtype).itemsize
+
+
+def clustered_vectors(count, dimension=DIMENSION, clusters=200, spread=0.35, seed=0):
+    """Normalised vectors drawn around random centres, a rough stand-in for text embeddings"""
+    rng = np.random.default_rng(seed)
+    centres = rng.standard_normal((clusters, dimension)).astype(np.float32)
+    vectors = centres[rng.integers(0, clusters, count)]
+    vectors = vectors + spread * rng.standard_normal((count, dimension)).astype(np.float32)
+    return NumpyVectorIndex._normalize(vectors)
+
+
+def recall_report(vectors, queries, top_k=10, settings=None, workdir=None):
+    """Recall@k and latency of each quantization/rerank setting against exact search
+
+    `settings` is a list of (quantization, rerank) pairs. Every setting is
+    built in a scratch directory from the same vectors.
+    """
+    settings = settings or [(name, rerank) for name in CODECS for rerank in (1, 10, 50)]
+    exact = NumpyVectorIndex(dimension=vectors.shape[1])
+    exact.upsert([{"id": str(row), "values": vector} for row, vector in enumerate(vectors)])
+
+    def timed(index):
+        latencies = []
+        results = []
+        for query in queries:
+            started = time.perf_counter()
+            results.append([match.id for match in index.query(query, top_k, include_metadata=False)])
+            latencies.append(time.perf_counter() - started)
+        return results, latencies
+
+    truth, exact_latencies = timed(exact)
+    rows = [{
+        "quantization": "exact",
+        "rerank": None,
+        "bytes_per_vector": vectors.shape[1] * 4,
+        "recall": 1.0,
+        "mean_ms": round(statistics.mean(exact_latencies) * 1000, 3),
+        "p95_ms": round(float(np.percentile(exact_latencies, 95)) * 1000, 3),
+    }]
+
+    scratch = tempfile.mkdtemp(dir=workdir)
+    try:
+        built = {}
+        for quantization, rerank in settings:
+            path = os.path.join(scratch, quantization)
+            if quantization not in built:
+                started = time.perf_counter()
+                index = QuantizedVectorIndex(path, dimension=vectors.shape[1], quantization=quantization)
+                index.upsert([{"id": str(row), "values": vector} for row, vector in enumerate(vectors)])
+                index.merge()
+                built[quantization] = time.perf_counter() - started
+            index = QuantizedVectorIndex(path, dimension=vectors.shape[1], quantization=quantization, rerank=rerank)
+            results, latencies = timed(index)
+            recall = statistics.mean(
+                len(set(found) & set(expected)) / len(expected) for found, expected in zip(results, truth)
+            )
+            rows.append({
+                "quantization": quantization,
+                "rerank": rerank,
+                "bytes_per_vector": index.code_bytes(),
+                "recall": round(recall, 4),
+                "mean_ms": round(statistics.mean(latencies) * 1000, 3),
+                "p95_ms": round(float(np.percentile(latencies, 95)) * 1000, 3),
+                "build_seconds": round(built[quantization], 2),
+            })
+    finally:
+        shutil.rmtree(scratch, ignore_errors=True)
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Recall@k vs latency of quantized vector search against exact search")
+    parser.add_argument("--index-path", default=None,
+                        help="Directory of a numpy/quantized index to take vectors from (default: synthetic)")
+    parser.add_argument("--vectors", type=int, default=50000, help="Synthetic corpus size")
+    parser.add_argument("--dimension", type=int, default=DIMENSION)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--quantization", default="float16,int8,pq", help="Comma-separated codecs")
+    parser.add_argument("--rerank", default="1,10,50", help="Comma-separated re-rank depths (x top_k)")
+    parser.add_argument("--output", default=None, help="Where to write the JSON report")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(1)
+    if args.index_path:
+        vectors = np.load(os.path.join(args.index_path, "vectors.npy")).astype(np.float32)
+    else:
+        vectors = clustered_vectors(args.vectors, args.dimension)
+    # Queries are perturbed corpus vectors, like questions phrased close to a stored chunk
+    picks = rng.choice(len(vectors), min(args.queries, len(vectors)), replace=False)
+    queries = vectors[picks] + 0.05 * rng.standard_normal((picks.size, vectors.shape[1])).astype(np.float32)
+
+    settings = [
+        (name.strip(), int(rerank))
+        for name in args.quantization.split(",") if name.strip()
+        for rerank in args.rerank.split(",") if rerank.strip()
+    ]
+    print(f"Comparing {len(settings)} settings on {len(vectors)} vectors, {len(queries)} queries, recall@{args.top_k}")
+    rows = recall_report(vectors, queries, args.top_k, settings)
+
+    print(f"\n{'quantization':<13}{'rerank':>7}{'bytes/vec':>11}{'recall':>9}{'mean ms':>10}{'p95 ms':>10}")
+    for row in rows:
+        print(f"{row['quantization']:<13}{str(row['rerank'] or '-'):>7}{row['bytes_per_vector']:>11}"
+              f"{row['recall']:>9.4f}{row['mean_ms']:>10.3f}{row['p95_ms']:>10.3f}")
+
+    output = args.output or os.path.join(
+        ".cache", "benchmarks", f"quantization-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+    )
+    directory = os.path.dirname(output)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump({
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "vectors": len(vectors),
+            "dimension": int(vectors.shape[1]),
+            "queries": len(queries),
+            "top_k": args.top_k,
+            "results": rows,
+        }, f, indent=2)
+    print(f"\nReport written to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,182 +1,767 @@
 import os
-from neo4j import GraphDatabase
-from pinecone import Pinecone
+import re
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from neo4j_driver import get_driver, pool_stats
 from openai import OpenAI
 from dotenv import load_dotenv
+from embeddings import Embedder, RateLimiter, count_tokens
+from embedding_cache import get_default_cache
+from chunk_store import get_default_chunk_store
+from metadata_filters import combine_filters, date_range_in_text, metadata_filter
+from vector_index import get_vector_index
+from keyword_extractor import KeywordExtractor
+from database import (
+    DISCUSSION_FULLTEXT_INDEX, KEY_PEOPLE_QUERY, TOPIC_OVERVIEW_QUERY, ensure_schema, fulltext_query
+)
+from gazetteer import get_default_gazetteer
+from answer_cache import SemanticAnswerCache
+from context_builder import ContextBuilder
+from hybrid_retriever import HybridRetriever
+from micro_batching import MicroBatcher, embedding_handler, vector_query_handler
+import corpus_version
+from instrumentation import trace, span, propagate, summarize_profile, total_db_hits
 import json
 
 # Load environment variables
 load_dotenv()
 
+# Streamed items a worker thread may get ahead of its async consumer
+STREAM_BUFFER = 64
+
+# Full-text search over discussion points with a bounded walk back along NEXT;
+# the walk length is interpolated because path patterns cannot take a parameter
+GRAPH_SEARCH_QUERY = """
+    // Find discussion points ranked by full-text relevance
+    CALL db.index.fulltext.queryNodes($index, $search, {limit: $limit})
+    YIELD node AS discussion, score
+    MATCH (meeting:Meeting)-[:HAS_POINT]->(discussion)
+
+    // Get related topics
+    OPTIONAL MATCH (topic:Topic)-[:DISCUSSED_IN]->(discussion)
+
+    // Get people mentioned
+    OPTIONAL MATCH (person:Person)-[:MENTIONED_IN]->(discussion)
+
+    // Collect all context
+    WITH discussion, meeting, score,
+         collect(DISTINCT topic.name) as topics,
+         collect(DISTINCT person.name) as people
+
+    // Walk back a bounded number of points along the NEXT chain
+    CALL {
+        WITH discussion
+        OPTIONAL MATCH path = (previous:DiscussionPoint)-[:NEXT*1..%d]->(discussion)
+        WITH previous, length(path) AS distance
+        ORDER BY distance DESC
+        RETURN collect(previous.content) AS prior_context
+    }
+
+    RETURN discussion.id as id,
+           discussion.timestamp as timestamp,
+           discussion.content as content,
+           meeting.title as meeting_title,
+           topics,
+           people,
+           prior_context,
+           score
+    ORDER BY score DESC
+"""
+
+SYSTEM_PROMPT = """You are an AI assistant helping to analyze meeting notes and discussions.
+        Use the provided context from both the vector store (semantic search) and graph database
+        to answer the question comprehensively. If there are any conflicts between sources,
+        point them out. If information is missing or unclear, acknowledge that."""
+
+# Questions answered from the materialized person/topic aggregates
+STAKEHOLDER_QUESTION = re.compile(
+    r"\b(stakeholders?|key (people|players|contributors|members)|participants|most active"
+    r"|who (is|are|was|were) (involved|participating))\b",
+    re.IGNORECASE
+)
+OVERVIEW_QUESTION = re.compile(
+    r"\b(overview|summar(y|ize|ise)|status|progress|history"
+    r"|who (is|are|was|were) (involved|working|responsible)|who (discussed|talked|worked))\b",
+    re.IGNORECASE
+)
+
+KEYWORD_PROMPT = "Extract key terms from the query that would be useful for searching in a graph database. Return them as a comma-separated list."
+
+
+def record_usage(attrs, response):
+    """Copy token usage from a chat completion onto a span"""
+    usage = getattr(response, 'usage', None)
+    if usage is not None:
+        attrs.update(prompt_tokens=usage.prompt_tokens, completion_tokens=usage.completion_tokens)
+
+
+def aggregate_lookups(user_query):
+    """Aggregate lookups a question calls for
+
+    ("people", None) for stakeholder questions, and ("topic", name) for each
+    gazetteer topic named in a stakeholder or overview question.
+    """
+    stakeholders = STAKEHOLDER_QUESTION.search(user_query)
+    if not stakeholders and not OVERVIEW_QUESTION.search(user_query):
+        return []
+    lookups = [("people", None)] if stakeholders else []
+    lookups.extend(("topic", name) for name in get_default_gazetteer().extract(user_query)[1])
+    return lookups
+
+
+def _seen(record):
+    if record.get('first_seen') and record.get('last_seen'):
+        return f" ({record['first_seen']} to {record['last_seen']})"
+    return ""
+
+
+def format_key_people(records):
+    """Summary line block for the most mentioned people"""
+    lines = ["Most mentioned people across all meetings:"]
+    for record in records:
+        line = f"- {record['name']}: {record['mentions']} discussion points in {record['meetings']} meetings{_seen(record)}"
+        if record['topics']:
+            line += f", mostly about {', '.join(record['topics'])}"
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def format_topic_overview(record):
+    """Summary line block for one topic: totals, main people and latest meetings"""
+    lines = [f"Topic {record['name']}: {record['mentions']} discussion points in {record['meetings']} meetings{_seen(record)}"]
+    if record['people']:
+        lines.append("Discussed most by: " + ", ".join(
+            f"{person['name']} ({person['mentions']} points in {person['meetings']} meetings)"
+            for person in record['people']
+        ))
+    if record['recent_meetings']:
+        lines.append("Latest meetings: " + ", ".join(
+            f"{meeting['title']} ({meeting['date']})" if meeting['date'] else meeting['title']
+            for meeting in record['recent_meetings']
+        ))
+    return "\n".join(lines)
+
+
+def build_messages(query, context):
+    """Chat messages carrying the assembled vector and graph context"""
+    # Prepare context from vector store
+    vector_context = "\nRelevant meeting notes:\n"
+    for text in context['vector']:
+        vector_context += f"- {text}\n"
+    
+    # Prepare context from graph database, led by any aggregate summaries
+    graph_context = ""
+    if context.get('summary'):
+        graph_context += "\nActivity summary:\n" + "\n".join(context['summary']) + "\n"
+    graph_context += "\nRelevant discussion points:\n"
+    for text in context['graph']:
+        graph_context += text + "\n"
+    
+    return [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": f"""Context from vector search:{vector_context}
+                                     \nContext from graph database:{graph_context}
+                                     \nQuestion: {query}"""}
+    ]
+
+
+def format_sources(retrieval):
+    """Source attributions for a retrieval, as returned to callers"""
+    return {
+        'vector_results': [
+            {
+                'content': match.metadata['content'],
+                'score': match.score,
+                'file': match.metadata.get('file_name') or match.metadata.get('meeting_title')
+            } for match in retrieval['vector_results']
+        ],
+        'graph_results': [
+            {
+                'meeting_title': record['meeting_title'],
+                'content': record['content'],
+                'topics': record['topics'],
+                'people': record['people'],
+                'score': record['score'],
+                'sources': record.get('sources', ['graph'])
+            } for record in retrieval['graph_results']
+        ],
+        'context': {
+            'tokens': retrieval['context']['tokens'],
+            'budget': retrieval['context']['budget'],
+            'dropped': retrieval['context']['dropped'],
+            'summary': retrieval['context'].get('summary', [])
+        },
+        'degraded': retrieval['degraded']
+    }
+
+
+def parse_keywords(text):
+    return [term.strip().lower() for term in text.split(',')]
+
+
 class RAGSystem:
-    def __init__(self):
-        # Initialize Neo4j connection
-        self.neo4j_uri = os.getenv('NEO4J_URI')
-        self.neo4j_user = os.getenv('NEO4J_USER')
-        self.neo4j_password = os.getenv('NEO4J_PASSWORD')
+    def __init__(self, driver=None, openai_client=None, index=None, embedder=None, batching=None,
+                 chunk_store=None):
+        # Services default to the configured ones; pass them in to run against other backends
+        # Share the process-wide, lazily connected Neo4j driver
         self.neo4j_database = os.getenv('NEO4J_DATABASE')
+        self.driver = driver if driver is not None else get_driver()
         
-        self.driver = GraphDatabase.driver(
-            self.neo4j_uri,
-            auth=(self.neo4j_user, self.neo4j_password)
+        # Initialize OpenAI client
+        self.openai_client = openai_client if openai_client is not None else OpenAI()
+        self.embedder = embedder if embedder is not None else Embedder(
+            self.openai_client, cache=get_default_cache()
         )
         
-        # Initialize OpenAI client
-        self.openai_client = OpenAI()
+        # Open the configured vector index backend
+        self.index = index if index is not None else get_vector_index("meeting-analysis")
+        
+        # Matched chunk texts are read locally once the top-k ids are known
+        self.chunk_store = chunk_store if chunk_store is not None else get_default_chunk_store()
+        
+        # Relative periods in questions ("last month") pre-filter the vector search by meeting date
+        self.date_filters = os.getenv('RAG_DATE_FILTERS', 'true').lower() == 'true'
+        
+        # Stakeholder and topic-overview questions also read the materialized aggregates
+        self.aggregate_lookups = os.getenv('RAG_AGGREGATE_LOOKUPS', 'true').lower() == 'true'
+        
+        # Prompt context is deduplicated across sources and capped at a token budget
+        self.context_builder = ContextBuilder(
+            token_budget=int(os.getenv('RAG_CONTEXT_TOKEN_BUDGET', '3000')),
+            duplicate_threshold=float(os.getenv('RAG_CONTEXT_DUPLICATE_THRESHOLD', '0.8'))
+        )
+        
+        # "hybrid" fuses vector and graph results into one ranking; "separate" keeps two lists
+        self.retrieval_mode = os.getenv('RAG_RETRIEVAL_MODE', 'hybrid')
+        self.hybrid_retriever = HybridRetriever(
+            self.driver,
+            self.neo4j_database,
+            top_n=int(os.getenv('RAG_HYBRID_TOP_N', '8'))
+        )
+        
+        # Number of preceding discussion points returned as context for each graph match
+        self.context_window = int(os.getenv('RAG_CONTEXT_WINDOW', '2'))
+        
+        # Keywords come from the graph's own vocabulary ("local") or from GPT-4 ("llm")
+        self.keyword_mode = os.getenv('RAG_KEYWORD_MODE', 'local')
+        self.keyword_extractor = KeywordExtractor(
+            self.driver,
+            self.neo4j_database,
+            refresh_interval=float(os.getenv('KEYWORD_REFRESH_INTERVAL', '30'))
+        )
+        
+        # Retrieval branches run concurrently, each bounded by its own timeout (seconds)
+        self.executor = ThreadPoolExecutor(max_workers=int(os.getenv('RAG_RETRIEVAL_WORKERS', '8')))
+        self.stage_timeouts = {
+            'vector': float(os.getenv('RAG_VECTOR_TIMEOUT', '10')),
+            'graph': float(os.getenv('RAG_GRAPH_TIMEOUT', '20'))
+        }
+        
+        # Answers to semantically equivalent questions are reused until the corpus changes
+        self.answer_cache = SemanticAnswerCache(
+            threshold=float(os.getenv('RAG_ANSWER_CACHE_THRESHOLD', '0.97')),
+            ttl=float(os.getenv('RAG_ANSWER_CACHE_TTL', '3600')),
+            max_entries=int(os.getenv('RAG_ANSWER_CACHE_SIZE', '512'))
+        )
+        
+        # Chat completions share one request and token budget (OPENAI_CHAT_RPM / OPENAI_CHAT_TPM)
+        self.chat_limiter = RateLimiter.from_env("OPENAI_CHAT")
+        
+        # Questions answered at once by query_many
+        self.max_concurrency = int(os.getenv('RAG_QUERY_MANY_CONCURRENCY', '8'))
         
-        # Initialize Pinecone
-        self.pc = Pinecone(api_key=os.getenv('PINECONE_API_KEY'))
-        self.index = self.pc.Index("meeting-analysis")
+        # Opt-in capture of the Neo4j PROFILE plan for every graph query
+        self.profile_graph = os.getenv('RAG_PROFILE_GRAPH', 'false').lower() == 'true'
+        
+        # Service mode: queries arriving within a few milliseconds of each other share
+        # one embeddings request and one batched vector search
+        if batching is None:
+            batching = os.getenv('RAG_MICRO_BATCHING', 'false').lower() == 'true'
+        self.embedding_batcher = None
+        self.vector_batcher = None
+        if batching:
+            max_batch_size = int(os.getenv('RAG_BATCH_MAX_SIZE', '32'))
+            max_wait = float(os.getenv('RAG_BATCH_MAX_WAIT_MS', '5')) / 1000
+            self.embedding_batcher = MicroBatcher(
+                embedding_handler(self.embedder), max_batch_size, max_wait, name="embedding-batcher"
+            )
+            self.vector_batcher = MicroBatcher(
+                vector_query_handler(self.index), max_batch_size, max_wait, name="vector-batcher"
+            )
 
     def close(self):
-        self.driver.close()
+        # The shared driver outlives this instance and is closed at interpreter exit
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        for batcher in (self.embedding_batcher, self.vector_batcher):
+            if batcher is not None:
+                batcher.close()
+
+    def batching_stats(self):
+        """Batches dispatched and queries coalesced by each micro-batcher, when enabled"""
+        return {
+            name: dict(batcher.stats)
+            for name, batcher in (('embedding', self.embedding_batcher), ('vector', self.vector_batcher))
+            if batcher is not None
+        }
+
+    def pool_stats(self):
+        return pool_stats()
 
     def get_embedding(self, text):
-        """Get embeddings for a piece of text using OpenAI's API"""
-        response = self.openai_client.embeddings.create(
-            input=text,
-            model="text-embedding-ada-002"
-        )
-        return response.data[0].embedding
+        """Get embeddings for a piece of text, served from the local cache when possible"""
+        with span("embedding", tokens=count_tokens(text), batched=self.embedding_batcher is not None):
+            if self.embedding_batcher is not None:
+                return self.embedding_batcher.submit(text)
+            return self.embedder.embed_one(text)
 
-    def query_vector_store(self, query_text, top_k=3):
-        """Query the vector store for relevant chunks"""
+    def query_vector_store(self, query_text, top_k=3, filter=None, query_embedding=None,
+                           file_name=None, date_from=None, date_to=None):
+        """Query the vector store for relevant chunks
+
+        `file_name`, `date_from` and `date_to` (dates or YYYY-MM-DD strings)
+        are applied by the index before ranking, together with any raw
+        Pinecone-style `filter`.
+        """
+        filter = combine_filters(filter, metadata_filter(file_name, date_from=date_from, date_to=date_to))
+        
         # Get embedding for the query
-        query_embedding = self.get_embedding(query_text)
+        if query_embedding is None:
+            query_embedding = self.get_embedding(query_text)
         
-        # Query Pinecone
-        results = self.index.query(
-            vector=query_embedding,
-            top_k=top_k,
-            include_metadata=True
-        )
+        # Query the vector index
+        with span("vector_query", top_k=top_k, filter=filter, batched=self.vector_batcher is not None) as attrs:
+            if self.vector_batcher is not None:
+                matches = self.vector_batcher.submit((query_embedding, top_k, filter))
+            else:
+                matches = self.index.query(
+                    vector=query_embedding,
+                    top_k=top_k,
+                    filter=filter,
+                    include_metadata=True
+                )
+            attrs["results"] = len(matches)
         
-        return results.matches
+        with span("chunk_fetch", ids=len(matches)):
+            return self.chunk_store.attach(matches)
 
-    def query_graph_database(self, keywords):
-        """Query the graph database for relevant discussions"""
-        with self.driver.session(database=self.neo4j_database) as session:
-            result = session.run("""
-                // Find discussion points
-                MATCH (meeting:Meeting)-[:HAS_POINT]->(discussion:DiscussionPoint)
-                WHERE any(keyword IN $keywords 
-                    WHERE toLower(discussion.content) CONTAINS keyword)
-                
-                // Get related topics
-                OPTIONAL MATCH (topic:Topic)-[:DISCUSSED_IN]->(discussion)
-                
-                // Get people mentioned
-                OPTIONAL MATCH (person:Person)-[:MENTIONED_IN]->(discussion)
-                
-                // Get adjacent discussion points for context
-                OPTIONAL MATCH (meeting)-[:HAS_POINT]->(adjacent:DiscussionPoint)
-                WHERE adjacent.timestamp < discussion.timestamp
-                
-                // Collect all context
-                WITH discussion, meeting,
-                     collect(DISTINCT topic.name) as topics,
-                     collect(DISTINCT person.name) as people,
-                     collect(DISTINCT adjacent.content) as prior_context
-                
-                RETURN discussion.timestamp as timestamp,
-                       discussion.content as content,
-                       meeting.title as meeting_title,
-                       topics,
-                       people,
-                       prior_context
-                ORDER BY timestamp
-            """, keywords=keywords)
+    def query_graph_database(self, keywords, limit=20, context_window=None):
+        """Query the graph database for relevant discussions via the full-text index
+
+        Each match carries up to ``context_window`` preceding discussion points.
+        """
+        search = fulltext_query(keywords)
+        if not search:
+            return []
+        ensure_schema(self.driver, self.neo4j_database)
+        # Interpolated into the path pattern, which cannot take a parameter
+        context_window = max(1, int(context_window or self.context_window))
+        
+        with span("graph_query", keywords=len(keywords), profiled=self.profile_graph) as attrs, \
+                self.driver.session(database=self.neo4j_database) as session:
+            result = session.run(
+                ("PROFILE " if self.profile_graph else "") + GRAPH_SEARCH_QUERY % context_window,
+                index=DISCUSSION_FULLTEXT_INDEX, search=search, limit=limit
+            )
             
-            return list(result)
+            records = list(result)
+            attrs["results"] = len(records)
+            if self.profile_graph:
+                plan = summarize_profile(getattr(result.consume(), 'profile', None))
+                attrs.update(profile=plan, db_hits=total_db_hits(plan))
+            return records
+
+    def search_aggregates(self, lookups):
+        """Summary blocks for the given aggregate_lookups, each a single indexed lookup"""
+        summaries = []
+        with span("aggregate_query", lookups=len(lookups)) as attrs, \
+                self.driver.session(database=self.neo4j_database) as session:
+            for kind, name in lookups:
+                if kind == "people":
+                    records = session.run(KEY_PEOPLE_QUERY, limit=10, per_person=3).data()
+                    if records:
+                        summaries.append(format_key_people(records))
+                else:
+                    record = session.run(TOPIC_OVERVIEW_QUERY, name=name, limit=5).single()
+                    # Topics ingested before the aggregates existed have no totals yet
+                    if record is not None and record['mentions'] is not None:
+                        summaries.append(format_topic_overview(record.data()))
+            attrs["results"] = len(summaries)
+        return summaries
+
+    def acquire_chat(self, messages, max_tokens):
+        """Wait for room in the chat rate limit for a request of this size"""
+        self.chat_limiter.acquire(sum(count_tokens(message["content"]) for message in messages) + max_tokens)
+
+    def build_context(self, vector_results, graph_results, summary=()):
+        """Deduplicated, ranked context from both sources that fits the token budget"""
+        return self.context_builder.build(vector_results, graph_results, summary)
+
+    def build_messages(self, query, vector_results, graph_results, context=None):
+        """Build the chat messages carrying both vector and graph context"""
+        if context is None:
+            context = self.build_context(vector_results, graph_results)
+        return build_messages(query, context)
 
-    def generate_response(self, query, vector_results, graph_results):
+    def generate_response(self, query, vector_results, graph_results, context=None):
         """Generate a response using OpenAI's API with both vector and graph context"""
-        # Prepare context from vector store
-        vector_context = "\nRelevant meeting notes:\n"
-        for match in vector_results:
-            vector_context += f"- {match.metadata['content']}\n"
-        
-        # Prepare context from graph database
-        graph_context = "\nRelevant discussion points:\n"
-        for record in graph_results:
-            graph_context += f"Meeting: {record['meeting_title']}\n"
-            graph_context += f"Content: {record['content']}\n"
-            if record['topics']:
-                graph_context += f"Topics: {', '.join(record['topics'])}\n"
-            if record['people']:
-                graph_context += f"People involved: {', '.join(record['people'])}\n"
-            graph_context += "\n"
-        
-        # Combine all context
-        system_prompt = """You are an AI assistant helping to analyze meeting notes and discussions.
-        Use the provided context from both the vector store (semantic search) and graph database
-        to answer the question comprehensively. If there are any conflicts between sources,
-        point them out. If information is missing or unclear, acknowledge that."""
+        messages = self.build_messages(query, vector_results, graph_results, context)
+        with span("generation", model="gpt-4") as attrs:
+            self.acquire_chat(messages, 1000)
+            response = self.openai_client.chat.completions.create(
+                model="gpt-4",
+                messages=messages,
+                temperature=0.7,
+                max_tokens=1000
+            )
+            record_usage(attrs, response)
+            return response.choices[0].message.content
+
+    def generate_response_stream(self, query, vector_results, graph_results, context=None):
+        """Yield the response text piece by piece as the model produces it"""
+        messages = self.build_messages(query, vector_results, graph_results, context)
+        with span("generation", model="gpt-4", streamed=True) as attrs:
+            started = time.perf_counter()
+            self.acquire_chat(messages, 1000)
+            stream = self.openai_client.chat.completions.create(
+                model="gpt-4",
+                messages=messages,
+                temperature=0.7,
+                max_tokens=1000,
+                stream=True
+            )
+            
+            # Streamed responses carry no usage, so count tokens locally
+            pieces = []
+            try:
+                for chunk in stream:
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        if not pieces:
+                            attrs["first_token_ms"] = round((time.perf_counter() - started) * 1000, 3)
+                        pieces.append(chunk.choices[0].delta.content)
+                        yield chunk.choices[0].delta.content
+            finally:
+                # Closing the HTTP stream stops generation when the consumer goes away early
+                stream.close()
+            attrs["prompt_tokens"] = sum(count_tokens(message["content"]) for message in messages)
+            attrs["completion_tokens"] = count_tokens("".join(pieces))
+
+    async def _iterate_in_thread(self, generator_function, *args, **kwargs):
+        """Drive a blocking generator on a worker thread and re-yield its items asynchronously
+
+        The thread stays at most STREAM_BUFFER items ahead of the consumer
+        and closes the generator as soon as the consumer stops iterating.
+        """
+        loop = asyncio.get_running_loop()
+        queue = asyncio.Queue()
+        finished = object()
+        slots = threading.Semaphore(STREAM_BUFFER)
+        stop = threading.Event()
         
-        # Generate response
-        response = self.openai_client.chat.completions.create(
-            model="gpt-4",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": f"""Context from vector search:{vector_context}
-                                             \nContext from graph database:{graph_context}
-                                             \nQuestion: {query}"""}
-            ],
-            temperature=0.7,
-            max_tokens=1000
-        )
+        def produce():
+            generator = generator_function(*args, **kwargs)
+            try:
+                for item in generator:
+                    while not slots.acquire(timeout=0.1):
+                        if stop.is_set():
+                            return
+                    if stop.is_set():
+                        return
+                    loop.call_soon_threadsafe(queue.put_nowait, item)
+            except Exception as e:
+                if not stop.is_set():
+                    loop.call_soon_threadsafe(queue.put_nowait, e)
+            finally:
+                generator.close()
+                if not stop.is_set():
+                    loop.call_soon_threadsafe(queue.put_nowait, finished)
         
-        return response.choices[0].message.content
-
-    def query(self, user_query):
-        """Main query method that combines vector and graph search"""
+        # The default executor keeps this off the retrieval pool the generator itself uses
+        producer = loop.run_in_executor(None, produce)
         try:
-            # Get relevant chunks from vector store
-            vector_results = self.query_vector_store(user_query)
-            
-            # Extract keywords for graph search
-            # Use OpenAI to extract key terms from the query
+            while True:
+                item = await queue.get()
+                if item is finished:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                slots.release()
+                yield item
+            await producer
+        finally:
+            stop.set()
+
+    def agenerate_response_stream(self, query, vector_results, graph_results, context=None):
+        """Async iterator variant of generate_response_stream"""
+        return self._iterate_in_thread(
+            self.generate_response_stream, query, vector_results, graph_results, context
+        )
+
+    def extract_keywords(self, user_query):
+        """Extract key terms from the query for graph search"""
+        with span("keyword_extraction", mode=self.keyword_mode) as attrs:
+            if self.keyword_mode == 'local':
+                keywords = self.keyword_extractor.extract(user_query)
+                # Fall back to the LLM while the graph vocabulary is empty
+                if keywords or not self.keyword_extractor.empty:
+                    attrs["keywords"] = len(keywords)
+                    return keywords
+            keywords = self.extract_keywords_llm(user_query)
+            attrs["keywords"] = len(keywords)
+            return keywords
+
+    def extract_keywords_llm(self, user_query):
+        """Use OpenAI to extract key terms from the query for graph search"""
+        messages = [
+            {"role": "system", "content": KEYWORD_PROMPT},
+            {"role": "user", "content": user_query}
+        ]
+        with span("keyword_llm", model="gpt-4") as attrs:
+            self.acquire_chat(messages, 100)
             keyword_extraction = self.openai_client.chat.completions.create(
                 model="gpt-4",
-                messages=[
-                    {"role": "system", "content": "Extract key terms from the query that would be useful for searching in a graph database. Return them as a comma-separated list."},
-                    {"role": "user", "content": user_query}
-                ],
+                messages=messages,
                 temperature=0.3
             )
-            
-            keywords = [term.strip().lower() for term in keyword_extraction.choices[0].message.content.split(',')]
-            
-            # Get relevant discussions from graph database
-            graph_results = self.query_graph_database(keywords)
-            
-            # Generate final response
-            response = self.generate_response(user_query, vector_results, graph_results)
-            
-            return {
-                'response': response,
-                'vector_results': [
-                    {
-                        'content': match.metadata['content'],
-                        'score': match.score,
-                        'file': match.metadata['file_name']
-                    } for match in vector_results
-                ],
-                'graph_results': [
-                    {
-                        'meeting_title': record['meeting_title'],
-                        'content': record['content'],
-                        'topics': record['topics'],
-                        'people': record['people']
-                    } for record in graph_results
-                ]
-            }
-            
+            record_usage(attrs, keyword_extraction)
+        
+        return parse_keywords(keyword_extraction.choices[0].message.content)
+
+    def search_graph(self, user_query):
+        """Extract keywords from the query and search the graph database with them"""
+        return self.query_graph_database(self.extract_keywords(user_query))
+
+    def _collect(self, stage, future, deadline, degraded):
+        """Wait for a retrieval branch until its deadline, degrading to no results"""
+        try:
+            return future.result(timeout=max(0.0, deadline - time.monotonic()))
+        except FutureTimeoutError:
+            future.cancel()
+            print(f"{stage} retrieval timed out, continuing without it")
+            degraded[stage] = "timeout"
         except Exception as e:
-            return {
-                'error': str(e),
-                'response': f"An error occurred while processing your query: {str(e)}"
-            }
+            print(f"{stage} retrieval failed: {str(e)}")
+            degraded[stage] = str(e)
+        return []
+
+    def question_filter(self, user_query):
+        """Metadata pre-filter implied by the question, such as a date range for "last month" """
+        if not self.date_filters:
+            return None
+        period = date_range_in_text(user_query)
+        if period is None:
+            return None
+        return metadata_filter(date_from=period[0], date_to=period[1])
+
+    def _vector_stage(self, user_query, filter, query_embedding, use_cache, version):
+        """Embed the question, consult the semantic answer cache, then search the vector index
+
+        A cache hit skips the vector search and is returned under 'cached'.
+        """
+        if query_embedding is None:
+            query_embedding = self.get_embedding(user_query)
+        if use_cache:
+            with span("answer_cache") as attrs:
+                cached, similarity = self.answer_cache.lookup(query_embedding, version)
+                attrs["hit"] = cached is not None
+            if cached is not None:
+                return {'query_embedding': query_embedding, 'cached': cached, 'similarity': similarity}
+        matches = self.query_vector_store(user_query, filter=filter, query_embedding=query_embedding)
+        return {'query_embedding': query_embedding, 'cached': None, 'matches': matches}
+
+    def retrieve(self, user_query, stage_timeouts=None, use_cache=True, filter=None, query_embedding=None,
+                 executor=None):
+        """Run the retrieval stages for a query
+
+        The embedding plus vector search and the keyword extraction plus
+        graph search run concurrently; a branch that fails or exceeds its
+        timeout contributes no results instead of blocking the answer, and a
+        failed vector branch also skips the semantic answer cache. Returns a dict with the
+        raw results, or with a 'cached' answer when the semantic answer
+        cache already holds a close enough question for the current corpus.
+        Without an explicit `filter`, one is inferred from the question. A
+        precomputed `query_embedding` skips the embedding request.
+        Stakeholder and topic-overview questions also get summary lines from
+        the materialized aggregates, looked up alongside the graph search.
+        Branches run on `executor`, by default the shared retrieval pool.
+        """
+        executor = executor or self.executor
+        timeouts = dict(self.stage_timeouts, **(stage_timeouts or {}))
+        start = time.monotonic()
+        degraded = {}
+        if filter is None:
+            filter = self.question_filter(user_query)
+        
+        # The graph branch does not need the query embedding, so start it right away;
+        # propagate() keeps spans recorded on the pool threads in this query's trace
+        graph_future = executor.submit(propagate(self.search_graph), user_query)
+        lookups = aggregate_lookups(user_query) if self.aggregate_lookups else []
+        summary_future = executor.submit(propagate(self.search_aggregates), lookups) if lookups else None
+        
+        # Embedding, answer cache lookup and vector search form one stage under the vector
+        # deadline, so a slow embedding call degrades to a graph-only answer
+        version = corpus_version.current()
+        vector_future = executor.submit(
+            propagate(self._vector_stage), user_query, filter, query_embedding, use_cache, version
+        )
+        vector_stage = self._collect('vector', vector_future, start + timeouts['vector'], degraded) or None
+        query_embedding = vector_stage['query_embedding'] if vector_stage else None
+        if vector_stage and vector_stage['cached'] is not None:
+            graph_future.cancel()
+            if summary_future is not None:
+                summary_future.cancel()
+            cached = vector_stage['cached']
+            cached.update(cached=True, cache_similarity=vector_stage['similarity'])
+            return {'cached': cached}
+        vector_results = vector_stage['matches'] if vector_stage else []
+        graph_results = self._collect('graph', graph_future, start + timeouts['graph'], degraded)
+        summary = []
+        if summary_future is not None:
+            summary = self._collect('summary', summary_future, start + timeouts['graph'], degraded)
+        
+        if self.retrieval_mode == 'hybrid' and (vector_results or graph_results):
+            try:
+                with span("fusion") as attrs:
+                    vector_results, graph_results = self.hybrid_retriever.fuse(vector_results, graph_results)
+                    attrs["results"] = len(vector_results) + len(graph_results)
+            except Exception as e:
+                print(f"hybrid fusion failed, using separate results: {str(e)}")
+                degraded['hybrid'] = str(e)
+        
+        with span("context") as attrs:
+            context = self.build_context(vector_results, graph_results, summary)
+            attrs.update(tokens=context['tokens'], dropped=len(context['dropped']))
+        
+        return {
+            'cached': None,
+            'query_embedding': query_embedding,
+            'version': version,
+            'vector_results': vector_results,
+            'graph_results': graph_results,
+            'context': context,
+            'degraded': degraded
+        }
+
+    def format_sources(self, retrieval):
+        """Source attributions for a retrieval, as returned to callers"""
+        return format_sources(retrieval)
+
+    def _remember(self, user_query, retrieval, result, use_cache):
+        # Only complete answers are worth repeating
+        if use_cache and not retrieval['degraded']:
+            self.answer_cache.store(user_query, retrieval['query_embedding'], retrieval['version'], result)
+
+    def query(self, user_query, stage_timeouts=None, use_cache=True, filter=None, query_embedding=None,
+              executor=None):
+        """Main query method that combines vector and graph search
+
+        The result carries per-stage 'timings' with token counts and result
+        sizes; they are also exported when RAG_TRACE_LOG or RAG_METRICS_PORT
+        is set. Answers to explicitly filtered queries are not cached.
+        """
+        use_cache = use_cache and filter is None
+        with trace("query") as run:
+            try:
+                retrieval = self.retrieve(user_query, stage_timeouts, use_cache, filter, query_embedding, executor)
+                if retrieval['cached'] is not None:
+                    return dict(retrieval['cached'], timings=run.summary())
+                
+                # Generate final response
+                response = self.generate_response(
+                    user_query, retrieval['vector_results'], retrieval['graph_results'], retrieval['context']
+                )
+                
+                result = {'response': response, **self.format_sources(retrieval), 'cached': False}
+                self._remember(user_query, retrieval, result, use_cache)
+                return dict(result, timings=run.summary())
+                
+            except Exception as e:
+                return {
+                    'error': str(e),
+                    'response': f"An error occurred while processing your query: {str(e)}",
+                    'timings': run.summary()
+                }
+
+    def query_many(self, questions, max_concurrency=None, stage_timeouts=None, use_cache=True, filter=None):
+        """Answer several questions at once; results come back in input order
+
+        All questions are embedded in one request, then up to
+        `max_concurrency` (default RAG_QUERY_MANY_CONCURRENCY) run their
+        retrieval and generation side by side, with chat calls paced by the
+        shared chat rate limit. Each result is what query() returns.
+        """
+        questions = list(questions)
+        if not questions:
+            return []
+        
+        with trace("query_many"), span("embedding", texts=len(questions)):
+            try:
+                embeddings = self.embedder.embed(questions)
+            except Exception as e:
+                # Each question retries its own embedding and degrades on its own
+                print(f"Batch embedding failed, embedding questions one by one: {str(e)}")
+                embeddings = [None] * len(questions)
+        
+        # Each answer runs up to three retrieval branches at once. They get a pool sized
+        # for the whole batch, since stage deadlines would otherwise include time spent
+        # queued behind other questions on the shared retrieval pool
+        workers = max(1, min(max_concurrency or self.max_concurrency, len(questions)))
+        retrieval_pool = ThreadPoolExecutor(max_workers=3 * workers)
+        
+        def answer(question, embedding):
+            return self.query(question, stage_timeouts, use_cache, filter, embedding, retrieval_pool)
+        
+        try:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                return list(pool.map(answer, questions, embeddings))
+        finally:
+            # Branches abandoned at their deadline finish in the background
+            retrieval_pool.shutdown(wait=False, cancel_futures=True)
+
+    def query_stream(self, user_query, stage_timeouts=None, use_cache=True, filter=None):
+        """Streaming variant of query
+
+        Yields a 'sources' event with the attributions first, then 'token'
+        events as the answer is generated, and finally a 'done' event with
+        the full response and timings (or an 'error' event).
+        """
+        use_cache = use_cache and filter is None
+        with trace("query_stream") as run:
+            try:
+                retrieval = self.retrieve(user_query, stage_timeouts, use_cache, filter)
+                cached = retrieval['cached']
+                if cached is not None:
+                    yield {'type': 'sources', **{k: v for k, v in cached.items() if k != 'response'}}
+                    yield {'type': 'token', 'content': cached['response']}
+                    yield {'type': 'done', 'response': cached['response'], 'timings': run.summary()}
+                    return
+                
+                sources = self.format_sources(retrieval)
+                yield {'type': 'sources', **sources, 'cached': False}
+                
+                pieces = []
+                for piece in self.generate_response_stream(
+                    user_query, retrieval['vector_results'], retrieval['graph_results'], retrieval['context']
+                ):
+                    pieces.append(piece)
+                    yield {'type': 'token', 'content': piece}
+                
+                response = ''.join(pieces)
+                self._remember(user_query, retrieval, {'response': response, **sources, 'cached': False}, use_cache)
+                yield {'type': 'done', 'response': response, 'timings': run.summary()}
+                
+            except Exception as e:
+                yield {
+                    'type': 'error',
+                    'error': str(e),
+                    'response': f"An error occurred while processing your query: {str(e)}",
+                    'timings': run.summary()
+                }
+
+    def aquery_stream(self, user_query, stage_timeouts=None, use_cache=True, filter=None):
+        """Async iterator variant of query_stream"""
+        return self._iterate_in_thread(self.query_stream, user_query, stage_timeouts, use_cache, filter)
 
 def main():
     # Initialize RAG system
@@ -190,13 +775,12 @@ def main():
             "Who are the key stakeholders involved?"
         ]
         
-        for query in example_queries:
+        results = rag.query_many(example_queries)
+        for query, result in zip(example_queries, results):
             print(f"\nQuery: {query}")
             print("-" * 80)
             
-            result = rag.query(query)
-            
-            print("\nResponse:")
+            print("\nResponse:" + (" (from cache)" if result.get('cached') else ""))
             print(result['response'])
             
             print("\nSources:")
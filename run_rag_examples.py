@@ -1,9 +1,28 @@
-from graph_rag import GraphRAG
+from rag_with_vectors import RAGSystem
 from datetime import datetime
 import os
 
+SECTIONS = [
+    ("Integration Framework Analysis",
+     "What are the phases of the integration framework that were discussed?"),
+    ("System Design Analysis",
+     "What was discussed about the system design and who is responsible for it?"),
+    ("Action Items from the Meeting",
+     "What are the action items from the meeting, and who owns each of them?"),
+    ("Project Management Analysis",
+     "Who is the project manager and what are their responsibilities?"),
+    ("Technical Implementation Details",
+     "What were the key technical decisions and implementation details discussed about Neo4j integration?"),
+    ("Team Member Contributions",
+     "What were the main contributions and responsibilities discussed for each team member?"),
+    ("Timeline and Milestones",
+     "What are the key milestones and timeline expectations discussed in the meeting?"),
+    ("Challenges and Solutions",
+     "What challenges were identified during the meeting and what solutions were proposed?"),
+]
+
 def run_examples():
-    rag = GraphRAG()
+    rag = RAGSystem()
     
     # Create output directory if it doesn't exist
     output_dir = "meeting_analysis"
@@ -15,73 +34,20 @@ def run_examples():
     output_file = os.path.join(output_dir, f"meeting_analysis_{timestamp}.txt")
     
     try:
+        # All questions are embedded in one request and answered concurrently
+        results = rag.query_many([question for _, question in SECTIONS])
+        
         with open(output_file, 'w', encoding='utf-8') as f:
             # Write header
             f.write("Meeting Notes Analysis\n")
             f.write("=" * 50 + "\n")
             f.write(f"Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
             
-            # Example 1: Query about Integration Framework
-            f.write("\n1. Integration Framework Analysis\n")
-            f.write("-" * 30 + "\n")
-            question = "What are the phases of the integration framework that were discussed?"
-            f.write(f"Q: {question}\n")
-            answer = rag.generate_response(question)
-            f.write(f"A: {answer}\n")
-            
-            # Example 2: Query about System Design
-            f.write("\n2. System Design Analysis\n")
-            f.write("-" * 30 + "\n")
-            question = "What was discussed about the system design and who is responsible for it?"
-            f.write(f"Q: {question}\n")
-            answer = rag.generate_response(question)
-            f.write(f"A: {answer}\n")
-            
-            # Example 3: Get Action Items
-            f.write("\n3. Action Items from the Meeting\n")
-            f.write("-" * 30 + "\n")
-            action_items = rag.get_action_items()
-            f.write(action_items + "\n")
-            
-            # Example 4: Project Management
-            f.write("\n4. Project Management Analysis\n")
-            f.write("-" * 30 + "\n")
-            question = "Who is the project manager and what are their responsibilities?"
-            f.write(f"Q: {question}\n")
-            answer = rag.generate_response(question)
-            f.write(f"A: {answer}\n")
-            
-            # Example 5: Technical Implementation Details
-            f.write("\n5. Technical Implementation Details\n")
-            f.write("-" * 30 + "\n")
-            question = "What were the key technical decisions and implementation details discussed about Neo4j integration?"
-            f.write(f"Q: {question}\n")
-            answer = rag.generate_response(question)
-            f.write(f"A: {answer}\n")
-            
-            # Example 6: Team Contributions
-            f.write("\n6. Team Member Contributions\n")
-            f.write("-" * 30 + "\n")
-            question = "What were the main contributions and responsibilities discussed for each team member?"
-            f.write(f"Q: {question}\n")
-            answer = rag.generate_response(question)
-            f.write(f"A: {answer}\n")
-            
-            # Example 7: Timeline and Milestones
-            f.write("\n7. Timeline and Milestones\n")
-            f.write("-" * 30 + "\n")
-            question = "What are the key milestones and timeline expectations discussed in the meeting?"
-            f.write(f"Q: {question}\n")
-            answer = rag.generate_response(question)
-            f.write(f"A: {answer}\n")
-            
-            # Example 8: Challenges and Solutions
-            f.write("\n8. Challenges and Solutions\n")
-            f.write("-" * 30 + "\n")
-            question = "What challenges were identified during the meeting and what solutions were proposed?"
-            f.write(f"Q: {question}\n")
-            answer = rag.generate_response(question)
-            f.write(f"A: {answer}\n")
+            for number, ((title, question), result) in enumerate(zip(SECTIONS, results), 1):
+                f.write(f"\n{number}. {title}\n")
+                f.write("-" * 30 + "\n")
+                f.write(f"Q: {question}\n")
+                f.write(f"A: {result['response']}\n")
             
             # Write footer
             f.write("\n" + "=" * 50 + "\n")
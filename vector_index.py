@@ -0,0 +1,598 @@
+import asyncio
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+DIMENSION = 1536  # dimensionality of text-embedding-ada-002
+
+
+class Match:
+    """A scored query result, shaped like Pinecone's ScoredVector"""
+
+    __slots__ = ("id", "score", "metadata")
+
+    def __init__(self, id, score, metadata=None):
+        self.id = id
+        self.score = score
+        self.metadata = metadata
+
+    def __repr__(self):
+        return f"Match(id={self.id!r}, score={self.score:.4f})"
+
+
+def _compare(value, operator, operand):
+    if operator == "$eq":
+        return value == operand
+    if operator == "$ne":
+        return value != operand
+    if operator == "$in":
+        return value in operand
+    if operator == "$nin":
+        return value not in operand
+    if value is None:
+        return False
+    if operator == "$gt":
+        return value > operand
+    if operator == "$gte":
+        return value >= operand
+    if operator == "$lt":
+        return value < operand
+    if operator == "$lte":
+        return value <= operand
+    raise ValueError(f"Unsupported filter operator: {operator}")
+
+
+def matches_filter(metadata, filter):
+    """Evaluate a Pinecone-style metadata filter against one metadata dict"""
+    if not filter:
+        return True
+    metadata = metadata or {}
+    for key, condition in filter.items():
+        if key == "$and":
+            if not all(matches_filter(metadata, clause) for clause in condition):
+                return False
+        elif key == "$or":
+            if not any(matches_filter(metadata, clause) for clause in condition):
+                return False
+        elif isinstance(condition, dict):
+            value = metadata.get(key)
+            if not all(_compare(value, op, operand) for op, operand in condition.items()):
+                return False
+        elif metadata.get(key) != condition:
+            return False
+    return True
+
+
+class VectorIndex:
+    """Common interface for the vector index backends"""
+
+    def upsert(self, vectors):
+        """Insert or replace vectors given as dicts with id, values and metadata"""
+        raise NotImplementedError
+
+    def query(self, vector, top_k=3, filter=None, include_metadata=True):
+        """Return the top_k matches for a query vector, best first"""
+        raise NotImplementedError
+
+    def query_batch(self, vectors, top_k=3, filter=None, include_metadata=True):
+        """Return the matches of several query vectors sharing one filter, in order"""
+        return [self.query(vector, top_k, filter, include_metadata) for vector in vectors]
+
+    def delete(self, ids):
+        raise NotImplementedError
+
+    def flush(self):
+        """Persist pending changes; a no-op for remote backends"""
+
+
+class PineconeVectorIndex(VectorIndex):
+    """Pinecone serverless index"""
+
+    def __init__(self, index_name, force_recreate=False, dimension=DIMENSION):
+        from pinecone import Pinecone, ServerlessSpec
+
+        pinecone_api_key = os.getenv('PINECONE_API_KEY')
+        pinecone_env = os.getenv('PINECONE_ENVIRONMENT')
+
+        if not pinecone_api_key or not pinecone_env:
+            raise ValueError("Pinecone API key and environment must be set in .env file")
+
+        print(f"Using Pinecone environment: {pinecone_env}")
+        self.pc = Pinecone(api_key=pinecone_api_key)
+        self.index_name = index_name
+        self.executor = None
+
+        try:
+            # Check if index exists
+            indexes = self.pc.list_indexes()
+
+            # Delete existing index if force_recreate is True
+            if self.index_name in indexes.names() and force_recreate:
+                print(f"Deleting existing index: {self.index_name}")
+                self.pc.delete_index(self.index_name)
+                # Wait a moment after deletion
+                time.sleep(10)
+
+            # Create new index if it doesn't exist
+            if self.index_name not in self.pc.list_indexes().names():
+                print(f"Creating new index: {self.index_name}")
+                self.pc.create_index(
+                    name=self.index_name,
+                    dimension=dimension,
+                    metric="cosine",
+                    spec=ServerlessSpec(
+                        cloud="aws",
+                        region="us-east-1"
+                    )
+                )
+                # Wait for index to be ready
+                print("Waiting for index to be ready...")
+                time.sleep(10)  # Initial wait
+                while not self.pc.describe_index(self.index_name).status['ready']:
+                    print("Still waiting for index to be ready...")
+                    time.sleep(5)
+            else:
+                print(f"Using existing index: {self.index_name}")
+
+            self.index = self.pc.Index(self.index_name)
+            print("Successfully connected to Pinecone index")
+
+        except Exception as e:
+            print(f"Error initializing Pinecone: {str(e)}")
+            raise
+
+    def upsert(self, vectors):
+        self.index.upsert(vectors=vectors)
+
+    def query(self, vector, top_k=3, filter=None, include_metadata=True):
+        results = self.index.query(
+            vector=vector,
+            top_k=top_k,
+            filter=filter,
+            include_metadata=include_metadata
+        )
+        return results.matches
+
+    def query_batch(self, vectors, top_k=3, filter=None, include_metadata=True):
+        # Pinecone has no multi-vector query, so the round-trips overlap instead
+        if len(vectors) <= 1:
+            return super().query_batch(vectors, top_k, filter, include_metadata)
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=int(os.getenv('PINECONE_QUERY_THREADS', '16')))
+        return list(self.executor.map(
+            lambda vector: self.query(vector, top_k, filter, include_metadata), vectors
+        ))
+
+    def delete(self, ids):
+        if ids:
+            self.index.delete(ids=list(ids))
+
+
+class NumpyVectorIndex(VectorIndex):
+    """In-process exact cosine search over a contiguous float32 matrix
+
+    Rows are L2-normalised on insert so a query is a single matrix-vector
+    product followed by a partial sort. When `path` is given the index is
+    loaded from and flushed to that directory.
+    """
+
+    def __init__(self, path=None, dimension=DIMENSION, force_recreate=False):
+        self.path = path
+        self.dimension = dimension
+        self.vectors = np.zeros((0, dimension), dtype=np.float32)
+        self.count = 0
+        self.ids = []
+        self.metadata = []
+        self.positions = {}
+
+        if path and not force_recreate and os.path.exists(os.path.join(path, "ids.json")):
+            self._load()
+
+    def _load(self):
+        with open(os.path.join(self.path, "ids.json"), 'r', encoding='utf-8') as f:
+            state = json.load(f)
+        vectors = np.load(os.path.join(self.path, "vectors.npy"))
+        self.ids = state["ids"]
+        self.metadata = state["metadata"]
+        self.count = len(self.ids)
+        self.vectors = np.ascontiguousarray(vectors[:self.count], dtype=np.float32)
+        self.positions = {id: row for row, id in enumerate(self.ids)}
+
+    def flush(self):
+        if not self.path:
+            return
+        os.makedirs(self.path, exist_ok=True)
+        np.save(os.path.join(self.path, "vectors.npy"), self.vectors[:self.count])
+        with open(os.path.join(self.path, "ids.json"), 'w', encoding='utf-8') as f:
+            json.dump({"ids": self.ids, "metadata": self.metadata}, f)
+
+    def __len__(self):
+        return self.count
+
+    @staticmethod
+    def _normalize(matrix):
+        norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return matrix / norms
+
+    def _reserve(self, rows):
+        if rows <= self.vectors.shape[0]:
+            return
+        capacity = max(rows, 2 * self.vectors.shape[0], 64)
+        grown = np.zeros((capacity, self.dimension), dtype=np.float32)
+        grown[:self.count] = self.vectors[:self.count]
+        self.vectors = grown
+
+    def upsert(self, vectors):
+        if not vectors:
+            return []
+        values = self._normalize(np.asarray([v["values"] for v in vectors], dtype=np.float32))
+        self._reserve(self.count + len(vectors))
+
+        rows = []
+        for vector, value in zip(vectors, values):
+            row = self.positions.get(vector["id"])
+            if row is None:
+                row = self.count
+                self.count += 1
+                self.ids.append(vector["id"])
+                self.metadata.append(None)
+                self.positions[vector["id"]] = row
+            self.vectors[row] = value
+            self.metadata[row] = vector.get("metadata") or {}
+            rows.append(row)
+        return rows
+
+    def delete(self, ids):
+        for id in ids:
+            row = self.positions.pop(id, None)
+            if row is None:
+                continue
+            # Swap the last row into the hole to keep the matrix contiguous
+            last = self.count - 1
+            if row != last:
+                self.vectors[row] = self.vectors[last]
+                self.ids[row] = self.ids[last]
+                self.metadata[row] = self.metadata[last]
+                self.positions[self.ids[row]] = row
+            self.ids.pop()
+            self.metadata.pop()
+            self.count -= 1
+
+    def _filter_mask(self, filter):
+        return np.fromiter(
+            (matches_filter(metadata, filter) for metadata in self.metadata),
+            dtype=bool,
+            count=self.count
+        )
+
+    def _top_k(self, scores, top_k):
+        if top_k >= scores.shape[0]:
+            order = np.argsort(-scores)
+        else:
+            candidates = np.argpartition(-scores, top_k)[:top_k]
+            order = candidates[np.argsort(-scores[candidates])]
+        return order
+
+    def _matches(self, rows, scores, include_metadata):
+        return [
+            Match(
+                self.ids[row],
+                float(score),
+                self.metadata[row] if include_metadata else None
+            )
+            for row, score in zip(rows, scores)
+        ]
+
+    def query(self, vector, top_k=3, filter=None, include_metadata=True):
+        if self.count == 0 or top_k <= 0:
+            return []
+        query = self._normalize(np.asarray(vector, dtype=np.float32))
+        scores = self.vectors[:self.count] @ query
+
+        if filter:
+            rows = np.flatnonzero(self._filter_mask(filter))
+            if rows.size == 0:
+                return []
+            order = rows[self._top_k(scores[rows], top_k)]
+        else:
+            order = self._top_k(scores, top_k)
+
+        return self._matches(order, scores[order], include_metadata)
+
+    def query_batch(self, vectors, top_k=3, filter=None, include_metadata=True):
+        """Score all query vectors in one matrix product"""
+        if self.count == 0 or top_k <= 0 or not len(vectors):
+            return [[] for _ in vectors]
+        queries = self._normalize(np.asarray(vectors, dtype=np.float32))
+
+        rows = None
+        matrix = self.vectors[:self.count]
+        if filter:
+            rows = np.flatnonzero(self._filter_mask(filter))
+            if rows.size == 0:
+                return [[] for _ in vectors]
+            matrix = matrix[rows]
+        scores = queries @ matrix.T
+
+        results = []
+        for query_scores in scores:
+            order = self._top_k(query_scores, top_k)
+            found = order if rows is None else rows[order]
+            results.append(self._matches(found, query_scores[order], include_metadata))
+        return results
+
+
+class HNSWVectorIndex(NumpyVectorIndex):
+    """Approximate search through an hnswlib graph for large corpora
+
+    Vectors and metadata are kept in the exact index as well, so small
+    indexes and heavily filtered queries fall back to exact search and
+    graph candidates are re-scored exactly. Deletes only mark graph nodes;
+    the graph is rebuilt once they exceed `rebuild_fraction` of the index.
+    Requires the `hnswlib` package.
+    """
+
+    def __init__(self, path=None, dimension=DIMENSION, force_recreate=False,
+                 m=16, ef_construction=200, ef_search=64, exact_threshold=10000,
+                 rebuild_fraction=0.2):
+        try:
+            import hnswlib
+        except ImportError:
+            raise ImportError("The hnsw vector index backend requires the hnswlib package")
+
+        self.hnswlib = hnswlib
+        self.m = m
+        self.ef_construction = ef_construction
+        self.ef_search = ef_search
+        self.exact_threshold = exact_threshold
+        self.rebuild_fraction = rebuild_fraction
+        super().__init__(path, dimension, force_recreate)
+        self._build_graph()
+
+    def _build_graph(self):
+        # Labels are stable per vector while rows move; a rebuild renumbers them as rows
+        self.graph = self.hnswlib.Index(space="ip", dim=self.dimension)
+        self.graph.init_index(
+            max_elements=max(1024, 2 * self.count),
+            ef_construction=self.ef_construction,
+            M=self.m
+        )
+        self.graph.set_ef(self.ef_search)
+        self.row_labels = list(range(self.count))
+        self.label_rows = {row: row for row in range(self.count)}
+        self.next_label = self.count
+        self.tombstones = 0
+        if self.count:
+            self.graph.add_items(self.vectors[:self.count], np.arange(self.count))
+
+    def _ensure_capacity(self, rows):
+        if rows > self.graph.get_max_elements():
+            self.graph.resize_index(max(rows, 2 * self.graph.get_max_elements()))
+
+    def _rows(self, labels):
+        return np.fromiter((self.label_rows[label] for label in labels), dtype=np.int64, count=len(labels))
+
+    def upsert(self, vectors):
+        rows = super().upsert(vectors)
+        if rows:
+            labels = []
+            for row in rows:
+                if row == len(self.row_labels):
+                    self.row_labels.append(self.next_label)
+                    self.label_rows[self.next_label] = row
+                    self.next_label += 1
+                # Existing labels are updated in place
+                labels.append(self.row_labels[row])
+            # Deleted labels keep their slots until the next rebuild
+            self._ensure_capacity(self.next_label)
+            self.graph.add_items(self.vectors[rows], np.asarray(labels))
+        return rows
+
+    def delete(self, ids):
+        for id in ids:
+            row = self.positions.get(id)
+            if row is None:
+                continue
+            label = self.row_labels[row]
+            self.graph.mark_deleted(label)
+            del self.label_rows[label]
+            # Mirror the exact index, which swaps the last row into the hole
+            moved = self.row_labels.pop()
+            if moved != label:
+                self.row_labels[row] = moved
+                self.label_rows[moved] = row
+            super().delete([id])
+            self.tombstones += 1
+        # Deleted nodes still slow graph walks, so compact once they pile up
+        if self.tombstones > max(1000, self.rebuild_fraction * self.count):
+            self._build_graph()
+
+    def query(self, vector, top_k=3, filter=None, include_metadata=True):
+        if self.count <= self.exact_threshold or top_k <= 0:
+            return super().query(vector, top_k, filter, include_metadata)
+
+        query = self._normalize(np.asarray(vector, dtype=np.float32))
+        candidates = top_k * (10 if filter else 2)
+        while True:
+            k = min(candidates, self.count)
+            self.graph.set_ef(max(self.ef_search, k))
+            labels, _ = self.graph.knn_query(query, k=k)
+            rows = self._rows(labels[0])
+            if filter:
+                rows = np.asarray(
+                    [row for row in rows if matches_filter(self.metadata[row], filter)],
+                    dtype=np.int64
+                )
+            if rows.size >= top_k or k == self.count:
+                break
+            candidates *= 4
+
+        if rows.size == 0:
+            return []
+        scores = self.vectors[rows] @ query
+        order = np.argsort(-scores)[:top_k]
+        return self._matches(rows[order], scores[order], include_metadata)
+
+    def query_batch(self, vectors, top_k=3, filter=None, include_metadata=True):
+        if self.count <= self.exact_threshold or top_k <= 0:
+            return super().query_batch(vectors, top_k, filter, include_metadata)
+        if filter:
+            # Filtered searches widen their candidate set query by query
+            return [self.query(vector, top_k, filter, include_metadata) for vector in vectors]
+
+        queries = self._normalize(np.asarray(vectors, dtype=np.float32))
+        k = min(top_k * 2, self.count)
+        self.graph.set_ef(max(self.ef_search, k))
+        labels, _ = self.graph.knn_query(queries, k=k)
+
+        results = []
+        for query, rows in zip(queries, (self._rows(row_labels) for row_labels in labels)):
+            scores = self.vectors[rows] @ query
+            order = np.argsort(-scores)[:top_k]
+            results.append(self._matches(rows[order], scores[order], include_metadata))
+        return results
+
+
+class AsyncVectorIndex:
+    """Awaitable facade over a local VectorIndex
+
+    The NumPy, HNSW and quantized backends search in-process, so calls run
+    on the default thread pool to keep large searches off the event loop;
+    callers bound how many run at once. Pinecone has a native async client,
+    see AsyncPineconeVectorIndex.
+    """
+
+    def __init__(self, index):
+        self.index = index
+
+    async def upsert(self, vectors):
+        return await asyncio.to_thread(self.index.upsert, vectors)
+
+    async def query(self, vector, top_k=3, filter=None, include_metadata=True):
+        return await asyncio.to_thread(
+            self.index.query, vector, top_k=top_k, filter=filter, include_metadata=include_metadata
+        )
+
+    async def query_batch(self, vectors, top_k=3, filter=None, include_metadata=True):
+        return await asyncio.to_thread(
+            self.index.query_batch, vectors, top_k=top_k, filter=filter, include_metadata=include_metadata
+        )
+
+    async def delete(self, ids):
+        return await asyncio.to_thread(self.index.delete, ids)
+
+    async def flush(self):
+        return await asyncio.to_thread(self.index.flush)
+
+    async def close(self):
+        # The wrapped index may be shared with synchronous callers
+        pass
+
+
+class AsyncPineconeVectorIndex:
+    """Pinecone index driven through PineconeAsyncio
+
+    Requests are awaited on the event loop's own HTTP connections, so an
+    in-flight query holds no thread. The index must already exist
+    (PineconeVectorIndex creates it); the client connects on first use,
+    since it is bound to the running event loop.
+    """
+
+    def __init__(self, index_name):
+        self.index_name = index_name
+        self.api_key = os.getenv('PINECONE_API_KEY')
+        if not self.api_key:
+            raise ValueError("Pinecone API key must be set in .env file")
+        self.pc = None
+        self.index = None
+        self.lock = asyncio.Lock()
+
+    async def _connect(self):
+        if self.index is not None:
+            return self.index
+        async with self.lock:
+            if self.index is None:
+                from pinecone import PineconeAsyncio
+
+                self.pc = PineconeAsyncio(api_key=self.api_key)
+                description = await self.pc.describe_index(self.index_name)
+                self.index = self.pc.IndexAsyncio(host=description.host)
+        return self.index
+
+    async def upsert(self, vectors):
+        index = await self._connect()
+        await index.upsert(vectors=vectors)
+
+    async def query(self, vector, top_k=3, filter=None, include_metadata=True):
+        index = await self._connect()
+        results = await index.query(
+            vector=vector,
+            top_k=top_k,
+            filter=filter,
+            include_metadata=include_metadata
+        )
+        return results.matches
+
+    async def query_batch(self, vectors, top_k=3, filter=None, include_metadata=True):
+        # Pinecone has no multi-vector query, so the requests overlap on the event loop
+        return list(await asyncio.gather(*(
+            self.query(vector, top_k, filter, include_metadata) for vector in vectors
+        )))
+
+    async def delete(self, ids):
+        if ids:
+            index = await self._connect()
+            await index.delete(ids=list(ids))
+
+    async def flush(self):
+        pass
+
+    async def close(self):
+        if self.index is not None:
+            await self.index.close()
+            await self.pc.close()
+            self.index = None
+            self.pc = None
+
+
+def get_vector_index(index_name="meeting-analysis", backend=None, force_recreate=False):
+    """Open the vector index selected by VECTOR_INDEX_BACKEND (pinecone, numpy, hnsw or quantized)"""
+    backend = (backend or os.getenv("VECTOR_INDEX_BACKEND", "pinecone")).lower()
+    if backend == "pinecone":
+        return PineconeVectorIndex(index_name, force_recreate=force_recreate)
+
+    path = os.path.join(os.getenv("VECTOR_INDEX_PATH", os.path.join(".cache", "vector_index")), index_name)
+    if backend == "numpy":
+        return NumpyVectorIndex(path, force_recreate=force_recreate)
+    if backend == "hnsw":
+        return HNSWVectorIndex(path, force_recreate=force_recreate)
+    if backend == "quantized":
+        from quantized_index import QuantizedVectorIndex
+        return QuantizedVectorIndex(
+            path,
+            force_recreate=force_recreate,
+            quantization=os.getenv("VECTOR_QUANTIZATION", "int8"),
+            rerank=int(os.getenv("VECTOR_RERANK", "10"))
+        )
+    raise ValueError(f"Unknown vector index backend: {backend}")
+
+
+def get_async_vector_index(index_name="meeting-analysis", backend=None, index=None):
+    """Awaitable vector index: native async for Pinecone, thread-offloaded for the local backends
+
+    An already opened synchronous `index` is wrapped the same way.
+    """
+    if isinstance(index, (AsyncVectorIndex, AsyncPineconeVectorIndex)):
+        return index
+    if isinstance(index, PineconeVectorIndex):
+        return AsyncPineconeVectorIndex(index.index_name)
+    if index is not None:
+        return AsyncVectorIndex(index)
+    backend = (backend or os.getenv("VECTOR_INDEX_BACKEND", "pinecone")).lower()
+    if backend == "pinecone":
+        return AsyncPineconeVectorIndex(index_name)
+    return AsyncVectorIndex(get_vector_index(index_name, backend))
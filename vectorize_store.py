@@ -1,188 +1,275 @@
 import os
-from pinecone import Pinecone, ServerlessSpec
+import hashlib
+import json
 from openai import OpenAI
 from datetime import datetime
 from dotenv import load_dotenv
-import time
+from embeddings import Embedder, RateLimiter
+from embedding_cache import get_default_cache
+from chunk_store import get_default_chunk_store
+from metadata_filters import date_number
+from chunking import StreamingChunker
+from vector_index import get_vector_index
+import corpus_version
+from instrumentation import trace, span
 
 # Load environment variables
 load_dotenv()
 
+# Bump whenever chunking or record metadata changes; files synced under an
+# older format are rewritten by the next sync even if their bytes are unchanged
+RECORD_FORMAT = 3
+
+
+def file_hash(file_path):
+    """SHA-256 of a file's bytes, read in blocks"""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def record_hash(text, metadata):
+    """Hash of everything that ends up in a stored vector except volatile file times"""
+    stable = {k: v for k, v in metadata.items() if k != "creation_time"}
+    payload = json.dumps({"text": text, "metadata": stable}, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
 class VectorStore:
-    def __init__(self, force_recreate=True):
-        # Initialize OpenAI client
-        self.openai_client = OpenAI()
+    def __init__(self, force_recreate=False, openai_client=None, index=None, embedder=None, chunk_store=None):
+        # Initialize OpenAI client; 429s are handled by our own rate limiter
+        self.openai_client = openai_client if openai_client is not None else OpenAI(max_retries=0)
+        self.embedder = embedder if embedder is not None else Embedder(
+            self.openai_client, cache=get_default_cache()
+        )
         
-        # Initialize Pinecone
-        pinecone_api_key = os.getenv('PINECONE_API_KEY')
-        pinecone_env = os.getenv('PINECONE_ENVIRONMENT')
+        # Token-sized, structure-aware chunks with overlap between neighbours
+        self.chunker = StreamingChunker(
+            max_tokens=int(os.getenv("CHUNK_MAX_TOKENS", "300")),
+            overlap_tokens=int(os.getenv("CHUNK_OVERLAP_TOKENS", "50"))
+        )
         
-        if not pinecone_api_key or not pinecone_env:
-            raise ValueError("Pinecone API key and environment must be set in .env file")
-            
-        print(f"Using Pinecone environment: {pinecone_env}")
-        self.pc = Pinecone(api_key=pinecone_api_key)
+        # Pinecone upserts get their own request budget
+        self.upsert_limiter = RateLimiter(
+            requests_per_minute=int(os.getenv("PINECONE_UPSERT_RPM", "600"))
+        )
         
-        # Get or create index
+        # Open the configured vector index backend
         self.index_name = "meeting-analysis"
-        try:
-            # Check if index exists
-            indexes = self.pc.list_indexes()
-            
-            # Delete existing index if force_recreate is True
-            if self.index_name in indexes.names() and force_recreate:
-                print(f"Deleting existing index: {self.index_name}")
-                self.pc.delete_index(self.index_name)
-                # Wait a moment after deletion
-                time.sleep(10)
-            
-            # Create new index if it doesn't exist
-            if self.index_name not in self.pc.list_indexes().names():
-                print(f"Creating new index: {self.index_name}")
-                self.pc.create_index(
-                    name=self.index_name,
-                    dimension=1536,  # dimensionality of text-embedding-ada-002
-                    metric="cosine",
-                    spec=ServerlessSpec(
-                        cloud="aws",
-                        region="us-east-1"
-                    )
-                )
-                # Wait for index to be ready
-                print("Waiting for index to be ready...")
-                time.sleep(10)  # Initial wait
-                while not self.pc.describe_index(self.index_name).status['ready']:
-                    print("Still waiting for index to be ready...")
-                    time.sleep(5)
-            else:
-                print(f"Using existing index: {self.index_name}")
-            
-            self.index = self.pc.Index(self.index_name)
-            print("Successfully connected to Pinecone index")
-            
-        except Exception as e:
-            print(f"Error initializing Pinecone: {str(e)}")
-            raise
+        self.index = index if index is not None else get_vector_index(
+            self.index_name, force_recreate=force_recreate
+        )
+        
+        # Manifest of file and chunk hashes already stored in the index
+        self.manifest_path = os.getenv(
+            "VECTOR_MANIFEST_PATH",
+            os.path.join(".cache", f"{self.index_name}-manifest.json")
+        )
+        self.manifest = {} if force_recreate else self.load_manifest()
+        
+        # Chunk texts live in a local store; vector metadata keeps only filterable fields
+        self.chunk_store = chunk_store if chunk_store is not None else get_default_chunk_store()
+
+    def load_manifest(self):
+        if not os.path.exists(self.manifest_path):
+            return {}
+        with open(self.manifest_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def save_manifest(self):
+        directory = os.path.dirname(self.manifest_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = self.manifest_path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.manifest, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.manifest_path)
 
     def get_embedding(self, text):
         """Get embeddings for a piece of text using OpenAI's API"""
+        return self.get_embeddings([text])[0]
+
+    def get_embeddings(self, texts):
+        """Get embeddings for many texts using batched, rate limited API calls"""
         try:
-            response = self.openai_client.embeddings.create(
-                input=text,
-                model="text-embedding-ada-002"
-            )
-            return response.data[0].embedding
+            return self.embedder.embed(texts)
         except Exception as e:
-            print(f"Error generating embedding: {str(e)}")
+            print(f"Error generating embeddings: {str(e)}")
             raise
 
-    def chunk_text(self, text, chunk_size=1000):
-        """Split text into smaller chunks"""
-        words = text.split()
-        chunks = []
-        current_chunk = []
-        current_size = 0
-        
-        for word in words:
-            current_chunk.append(word)
-            current_size += len(word) + 1  # +1 for space
-            
-            if current_size >= chunk_size:
-                chunks.append(' '.join(current_chunk))
-                current_chunk = []
-                current_size = 0
+    def chunk_text(self, text):
+        """Split text into token-bounded chunks along section and sentence boundaries"""
+        return self.chunker.chunk_text(text)
+
+    def build_records(self, file_path):
+        """Stream a file's chunk records with ids and metadata, reading it line by line"""
+        file_name = os.path.basename(file_path)
+        creation_time = datetime.fromtimestamp(os.path.getctime(file_path))
+        # A date in the file name is the meeting's; otherwise fall back to the file's
+        try:
+            meeting_date = date_number(file_name)
+        except ValueError:
+            meeting_date = date_number(creation_time)
         
-        if current_chunk:
-            chunks.append(' '.join(current_chunk))
-            
-        return chunks
+        for i, chunk in enumerate(self.chunker.chunk_file(file_path)):
+            yield {
+                "id": f"{file_name}_{i}",
+                "text": chunk,
+                "metadata": {
+                    "file_name": file_name,
+                    "creation_time": creation_time.isoformat(),
+                    "meeting_date": meeting_date,
+                    "chunk_index": i
+                }
+            }
+
+    def upsert_records(self, records, batch_size=100):
+        """Embed chunk records and upsert them into the vector index as they arrive
+
+        Records may be any iterable; only one upsert batch is held in memory
+        at a time. Returns the number of records upserted.
+        """
+        count = 0
+        batch = []
+        for record in records:
+            batch.append(record)
+            if len(batch) >= batch_size:
+                count += self._upsert_batch(batch)
+                batch = []
+        if batch:
+            count += self._upsert_batch(batch)
+        if count:
+            corpus_version.bump("vector")
+        return count
+
+    def _upsert_batch(self, records):
+        with span("embedding", texts=len(records)):
+            embeddings = self.get_embeddings([record["text"] for record in records])
+        vectors = [
+            {"id": record["id"], "values": embedding, "metadata": record["metadata"]}
+            for record, embedding in zip(records, embeddings)
+        ]
+        try:
+            # Texts first, so every id the index can return has one
+            self.chunk_store.put_many([(record["id"], record["text"]) for record in records])
+            # Upserts are paced by their own rate limiter
+            with span("vector_upsert", vectors=len(vectors)):
+                self.upsert_limiter.acquire()
+                self.index.upsert(vectors=vectors)
+        except Exception as e:
+            print(f"Error upserting batch: {str(e)}")
+            raise
+        return len(vectors)
+
+    def delete_ids(self, ids):
+        """Delete vectors by id in batches"""
+        ids = list(ids)
+        batch_size = 1000
+        for i in range(0, len(ids), batch_size):
+            with span("vector_delete", ids=len(ids[i:i + batch_size])):
+                self.upsert_limiter.acquire()
+                self.index.delete(ids[i:i + batch_size])
+        self.chunk_store.delete_many(ids)
+        if ids:
+            corpus_version.bump("vector")
 
     def vectorize_and_store(self, file_path):
-        """Read the analysis file, vectorize its content, and store in Pinecone"""
+        """Read the analysis file, vectorize its content, and store in the vector index"""
         try:
-            # Read the analysis file
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            # Get file metadata
             file_name = os.path.basename(file_path)
-            creation_time = datetime.fromtimestamp(os.path.getctime(file_path))
-            
             print(f"Processing file: {file_name}")
-            print(f"File creation time: {creation_time}")
             
-            # Split content into chunks
-            chunks = self.chunk_text(content)
-            print(f"Split content into {len(chunks)} chunks")
+            count = self.upsert_records(self.build_records(file_path))
+            self.index.flush()
             
-            # Process each chunk
-            vectors = []
-            for i, chunk in enumerate(chunks):
-                print(f"Processing chunk {i+1}/{len(chunks)}")
-                # Get embedding for the chunk
-                embedding = self.get_embedding(chunk)
-                
-                # Prepare metadata
-                metadata = {
-                    "file_name": file_name,
-                    "creation_time": creation_time.isoformat(),
-                    "chunk_index": i,
-                    "total_chunks": len(chunks),
-                    "content": chunk[:1000]  # Limit content length to avoid metadata size issues
-                }
-                
-                # Add to vectors list
-                vectors.append({
-                    "id": f"{file_name}_{i}",
-                    "values": embedding,
-                    "metadata": metadata
-                })
-                
-                # Add a small delay between embeddings
-                time.sleep(0.5)
+            print(f"Successfully vectorized and stored {count} chunks from {file_name}")
+            
+        except Exception as e:
+            print(f"Error processing file: {str(e)}")
+            raise
+
+    def sync_file(self, file_path):
+        """Upsert new or changed chunks of a file and delete chunks that disappeared
+
+        Returns (upserted, deleted) chunk counts.
+        """
+        file_name = os.path.basename(file_path)
+        digest = file_hash(file_path)
+        entry = self.manifest.get(file_name)
+        current = entry is not None and entry.get("format") == RECORD_FORMAT
+        if current and entry["file_hash"] == digest:
+            return 0, 0
+        
+        with trace("vector_sync"):
+            old_chunks = entry["chunks"] if entry else {}
+            new_chunks = {}
+        
+            def changed_records():
+                # Only chunk hashes are kept; records stream straight into the upsert batches.
+                # Chunks written under an older format are all rewritten.
+                for record in self.build_records(file_path):
+                    chunk_hash = record_hash(record["text"], record["metadata"])
+                    new_chunks[record["id"]] = chunk_hash
+                    if not current or old_chunks.get(record["id"]) != chunk_hash:
+                        yield record
+        
+            upserted = self.upsert_records(changed_records())
+            removed = [chunk_id for chunk_id in old_chunks if chunk_id not in new_chunks]
+            self.delete_ids(removed)
+            print(f"{file_name}: {upserted} new or changed chunks, {len(removed)} removed")
+        
+            self.manifest[file_name] = {
+                "file_hash": digest,
+                "format": RECORD_FORMAT,
+                "chunks": new_chunks
+            }
+        return upserted, len(removed)
+
+    def sync_directory(self, directory, extension='.txt'):
+        """Incrementally bring the vector index in line with every file in a directory"""
+        try:
+            file_names = sorted(f for f in os.listdir(directory) if f.endswith(extension))
+            upserted = deleted = 0
             
-            # Upsert vectors in smaller batches
-            batch_size = 25  # Reduced batch size
-            for i in range(0, len(vectors), batch_size):
-                batch = vectors[i:i + batch_size]
-                print(f"Upserting batch {i//batch_size + 1}/{(len(vectors) + batch_size - 1)//batch_size}")
-                try:
-                    self.index.upsert(vectors=batch)
-                    # Longer delay between batches
-                    time.sleep(2)
-                except Exception as e:
-                    print(f"Error upserting batch: {str(e)}")
-                    raise
+            for file_name in file_names:
+                file_path = os.path.join(directory, file_name)
+                previous = self.manifest.get(file_name)
+                file_upserted, file_deleted = self.sync_file(file_path)
+                upserted += file_upserted
+                deleted += file_deleted
+                # Record progress after every changed file so an interrupted sync resumes cleanly
+                if self.manifest.get(file_name) != previous:
+                    self.index.flush()
+                    self.save_manifest()
             
-            print(f"Successfully vectorized and stored {len(chunks)} chunks from {file_name}")
+            # Drop vectors of files that are gone from the directory
+            for file_name in [f for f in self.manifest if f not in file_names]:
+                chunk_ids = list(self.manifest[file_name]["chunks"])
+                print(f"{file_name}: file removed, deleting {len(chunk_ids)} chunks")
+                self.delete_ids(chunk_ids)
+                deleted += len(chunk_ids)
+                del self.manifest[file_name]
+                self.index.flush()
+                self.save_manifest()
+            
+            print(f"Sync complete: {upserted} chunks upserted, {deleted} chunks deleted "
+                  f"across {len(file_names)} files")
+            return upserted, deleted
             
         except Exception as e:
-            print(f"Error processing file: {str(e)}")
+            print(f"Error syncing directory: {str(e)}")
             raise
 
 def main():
     try:
-        # Initialize vector store with force_recreate=True to ensure a fresh start
+        # Incrementally sync every analysis file; pass force_recreate=True to rebuild from scratch
         print("Initializing vector store...")
-        vector_store = VectorStore(force_recreate=True)
+        vector_store = VectorStore()
         
-        # Get the latest analysis file
         analysis_dir = "meeting_analysis"
-        analysis_files = [f for f in os.listdir(analysis_dir) if f.endswith('.txt')]
-        if not analysis_files:
-            print("No analysis files found")
-            return
-        
-        # Sort by creation time and get the latest
-        latest_file = max(
-            analysis_files,
-            key=lambda f: os.path.getctime(os.path.join(analysis_dir, f))
-        )
-        file_path = os.path.join(analysis_dir, latest_file)
-        
-        # Vectorize and store the content
-        print(f"\nProcessing file: {latest_file}")
-        vector_store.vectorize_and_store(file_path)
+        vector_store.sync_directory(analysis_dir)
         
     except Exception as e:
         print(f"\nAn error occurred: {str(e)}")